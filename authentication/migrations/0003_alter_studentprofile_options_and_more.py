@@ -0,0 +1,32 @@
+# Generated by Django 5.2.7 on 2026-10-16 23:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0002_alter_mentorprofile_options_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='studentprofile',
+            options={},
+        ),
+        migrations.AddField(
+            model_name='studentprofile',
+            name='blood_group',
+            field=models.CharField(blank=True, choices=[('A+', 'A+'), ('A-', 'A-'), ('B+', 'B+'), ('B-', 'B-'), ('O+', 'O+'), ('O-', 'O-'), ('AB+', 'AB+'), ('AB-', 'AB-')], max_length=5, null=True),
+        ),
+        migrations.AddField(
+            model_name='studentprofile',
+            name='gender',
+            field=models.CharField(blank=True, choices=[('male', 'Male'), ('female', 'Female'), ('other', 'Other')], max_length=10, null=True),
+        ),
+        migrations.AddField(
+            model_name='studentprofile',
+            name='photo',
+            field=models.ImageField(blank=True, null=True, upload_to='student_photos/'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-16 23:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('authentication', '0004_user_user_created_id_user_user_role_created_id'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['role', 'updated_at', 'id'], name='user_role_updated_id'),
+        ),
+    ]
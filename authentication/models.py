@@ -28,6 +28,13 @@ class User(AbstractUser):
     class Meta:
         verbose_name = 'User'
         verbose_name_plural = 'Users'
+        indexes = [
+            # Keyset pagination of the user list, optionally filtered by role
+            models.Index(fields=['-created_at', '-id'], name='user_created_id'),
+            models.Index(fields=['role', '-created_at', '-id'], name='user_role_created_id'),
+            # Watermark scan of the incremental student sheet sync
+            models.Index(fields=['role', 'updated_at', 'id'], name='user_role_updated_id'),
+        ]
 
 
 
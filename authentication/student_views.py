@@ -1,11 +1,12 @@
 from rest_framework import generics, permissions, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from django.db.models import Avg, Sum
 from django.utils import timezone
 from tasks.models import Task, TaskSubmission
 from tasks.serializers import TaskSerializer, TaskSubmissionSerializer
-from courses.models import Batch
+from tasks.progression import build_progression, load_student_progress, refresh_task_progress
+from tasks.grade_stats import get_grade_stats, empty_histogram
+from courses.models import Course, Batch
 from .permissions import IsStudent
 
 
@@ -27,23 +28,10 @@ class StudentDashboardView(APIView):
         total_submitted = TaskSubmission.objects.filter(student=student).count()
         pending_tasks = total_assigned - total_submitted
         
-        # Get graded submissions
-        graded_submissions = TaskSubmission.objects.filter(
-            student=student,
-            marks_obtained__isnull=False
-        )
-        
-        # Calculate average marks
-        if graded_submissions.exists():
-            avg_marks = graded_submissions.aggregate(avg=Avg('marks_obtained'))['avg']
-            total_marks_obtained = graded_submissions.aggregate(total=Sum('marks_obtained'))['total']
-            total_max_marks = sum([sub.task.max_marks for sub in graded_submissions])
-            percentage = (total_marks_obtained / total_max_marks * 100) if total_max_marks > 0 else 0
-        else:
-            avg_marks = 0
-            percentage = 0
-            total_marks_obtained = 0
-            total_max_marks = 0
+        # Graded totals are kept in GradeStats
+        stats = get_grade_stats(student)
+        avg_marks = (stats.marks_obtained / stats.graded_count) if stats.graded_count else 0
+        percentage = (stats.marks_obtained / stats.max_marks * 100) if stats.max_marks > 0 else 0
         
         # Recent submissions
         recent_submissions = TaskSubmission.objects.filter(
@@ -75,10 +63,10 @@ class StudentDashboardView(APIView):
                 'completion_rate': (total_submitted / total_assigned * 100) if total_assigned > 0 else 0,
             },
             'academic_progress': {
-                'total_graded_tasks': graded_submissions.count(),
+                'total_graded_tasks': stats.graded_count,
                 'average_marks': round(avg_marks, 2) if avg_marks else 0,
-                'total_marks_obtained': total_marks_obtained,
-                'total_max_marks': total_max_marks,
+                'total_marks_obtained': stats.marks_obtained,
+                'total_max_marks': stats.max_marks,
                 'overall_percentage': round(percentage, 2),
             },
             'recent_submissions': [
@@ -108,92 +96,46 @@ class StudentTasksView(APIView):
                     status=status.HTTP_403_FORBIDDEN
                 )
             
-            # Get all tasks assigned to student
-            all_tasks = Task.objects.filter(
-                assigned_to=request.user
-            ).exclude(
-                is_scheduled=True,
-                release_date__gt=timezone.now()
-            ).select_related('course', 'batch').order_by('week_number', 'task_order', 'created_at')
+            # Stored lock state for every released task (recomputed only when stale)
+            progression = load_student_progress(request.user)
             
             tasks_data = []
             
-            # Group tasks by course
-            course_tasks = {}
-            for task in all_tasks:
-                course_id = task.course.id
-                if course_id not in course_tasks:
-                    course_tasks[course_id] = []
-                course_tasks[course_id].append(task)
-            
-            # Process each course's tasks
-            for course_id, tasks in course_tasks.items():
-                for index, task in enumerate(tasks):
-                    submission = TaskSubmission.objects.filter(
-                        task=task,
-                        student=request.user
-                    ).first()
-                    
-                    is_locked = False
-                    lock_reason = None
-                    
-                    # Check if task is scheduled
-                    if task.is_scheduled and task.release_date:
-                        if timezone.now() < task.release_date:
-                            is_locked = True
-                            lock_reason = f"Available from {task.release_date.strftime('%B %d, %Y at %I:%M %p')}"
-                    
-                    # Check previous task completion
-                    if not is_locked and index > 0:
-                        previous_task = tasks[index - 1]
-                        previous_submission = TaskSubmission.objects.filter(
-                            task=previous_task,
-                            student=request.user
-                        ).first()
-                        
-                        if not previous_submission:
-                            is_locked = True
-                            lock_reason = f"Complete '{previous_task.title}' first"
-                        elif previous_submission.marks_obtained is None:
-                            is_locked = True
-                            lock_reason = f"Waiting for '{previous_task.title}' to be graded"
-                        else:
-                            percentage = (previous_submission.marks_obtained / previous_task.max_marks) * 100
-                            if percentage < 70:
-                                is_locked = True
-                                lock_reason = f"Score at least 70% in '{previous_task.title}' (Current: {percentage:.1f}%)"
-                    
-                    task_info = {
-                        'id': task.id,
-                        'title': task.title,
-                        'description': task.description,
-                        'course': {
-                            'id': task.course.id,
-                            'name': task.course.name,
-                            'code': task.course.code,
-                        },
-                        'batch': {
-                            'id': task.batch.id if task.batch else None,
-                            'name': task.batch.name if task.batch else 'Course-Wide',
-                        } if task.batch else None,
-                        'due_date': task.due_date,
-                        'max_marks': task.max_marks,
-                        'created_at': task.created_at,
-                        'task_order': task.task_order,
-                        'week_number': task.week_number,
-                        'release_date': task.release_date if task.is_scheduled else None,
-                        'is_locked': is_locked,
-                        'lock_reason': lock_reason,
-                        'is_submitted': submission is not None,
-                        'submission': {
-                            'id': submission.id,
-                            'submitted_at': submission.submitted_at,
-                            'marks_obtained': submission.marks_obtained,
-                            'is_graded': submission.marks_obtained is not None,
-                        } if submission else None,
-                    }
-                    
-                    tasks_data.append(task_info)
+            for state in progression.values():
+                task = state.task
+                submission = state.submission
+                
+                task_info = {
+                    'id': task.id,
+                    'title': task.title,
+                    'description': task.description,
+                    'course': {
+                        'id': task.course.id,
+                        'name': task.course.name,
+                        'code': task.course.code,
+                    },
+                    'batch': {
+                        'id': task.batch.id if task.batch else None,
+                        'name': task.batch.name if task.batch else 'Course-Wide',
+                    } if task.batch else None,
+                    'due_date': task.due_date,
+                    'max_marks': task.max_marks,
+                    'created_at': task.created_at,
+                    'task_order': task.task_order,
+                    'week_number': task.week_number,
+                    'release_date': task.release_date if task.is_scheduled else None,
+                    'is_locked': state.is_locked,
+                    'lock_reason': state.lock_reason(),
+                    'is_submitted': submission is not None,
+                    'submission': {
+                        'id': submission.id,
+                        'submitted_at': submission.submitted_at,
+                        'marks_obtained': submission.marks_obtained,
+                        'is_graded': submission.marks_obtained is not None,
+                    } if submission else None,
+                }
+                
+                tasks_data.append(task_info)
             
             return Response(tasks_data)
             
@@ -246,46 +188,30 @@ class StudentAcademicProgressView(APIView):
     def get(self, request):
         student = request.user
         
-        # Get all submissions with grades
-        graded_submissions = TaskSubmission.objects.filter(
-            student=student,
-            marks_obtained__isnull=False
-        ).select_related('task', 'task__course', 'task__batch')
-        
-        # Overall statistics
-        if graded_submissions.exists():
-            total_marks_obtained = graded_submissions.aggregate(total=Sum('marks_obtained'))['total']
-            total_max_marks = sum([sub.task.max_marks for sub in graded_submissions])
-            overall_percentage = (total_marks_obtained / total_max_marks * 100) if total_max_marks > 0 else 0
-            average_marks = graded_submissions.aggregate(avg=Avg('marks_obtained'))['avg']
-        else:
-            total_marks_obtained = 0
-            total_max_marks = 0
-            overall_percentage = 0
-            average_marks = 0
+        # Graded totals, per-course breakdown and grade bands are kept in GradeStats
+        stats = get_grade_stats(student)
+        overall_percentage = (stats.marks_obtained / stats.max_marks * 100) if stats.max_marks > 0 else 0
+        average_marks = (stats.marks_obtained / stats.graded_count) if stats.graded_count else 0
         
         # Course-wise performance
-        courses_performance = {}
-        for submission in graded_submissions:
-            course_name = submission.task.course.name
-            if course_name not in courses_performance:
-                courses_performance[course_name] = {
-                    'course_id': submission.task.course.id,
-                    'course_name': course_name,
-                    'tasks_graded': 0,
-                    'marks_obtained': 0,
-                    'max_marks': 0,
-                }
-            courses_performance[course_name]['tasks_graded'] += 1
-            courses_performance[course_name]['marks_obtained'] += submission.marks_obtained
-            courses_performance[course_name]['max_marks'] += submission.task.max_marks
+        course_names = dict(
+            Course.objects.filter(id__in=[int(course_id) for course_id in stats.courses]).values_list('id', 'name')
+        )
+        courses_performance = []
+        for course_id, course in stats.courses.items():
+            courses_performance.append({
+                'course_id': int(course_id),
+                'course_name': course_names.get(int(course_id), ''),
+                'tasks_graded': course['tasks_graded'],
+                'marks_obtained': course['marks_obtained'],
+                'max_marks': course['max_marks'],
+                'percentage': round((course['marks_obtained'] / course['max_marks'] * 100), 2) if course['max_marks'] > 0 else 0,
+            })
         
-        # Calculate percentage for each course
-        for course in courses_performance.values():
-            if course['max_marks'] > 0:
-                course['percentage'] = round((course['marks_obtained'] / course['max_marks'] * 100), 2)
-            else:
-                course['percentage'] = 0
+        graded_submissions = TaskSubmission.objects.filter(
+            student=student,
+            marks_obtained__isnull=False
+        ).select_related('task', 'task__course')
         
         # Recent grades
         recent_grades = [
@@ -303,43 +229,18 @@ class StudentAcademicProgressView(APIView):
         
         progress_data = {
             'overall_statistics': {
-                'total_graded_tasks': graded_submissions.count(),
-                'total_marks_obtained': total_marks_obtained,
-                'total_max_marks': total_max_marks,
+                'total_graded_tasks': stats.graded_count,
+                'total_marks_obtained': stats.marks_obtained,
+                'total_max_marks': stats.max_marks,
                 'overall_percentage': round(overall_percentage, 2),
                 'average_marks': round(average_marks, 2) if average_marks else 0,
             },
-            'course_wise_performance': list(courses_performance.values()),
+            'course_wise_performance': courses_performance,
             'recent_grades': recent_grades,
-            'grade_distribution': self._get_grade_distribution(graded_submissions),
+            'grade_distribution': {**empty_histogram(), **stats.histogram},
         }
         
         return Response(progress_data)
-    
-    def _get_grade_distribution(self, submissions):
-        """Helper method to categorize grades"""
-        distribution = {
-            'A (90-100%)': 0,
-            'B (80-89%)': 0,
-            'C (70-79%)': 0,
-            'D (60-69%)': 0,
-            'F (Below 60%)': 0,
-        }
-        
-        for sub in submissions:
-            percentage = (sub.marks_obtained / sub.task.max_marks * 100)
-            if percentage >= 90:
-                distribution['A (90-100%)'] += 1
-            elif percentage >= 80:
-                distribution['B (80-89%)'] += 1
-            elif percentage >= 70:
-                distribution['C (70-79%)'] += 1
-            elif percentage >= 60:
-                distribution['D (60-69%)'] += 1
-            else:
-                distribution['F (Below 60%)'] += 1
-        
-        return distribution
 
 
 class StudentTaskDetailView(APIView):
@@ -362,44 +263,13 @@ class StudentTaskDetailView(APIView):
                     status=status.HTTP_403_FORBIDDEN
                 )
             
-            is_locked = False
-            lock_reason = None
-            
-            # Get all tasks for this course
-            course_tasks = Task.objects.filter(
-                course=task.course,
-                assigned_to=request.user
-            ).order_by('task_order', 'created_at')
-            
-            task_list = list(course_tasks)
-            try:
-                current_index = task_list.index(task)
-                
-                if current_index > 0:
-                    previous_task = task_list[current_index - 1]
-                    previous_submission = TaskSubmission.objects.filter(
-                        task=previous_task,
-                        student=request.user
-                    ).first()
-                    
-                    if not previous_submission:
-                        is_locked = True
-                        lock_reason = f"You must complete '{previous_task.title}' first"
-                    elif previous_submission.marks_obtained is None:
-                        is_locked = True
-                        lock_reason = f"Waiting for '{previous_task.title}' to be graded"
-                    else:
-                        percentage = (previous_submission.marks_obtained / previous_task.max_marks) * 100
-                        if percentage < 70:
-                            is_locked = True
-                            lock_reason = f"You need to score at least 70% in '{previous_task.title}' to unlock this task. Current score: {percentage:.1f}%"
-            except ValueError:
-                pass
-            
-            submission = TaskSubmission.objects.filter(
-                task=task,
-                student=request.user
-            ).first()
+            # Stored lock state of this course sequence, shared with the task list
+            progression = load_student_progress(request.user, course_id=task.course_id)
+            state = progression.get(task.id)
+            if state is None:
+                # Task is not released yet, so it is not part of the sequence
+                state = build_progression(request.user, [task])[task.id]
+            submission = state.submission
             
             task_data = {
                 'id': task.id,
@@ -421,8 +291,8 @@ class StudentTaskDetailView(APIView):
                     'name': f"{task.created_by.first_name} {task.created_by.last_name}" if task.created_by else 'Unknown',
                     'role': task.created_by.role if task.created_by else 'Unknown',
                 },
-                'is_locked': is_locked,
-                'lock_reason': lock_reason,
+                'is_locked': state.is_locked,
+                'lock_reason': state.lock_reason(verbose=True),
                 'is_submitted': submission is not None,
                 'submission': {
                     'id': submission.id,
@@ -505,6 +375,9 @@ class StudentSubmitTaskView(APIView):
                 submission_file=submission_file,
             )
             
+            # Update stored progression for this course
+            refresh_task_progress(request.user, course_id=task.course_id)
+            
             #  SEND NOTIFICATION (if notifications app exists)
             try:
                 from notifications.utils import notify_on_task_submission
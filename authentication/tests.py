@@ -1,3 +1,43 @@
-from django.test import TestCase
+import csv
+import os
+import tempfile
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from authentication.models import User
 
-# Create your tests here.
+
+class ExportStudentsViewTests(TestCase):
+    url = '/api/auth/export-to-sheet/'
+
+    def setUp(self):
+        cache.clear()
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        settings = override_settings(SHEET_BACKEND='csv', SHEET_CSV_DIR=self.directory.name)
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+        for i in range(3):
+            User.objects.create(username=f's{i}', role='student', email=f's{i}@example.com')
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create(username='admin', role='admin', is_staff=True))
+
+    def sheet_rows(self):
+        with open(os.path.join(self.directory.name, 'Student_Registrations.csv'), newline='') as f:
+            return list(csv.reader(f))
+
+    def test_invalid_chunk_size_is_rejected_before_exporting(self):
+        response = self.client.post(self.url, {'chunk_size': 'abc'}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(os.listdir(self.directory.name))
+
+    def test_chunk_size_is_clamped(self):
+        response = self.client.post(self.url, {'chunk_size': 0}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['run']['exported'], 3)
+        self.assertEqual([row[2] for row in self.sheet_rows()[1:]], ['s0@example.com', 's1@example.com', 's2@example.com'])
+
+    def test_export_requires_staff(self):
+        self.client.force_authenticate(User.objects.create(username='mentor', role='mentor'))
+        self.assertEqual(self.client.post(self.url, {}, format='json').status_code, 403)
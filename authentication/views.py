@@ -6,9 +6,15 @@ from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth import authenticate
 from .models import User, StudentProfile, MentorProfile
 from .serializers import StudentRegistrationSerializer, UserSerializer
+from student_management.pagination import KeysetPagination
 from .permissions import IsAdmin
 
 from notifications.utils import export_student_to_google_sheet
+from notifications.models import SheetExportRun, SheetSyncState
+from notifications.sheets import (
+    get_sheet_backend, start_export_run, export_students, sync_students, reset_sync,
+    EXPORT_CHUNK_SIZE, EXPORT_MAX_CHUNK_SIZE,
+)
 
 
 
@@ -51,15 +57,17 @@ class StudentRegistrationView(generics.CreateAPIView):
             user.save()
 
             #  Reload the user with related student_profile before exporting
-            user = User.objects.prefetch_related('student_profile').get(id=user.id)
+            user = User.objects.select_related('student_profile').get(id=user.id)
 
-            # Try exporting to Google Sheet (now profile fields will exist)
+            # Queue the Google Sheet export (flushed in batches by the worker)
             try:
-                export_student_to_google_sheet(user)
+                profile = getattr(user, "student_profile", None)
+                photo_url = request.build_absolute_uri(profile.photo.url) if profile and profile.photo else ""
+                export_student_to_google_sheet(user, photo_url=photo_url)
                 message = (
                     "Registration successful! "
                     "Please wait for admin approval. "
-                    "Student data exported to Google Sheet."
+                    "Student data queued for Google Sheet export."
                 )
             except Exception as export_error:
                 message = (
@@ -161,12 +169,13 @@ class ApproveStudentView(APIView):
             assigned_count = 0
             if batch_ids:
                 from courses.models import Batch
-                batches = Batch.objects.filter(id__in=batch_ids)
-                print(f"Batches found: {batches.count()}")
-                for batch in batches:
-                    batch.students.add(student)
-                    assigned_count += 1
-                    print(f"Added to batch: {batch.name}")
+                batches = list(Batch.objects.filter(id__in=batch_ids))
+                print(f"Batches found: {len(batches)}")
+                # One insert for all batches; the m2m signal then assigns
+                # their existing tasks in a single bulk insert
+                student.enrolled_batches.add(*batches)
+                assigned_count = len(batches)
+                print(f"Added to batches: {[batch.name for batch in batches]}")
             
             return Response({
                 "message": f"Student {student.username} approved successfully",
@@ -194,6 +203,7 @@ class UserListView(generics.ListAPIView):
     """View for admins to see all users."""
     serializer_class = UserSerializer
     permission_classes = [permissions.IsAuthenticated, IsAdmin]
+    pagination_class = KeysetPagination
     
     def get_queryset(self):
         role = self.request.query_params.get('role', None)
@@ -565,59 +575,84 @@ class ResetPasswordView(APIView):
 
 
 class ExportStudentsToGoogleSheetView(APIView):
+    """
+    Export all students to the registrations sheet in chunked append_rows
+    requests. A failed export is resumed by the next POST; GET reports the
+    progress of the latest run and the incremental sync state.
+
+    POST with mode=incremental only pushes students created or changed since
+    the last sync, updating their existing rows in place.
+    """
     permission_classes = [permissions.IsAdminUser]  # Only admins can export
+    spreadsheet_name = "Student_Registrations"
+
+    def _run_data(self, run):
+        return {
+            "id": run.id,
+            "status": run.status,
+            "total": run.total,
+            "exported": run.exported,
+            "error": run.error,
+            "started_at": run.started_at,
+            "finished_at": run.finished_at,
+        }
+
+    def _sync_data(self, state):
+        return {
+            "synced_up_to": state.synced_updated_at,
+            "appended": state.last_appended,
+            "updated": state.last_updated,
+            "last_synced_at": state.last_synced_at,
+        }
+
+    def get(self, request):
+        run = SheetExportRun.objects.filter(spreadsheet_name=self.spreadsheet_name).order_by('-id').first()
+        state = SheetSyncState.objects.filter(spreadsheet_name=self.spreadsheet_name).first()
+        if not run and not state:
+            return Response({"message": "No export has been run yet."}, status=status.HTTP_404_NOT_FOUND)
+        data = self._run_data(run) if run else {}
+        if state:
+            data["sync"] = self._sync_data(state)
+        return Response(data)
 
     def post(self, request):
         try:
-            # Define the scope (Google Sheets + Drive)
-            scopes = [
-                "https://www.googleapis.com/auth/spreadsheets",
-                "https://www.googleapis.com/auth/drive"
-            ]
-
-            # Load credentials
-            creds = Credentials.from_service_account_file(
-                settings.GOOGLE_SHEET_CREDENTIALS,
-                scopes=scopes
+            chunk_size = int(request.data.get('chunk_size', EXPORT_CHUNK_SIZE))
+        except (TypeError, ValueError):
+            return Response(
+                {"error": "chunk_size must be an integer"},
+                status=status.HTTP_400_BAD_REQUEST
             )
+        chunk_size = min(max(chunk_size, 1), EXPORT_MAX_CHUNK_SIZE)
+
+        run = None
+        try:
+            # Service account file from GOOGLE_SHEET_CREDENTIALS, authorized
+            # once per process by the integration registry
+            backend = get_sheet_backend(self.spreadsheet_name, 'file')
+            restart = request.data.get('restart') in (True, 'true', '1')
+
+            if request.data.get('mode') == 'incremental':
+                if restart:
+                    reset_sync(self.spreadsheet_name)
+                state = sync_students(backend, self.spreadsheet_name, chunk_size=chunk_size)
+                return Response({
+                    "message": "Student changes synced to Google Sheet.",
+                    "sync": self._sync_data(state),
+                }, status=status.HTTP_200_OK)
 
-            # Authorize the client
-            client = gspread.authorize(creds)
-
-            # Open  Google Sheet by name
-            sheet = client.open("Student_Registrations").sheet1
-
-            # Write headers if empty
-            if not sheet.get_all_values():
-                headers = [
-                    "First Name", "Last Name", "Email", "Phone", "Gender",
-                    "Date of Birth", "Blood Group", "Address",
-                    "Guardian Name", "Guardian Phone"
-                ]
-                sheet.append_row(headers)
-
-            # Fetch all student users
-            students = User.objects.filter(role="student").select_related("student_profile")
-
-            # Append data rows
-            for student in students:
-                profile = getattr(student, "student_profile", None)
-                sheet.append_row([
-                    student.first_name,
-                    student.last_name,
-                    student.email,
-                    student.phone or "",
-                    profile.gender if profile else "",
-                    profile.date_of_birth.strftime("%Y-%m-%d") if profile and profile.date_of_birth else "",
-                    profile.blood_group if profile else "",
-                    profile.address if profile else "",
-                    profile.guardian_name if profile else "",
-                    profile.guardian_phone if profile else "",
-                ])
-
-            return Response({"message": "Students exported successfully to Google Sheet."}, status=status.HTTP_200_OK)
+            run = start_export_run(self.spreadsheet_name, resume=not restart)
+            export_students(backend, run, chunk_size=chunk_size)
+
+            return Response({
+                "message": "Students exported successfully to Google Sheet.",
+                "run": self._run_data(run),
+            }, status=status.HTTP_200_OK)
 
         except Exception as e:
-            return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+            return Response({
+                "error": str(e),
+                "run": self._run_data(run) if run else None,
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
     
\ No newline at end of file
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.7 on 2026-10-16 23:37
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='course',
+            name='syllabus',
+            field=models.FileField(blank=True, null=True, upload_to='syllabi/'),
+        ),
+        migrations.AlterField(
+            model_name='course',
+            name='created_by',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='courses_created', to=settings.AUTH_USER_MODEL),
+        ),
+    ]
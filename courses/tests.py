@@ -1,3 +1,100 @@
+from datetime import date
+from unittest import mock
+from django.core.cache import cache
 from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+from authentication.models import User
+from courses.models import Course, Batch
+from tasks.models import Task, TaskSubmission
 
-# Create your tests here.
+
+class BatchStudentsViewTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.mentor = User.objects.create(username='mentor', role='mentor')
+        course = Course.objects.create(name='Python', code='PY1', description='', duration_weeks=4)
+        self.batch = Batch.objects.create(
+            name='B1', course=course, mentor=self.mentor,
+            start_date=date(2025, 1, 1), end_date=date(2025, 3, 1)
+        )
+        self.students = [User.objects.create(username=f's{i}', role='student') for i in range(5)]
+        self.batch.students.add(*self.students)
+        self.client = APIClient()
+        self.client.force_authenticate(self.mentor)
+        self.url = f'/api/courses/batches/{self.batch.id}/students/'
+
+    def test_pages_cover_the_roster_once(self):
+        seen = []
+        for page in (1, 2, 3):
+            response = self.client.get(self.url, {'page': page, 'page_size': 2})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.data['total_students'], 5)
+            self.assertEqual(response.data['total_pages'], 3)
+            seen += [student['id'] for student in response.data['students']]
+        self.assertEqual(seen, [student.id for student in self.students])
+
+    def test_unpaginated_request_returns_everyone(self):
+        response = self.client.get(self.url)
+        self.assertEqual(len(response.data['students']), 5)
+        self.assertNotIn('page', response.data)
+
+    def test_non_integer_page_is_rejected(self):
+        response = self.client.get(self.url, {'page': 'x'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_other_mentors_cannot_list_the_batch(self):
+        self.client.force_authenticate(User.objects.create(username='other', role='mentor'))
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+
+    def test_task_counts_per_student(self):
+        tasks = [
+            Task.objects.create(
+                course=self.batch.course, batch=self.batch, title=f'T{i}', description='x',
+                due_date=timezone.now(), created_by=self.mentor
+            )
+            for i in range(3)
+        ]
+        tasks[0].assigned_to.add(*self.students)
+        tasks[1].assigned_to.add(self.students[0])
+        TaskSubmission.objects.create(task=tasks[0], student=self.students[0])
+        TaskSubmission.objects.create(task=tasks[1], student=self.students[0])
+
+        response = self.client.get(self.url, {'fields': 'id,total_assigned_tasks,submitted_tasks,pending_tasks'})
+        rows = {row['id']: row for row in response.data['students']}
+        self.assertEqual(rows[self.students[0].id], {
+            'id': self.students[0].id, 'total_assigned_tasks': 2, 'submitted_tasks': 2, 'pending_tasks': 0
+        })
+        self.assertEqual(rows[self.students[1].id]['total_assigned_tasks'], 1)
+        self.assertEqual(rows[self.students[1].id]['pending_tasks'], 1)
+
+
+class CourseListCacheTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create(username='student', role='student'))
+        self.course = Course.objects.create(name='Python', code='PY1', description='', duration_weeks=4)
+
+    def course_names(self):
+        return [course['name'] for course in self.client.get('/api/courses/').data]
+
+    def test_process_local_cache_always_reads_the_database(self):
+        self.assertEqual(self.course_names(), ['Python'])
+        # A write that skips the signals, like one in another process whose
+        # invalidation never reaches this process' locmem cache
+        Course.objects.filter(id=self.course.id).update(name='Django')
+        self.assertEqual(self.course_names(), ['Django'])
+
+    @mock.patch('student_management.cache.cache_is_shared', return_value=True)
+    def test_shared_cache_serves_until_a_write_bumps_the_scope(self, _shared):
+        self.assertEqual(self.course_names(), ['Python'])
+        Course.objects.filter(id=self.course.id).update(name='Django')
+        with self.assertNumQueries(0):
+            self.assertEqual(self.course_names(), ['Python'])
+
+        self.course.name = 'Flask'
+        self.course.save()
+        self.assertEqual(self.course_names(), ['Flask'])
@@ -8,6 +8,8 @@ from .serializers import CourseSerializer, BatchSerializer, BatchDetailSerialize
 from authentication.models import User
 from authentication.permissions import IsAdmin, IsMentor, IsAdminOrMentor
 from tasks.models import Task, TaskSubmission
+from tasks.gradebook import batch_roster_stats
+from student_management.cache import CachedListMixin
 from django.http import FileResponse, Http404
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
@@ -15,10 +17,12 @@ import os
 
 
 # Course Views
-class CourseListView(generics.ListAPIView):
+class CourseListView(CachedListMixin, generics.ListAPIView):
     queryset = Course.objects.all()
     serializer_class = CourseSerializer
     permission_classes = [permissions.IsAuthenticated]
+    cache_scopes = ('courses',)
+    cache_per_user = False
 
 
 class CourseDetailView(generics.RetrieveAPIView):
@@ -148,10 +152,12 @@ def download_syllabus(request, pk):
 
 
 # Batch Views
-class BatchListView(generics.ListAPIView):
+class BatchListView(CachedListMixin, generics.ListAPIView):
     queryset = Batch.objects.all()
     serializer_class = BatchSerializer
     permission_classes = [permissions.IsAuthenticated]
+    cache_scopes = ('batches',)
+    cache_per_user = False
 
 
 class BatchDetailView(generics.RetrieveAPIView):
@@ -205,11 +211,14 @@ class AddStudentsToBatchView(APIView):
         
         try:
             batch = Batch.objects.get(pk=pk)
-            student_ids = request.data.get('student_ids', [])
+            student_ids = set(request.data.get('student_ids', []))
             
-            for student_id in student_ids:
-                student = User.objects.get(id=student_id, role='student', is_approved=True)
-                batch.students.add(student)
+            students = list(User.objects.filter(id__in=student_ids, role='student', is_approved=True))
+            if len(students) != len(student_ids):
+                raise User.DoesNotExist
+            
+            # Single insert; the m2m signal bulk-assigns the batch's tasks
+            batch.students.add(*students)
             
             return Response(
                 {"message": f"{len(student_ids)} student(s) added to batch"},
@@ -228,9 +237,10 @@ class AddStudentsToBatchView(APIView):
 
 
 # Mentor-Specific Views
-class MentorAssignedBatchesView(generics.ListAPIView):
+class MentorAssignedBatchesView(CachedListMixin, generics.ListAPIView):
     serializer_class = BatchDetailSerializer
     permission_classes = [permissions.IsAuthenticated, IsMentor]
+    cache_scopes = ('batches',)
     
     def get_queryset(self):
         return Batch.objects.filter(
@@ -258,11 +268,33 @@ class BatchStudentsView(APIView):
     def get(self, request, batch_id):
         try:
             if request.user.role == 'admin':
-                batch = Batch.objects.get(id=batch_id)
+                batch = Batch.objects.select_related('course').get(id=batch_id)
             else:
-                batch = Batch.objects.get(id=batch_id, mentor=request.user)
+                batch = Batch.objects.select_related('course').get(id=batch_id, mentor=request.user)
+            
+            students = batch.students.all().select_related('student_profile').order_by('id')
+            total_students = students.count()
+            
+            # Optional pagination: ?page=2&page_size=50
+            page = request.query_params.get('page')
+            page_size = request.query_params.get('page_size')
+            if page or page_size:
+                try:
+                    page = max(int(page or 1), 1)
+                    page_size = min(max(int(page_size or 50), 1), 500)
+                except ValueError:
+                    return Response(
+                        {'error': 'page and page_size must be integers'},
+                        status=status.HTTP_400_BAD_REQUEST
+                    )
+                students = students[(page - 1) * page_size:page * page_size]
+            
+            students = list(students)
+            stats = batch_roster_stats(batch, student_ids=[s.id for s in students])
             
-            students = batch.students.all().select_related('student_profile')
+            # Optional field selection: ?fields=id,username,submitted_tasks
+            fields = request.query_params.get('fields')
+            fields = {f.strip() for f in fields.split(',') if f.strip()} if fields else None
             
             students_data = []
             for student in students:
@@ -284,30 +316,35 @@ class BatchStudentsView(APIView):
                         'address': student.student_profile.address,
                     })
                 
-                assigned_tasks = Task.objects.filter(
-                    batch=batch,
-                    assigned_to=student
-                )
-                submitted_tasks = TaskSubmission.objects.filter(
-                    task__batch=batch,
-                    student=student
-                )
-                
+                counts = stats.get(student.id, {})
+                total_assigned = counts.get('total_assigned_tasks', 0)
+                submitted = counts.get('submitted_tasks', 0)
                 student_info.update({
-                    'total_assigned_tasks': assigned_tasks.count(),
-                    'submitted_tasks': submitted_tasks.count(),
-                    'pending_tasks': assigned_tasks.count() - submitted_tasks.count(),
+                    'total_assigned_tasks': total_assigned,
+                    'submitted_tasks': submitted,
+                    'pending_tasks': total_assigned - submitted,
                 })
                 
+                if fields:
+                    student_info = {k: v for k, v in student_info.items() if k in fields}
+                
                 students_data.append(student_info)
             
-            return Response({
+            response_data = {
                 'batch_id': batch.id,
                 'batch_name': batch.name,
                 'course_name': batch.course.name,
-                'total_students': len(students_data),
+                'total_students': total_students,
                 'students': students_data
-            })
+            }
+            if page:
+                response_data.update({
+                    'page': page,
+                    'page_size': page_size,
+                    'total_pages': (total_students + page_size - 1) // page_size,
+                })
+            
+            return Response(response_data)
             
         except Batch.DoesNotExist:
             return Response(
@@ -0,0 +1,168 @@
+# notifications/broker.py
+import asyncio
+import select
+import threading
+import time
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils.module_loading import import_string
+
+
+class NotificationBroker:
+    """
+    Pub/sub interface used by the notification stream.
+    Messages carry no payload: publishing wakes a user's open streams, which
+    then read their new rows from the database.
+    """
+
+    def subscribe(self, user_id):
+        """Return a subscription with an async `wait()`"""
+        raise NotImplementedError
+
+    def unsubscribe(self, user_id, subscription):
+        raise NotImplementedError
+
+    def publish(self, user_id):
+        raise NotImplementedError
+
+    def publish_many(self, user_ids):
+        for user_id in user_ids:
+            self.publish(user_id)
+
+
+class _Subscription:
+    def __init__(self):
+        self.loop = asyncio.get_running_loop()
+        self.event = asyncio.Event()
+
+    async def wait(self):
+        await self.event.wait()
+        self.event.clear()
+
+    def notify(self):
+        # publish() runs in a sync thread, hand the wakeup to the stream's loop
+        self.loop.call_soon_threadsafe(self.event.set)
+
+
+class InProcessBroker(NotificationBroker):
+    """
+    Subscriptions kept in memory, one set per user id.
+    For single-process development only: publishes reach streams served by
+    the same process, so notifications written by the queue worker (or by
+    another web process) only show up on the stream's heartbeat re-check.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscriptions = {}
+
+    def subscribe(self, user_id):
+        subscription = _Subscription()
+        with self._lock:
+            self._subscriptions.setdefault(user_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, user_id, subscription):
+        with self._lock:
+            subscriptions = self._subscriptions.get(user_id)
+            if subscriptions:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[user_id]
+
+    def publish(self, user_id):
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(user_id, ()))
+        for subscription in subscriptions:
+            try:
+                subscription.notify()
+            except RuntimeError:
+                # The stream's event loop already closed
+                self.unsubscribe(user_id, subscription)
+
+
+class PostgresBroker(InProcessBroker):
+    """
+    Cross-process broker over PostgreSQL LISTEN/NOTIFY.
+    Publishing sends a NOTIFY on the shared channel from whichever process
+    saved the notifications (web or queue worker). Every web process runs one
+    listener thread with its own connection, which wakes the matching local
+    subscriptions.
+    """
+    channel = 'notifications_new'
+    # NOTIFY payloads are limited to 8000 bytes
+    ids_per_notify = 500
+
+    def __init__(self):
+        super().__init__()
+        self._listener = None
+
+    def subscribe(self, user_id):
+        self._ensure_listener()
+        return super().subscribe(user_id)
+
+    def publish(self, user_id):
+        self.publish_many([user_id])
+
+    def publish_many(self, user_ids):
+        user_ids = [str(user_id) for user_id in user_ids]
+        with connection.cursor() as cursor:
+            for start in range(0, len(user_ids), self.ids_per_notify):
+                payload = ','.join(user_ids[start:start + self.ids_per_notify])
+                cursor.execute('SELECT pg_notify(%s, %s)', [self.channel, payload])
+
+    def _wake_local(self, payload):
+        for user_id in payload.split(','):
+            if user_id.isdigit():
+                InProcessBroker.publish(self, int(user_id))
+
+    def _ensure_listener(self):
+        with self._lock:
+            if self._listener is None or not self._listener.is_alive():
+                self._listener = threading.Thread(target=self._listen, name='notification-listener', daemon=True)
+                self._listener.start()
+
+    def _listen(self):
+        import psycopg2
+
+        params = connection.get_connection_params()
+        while True:
+            try:
+                conn = psycopg2.connect(**params)
+                conn.autocommit = True
+                with conn.cursor() as cursor:
+                    cursor.execute(f'LISTEN {self.channel}')
+                while True:
+                    # Timeout only to notice a dead connection
+                    if select.select([conn], [], [], 30) == ([], [], []):
+                        with conn.cursor() as cursor:
+                            cursor.execute('SELECT 1')
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        self._wake_local(conn.notifies.pop(0).payload)
+            except Exception as e:
+                print(f"⚠️ Notification listener lost its connection, reconnecting: {e}")
+                time.sleep(5)
+
+
+_broker = None
+
+
+def get_broker():
+    """Broker configured by NOTIFICATION_BROKER (dotted path), created once"""
+    global _broker
+    if _broker is None:
+        path = getattr(settings, 'NOTIFICATION_BROKER', 'notifications.broker.InProcessBroker')
+        _broker = import_string(path)()
+    return _broker
+
+
+def publish_new_notifications(recipient_ids):
+    """Wake the recipients' streams once the notifications are committed"""
+    recipient_ids = set(recipient_ids)
+
+    def publish():
+        get_broker().publish_many(recipient_ids)
+
+    transaction.on_commit(publish)
@@ -0,0 +1,93 @@
+# notifications/counters.py
+import time
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count
+from student_management.cache import cache_is_shared
+from .models import Notification
+
+
+UNREAD_KEY = 'notifications:unread:{}'
+# Bumped by every write, lets a recount detect writes that raced with it
+GENERATION_KEY = 'notifications:unread-gen:{}'
+
+
+def _ttl():
+    # The TTL bounds how long a drifted counter can survive before the next
+    # read recounts it from the database
+    return getattr(settings, 'NOTIFICATION_UNREAD_TTL', 3600)
+
+
+def count_unread(user_id):
+    return Notification.objects.filter(recipient_id=user_id, is_read=False).count()
+
+
+def _generation(user_id):
+    return cache.get(GENERATION_KEY.format(user_id))
+
+
+def get_unread_count(user_id):
+    """
+    Unread notifications for a user, from the cache with a database fallback.
+    The recount is only kept if no write invalidated the counter while it
+    ran, otherwise a count taken before that write could be cached.
+    Without a shared cache the invalidations of other processes (web workers,
+    the queue worker) never arrive, so every read counts from the database.
+    """
+    if not cache_is_shared():
+        return count_unread(user_id)
+    key = UNREAD_KEY.format(user_id)
+    count = cache.get(key)
+    if count is None:
+        generation = _generation(user_id)
+        count = count_unread(user_id)
+        cache.add(key, count, timeout=_ttl())
+        if _generation(user_id) != generation:
+            cache.delete(key)
+    return count
+
+
+def invalidate_unread_counts(user_ids):
+    """
+    Drop the counters of these users once the current transaction commits;
+    the next read recounts from the database. Writers invalidate instead of
+    adjusting in place: an adjustment racing with a recount is either lost
+    or counted twice.
+    """
+    user_ids = set(user_ids)
+    if not user_ids or not cache_is_shared():
+        return
+
+    def invalidate():
+        for user_id in user_ids:
+            generation_key = GENERATION_KEY.format(user_id)
+            # Seeded from the clock so an evicted generation never repeats
+            cache.add(generation_key, time.time_ns(), timeout=None)
+            cache.incr(generation_key)
+        cache.delete_many([UNREAD_KEY.format(user_id) for user_id in user_ids])
+
+    transaction.on_commit(invalidate)
+
+
+def reconcile_unread_counts(user_ids):
+    """Recount unread notifications for these users and overwrite their counters"""
+    user_ids = list(user_ids)
+    generations = {user_id: _generation(user_id) for user_id in user_ids}
+    counts = dict.fromkeys(user_ids, 0)
+    rows = Notification.objects.filter(
+        recipient_id__in=user_ids,
+        is_read=False
+    ).order_by().values('recipient_id').annotate(total=Count('id'))
+    for row in rows:
+        counts[row['recipient_id']] = row['total']
+    if not cache_is_shared():
+        return counts
+
+    cache.set_many({UNREAD_KEY.format(user_id): count for user_id, count in counts.items()}, timeout=_ttl())
+    # Same guard as get_unread_count() for users written to during the recount
+    cache.delete_many([
+        UNREAD_KEY.format(user_id) for user_id in user_ids
+        if _generation(user_id) != generations[user_id]
+    ])
+    return counts
@@ -0,0 +1,101 @@
+# notifications/integrations.py
+import base64
+import json
+import os
+import threading
+from django.conf import settings
+
+
+GOOGLE_SCOPES = [
+    "https://www.googleapis.com/auth/spreadsheets",
+    "https://www.googleapis.com/auth/drive"
+]
+
+
+def _load_env_credentials():
+    """Service account JSON from the GOOGLE_SHEET_CREDENTIALS_BASE64 variable"""
+    from google.oauth2.service_account import Credentials
+
+    data = os.getenv("GOOGLE_SHEET_CREDENTIALS_BASE64")
+    if not data:
+        raise ValueError("GOOGLE_SHEET_CREDENTIALS_BASE64 not found in environment.")
+    return Credentials.from_service_account_info(json.loads(base64.b64decode(data)), scopes=GOOGLE_SCOPES)
+
+
+def _load_file_credentials():
+    """Service account JSON file named by the GOOGLE_SHEET_CREDENTIALS setting"""
+    from google.oauth2.service_account import Credentials
+
+    if not settings.GOOGLE_SHEET_CREDENTIALS:
+        raise ValueError("GOOGLE_SHEET_CREDENTIALS not found in environment.")
+    return Credentials.from_service_account_file(settings.GOOGLE_SHEET_CREDENTIALS, scopes=GOOGLE_SCOPES)
+
+
+CREDENTIAL_SOURCES = {
+    'env': _load_env_credentials,
+    'file': _load_file_credentials,
+}
+
+
+class IntegrationRegistry:
+    """
+    Process-wide cache of Google credentials, authorized gspread clients and
+    opened spreadsheets, keyed by credential source.
+
+    Nothing is refreshed eagerly: the client's authorized session fetches a
+    new access token before the first request and whenever the cached one
+    has expired, so a cached client stays usable for the life of the process.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._credentials = {}
+        self._clients = {}
+        self._spreadsheets = {}
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.stats = {
+            'credentials': {'hits': 0, 'misses': 0},
+            'clients': {'hits': 0, 'misses': 0},
+            'spreadsheets': {'hits': 0, 'misses': 0},
+        }
+
+    def _get(self, kind, cache, key, build):
+        with self._lock:
+            if key in cache:
+                self.stats[kind]['hits'] += 1
+                return cache[key]
+            self.stats[kind]['misses'] += 1
+            # Built under the lock so concurrent callers don't authorize twice
+            cache[key] = build()
+            return cache[key]
+
+    def credentials(self, source='env'):
+        return self._get('credentials', self._credentials, source, CREDENTIAL_SOURCES[source])
+
+    def client(self, source='env'):
+        import gspread
+
+        # Resolved before taking the lock, credentials() locks on its own
+        credentials = self.credentials(source)
+        return self._get('clients', self._clients, source, lambda: gspread.authorize(credentials))
+
+    def spreadsheet(self, name, source='env'):
+        client = self.client(source)
+        return self._get('spreadsheets', self._spreadsheets, (source, name), lambda: client.open(name))
+
+    def forget_spreadsheet(self, name, source='env'):
+        """Drop an opened spreadsheet, e.g. after a failed write, so it is reopened"""
+        with self._lock:
+            self._spreadsheets.pop((source, name), None)
+
+    def clear(self):
+        """Forget everything, e.g. after the service account key was rotated"""
+        with self._lock:
+            self._credentials.clear()
+            self._clients.clear()
+            self._spreadsheets.clear()
+
+
+registry = IntegrationRegistry()
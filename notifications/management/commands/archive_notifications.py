@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+from notifications.retention import archive_read_notifications, retention_days
+
+
+class Command(BaseCommand):
+    help = "Move read notifications older than the retention period into the archive table"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=None,
+                            help="Archive read notifications older than this (default NOTIFICATION_RETENTION_DAYS)")
+        parser.add_argument('--batch-size', type=int, default=1000, help="Rows moved per transaction")
+        parser.add_argument('--max-batches', type=int, default=None, help="Stop after this many batches")
+
+    def handle(self, *args, **options):
+        days = retention_days() if options['days'] is None else options['days']
+        moved = archive_read_notifications(
+            days=days,
+            batch_size=options['batch_size'],
+            max_batches=options['max_batches']
+        )
+        self.stdout.write(self.style.SUCCESS(f"Archived {moved} read notification(s) older than {days} days"))
@@ -0,0 +1,67 @@
+import os
+import tempfile
+import time
+from django.core.management.base import BaseCommand
+from notifications.models import SheetExportRun
+from notifications.sheets import (
+    MemoryBackend, CSVBackend, EXPORT_HEADERS, EXPORT_CHUNK_SIZE, export_students,
+)
+
+
+class Command(BaseCommand):
+    help = "Benchmark the student sheet export offline against the memory or CSV backend"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--backend', choices=['memory', 'csv'], default='memory')
+        parser.add_argument('--rows', type=int, default=2000, help="Synthetic rows to write (ignored with --from-db)")
+        parser.add_argument('--chunk-size', type=int, default=EXPORT_CHUNK_SIZE)
+        parser.add_argument('--latency', type=float, default=0.0,
+                            help="Seconds slept per request to mimic the Sheets API round trip")
+        parser.add_argument('--per-row', action='store_true', help="Also time the old one-request-per-row export")
+        parser.add_argument('--from-db', action='store_true', help="Export the real students through export_students()")
+
+    def make_backend(self, options, tmpdir, name):
+        if options['backend'] == 'csv':
+            return CSVBackend(os.path.join(tmpdir, f"{name}.csv"), latency=options['latency'])
+        return MemoryBackend(latency=options['latency'])
+
+    def report(self, label, backend, rows, elapsed):
+        rate = rows / elapsed if elapsed else float('inf')
+        self.stdout.write(
+            f"{label}: {rows} rows, {backend.requests} request(s), {elapsed:.2f}s ({rate:.0f} rows/s)"
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            if options['from_db']:
+                backend = self.make_backend(options, tmpdir, 'export')
+                run = SheetExportRun.objects.create(spreadsheet_name='benchmark')
+                try:
+                    start = time.perf_counter()
+                    export_students(backend, run, chunk_size=chunk_size)
+                    self.report("export_students", backend, run.exported, time.perf_counter() - start)
+                finally:
+                    run.delete()
+                return
+
+            rows = [
+                [f"First{i}", f"Last{i}", f"student{i}@example.com", "", "", "", "", "", "", ""]
+                for i in range(options['rows'])
+            ]
+
+            backend = self.make_backend(options, tmpdir, 'chunked')
+            start = time.perf_counter()
+            backend.append_rows([EXPORT_HEADERS])
+            for offset in range(0, len(rows), chunk_size):
+                backend.append_rows(rows[offset:offset + chunk_size])
+            self.report(f"append_rows x{chunk_size}", backend, len(rows), time.perf_counter() - start)
+
+            if options['per_row']:
+                backend = self.make_backend(options, tmpdir, 'per_row')
+                start = time.perf_counter()
+                backend.append_rows([EXPORT_HEADERS])
+                for row in rows:
+                    backend.append_rows([row])
+                self.report("append_row per student", backend, len(rows), time.perf_counter() - start)
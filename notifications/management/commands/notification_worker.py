@@ -0,0 +1,40 @@
+import time
+from django.core.management.base import BaseCommand
+from notifications.queue import claim_jobs, run_jobs, requeue_stale_jobs, queue_depth
+
+# Importing the modules registers their queue handlers
+import notifications.utils  # noqa: F401
+import notifications.sheets  # noqa: F401
+
+
+class Command(BaseCommand):
+    help = "Process queued notification and sheet export jobs in batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100, help="Jobs claimed per batch")
+        parser.add_argument('--sleep', type=float, default=2.0, help="Seconds to wait when the queue is empty")
+        parser.add_argument('--once', action='store_true', help="Drain the queue once and exit")
+        parser.add_argument('--stats', action='store_true', help="Print the queue depth and exit")
+
+    def handle(self, *args, **options):
+        if options['stats']:
+            self.stdout.write(str(queue_depth()))
+            return
+
+        self.stdout.write(self.style.SUCCESS(f"Notification worker started, queue depth: {queue_depth()}"))
+
+        while True:
+            requeue_stale_jobs()
+            jobs = claim_jobs(options['batch_size'])
+
+            if jobs:
+                succeeded, failed = run_jobs(jobs)
+                self.stdout.write(
+                    f"Processed {len(jobs)} job(s): {succeeded} done, {failed} failed, "
+                    f"queue depth: {queue_depth()}"
+                )
+                continue
+
+            if options['once']:
+                break
+            time.sleep(options['sleep'])
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+from django.contrib.auth import get_user_model
+from notifications.counters import reconcile_unread_counts
+
+
+class Command(BaseCommand):
+    help = "Recount unread notifications and overwrite the cached counters"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help="Users recounted per query")
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        batch_size = options['batch_size']
+        user_ids = list(User.objects.order_by('id').values_list('id', flat=True))
+
+        total = 0
+        for start in range(0, len(user_ids), batch_size):
+            total += len(reconcile_unread_counts(user_ids[start:start + batch_size]))
+
+        self.stdout.write(self.style.SUCCESS(f"Reconciled unread counters for {total} user(s)"))
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.7 on 2026-10-16 23:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0006_sheetexportrun'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SheetSyncState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('spreadsheet_name', models.CharField(max_length=255, unique=True)),
+                ('synced_updated_at', models.DateTimeField(blank=True, null=True)),
+                ('synced_user_id', models.BigIntegerField(default=0)),
+                ('last_appended', models.IntegerField(default=0)),
+                ('last_updated', models.IntegerField(default=0)),
+                ('last_synced_at', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+    ]
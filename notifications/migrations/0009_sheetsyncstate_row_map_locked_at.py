@@ -0,0 +1,23 @@
+# Generated by Django 5.2.7 on 2026-10-16 23:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0008_streamticket'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='sheetsyncstate',
+            name='locked_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='sheetsyncstate',
+            name='row_map',
+            field=models.JSONField(blank=True, null=True),
+        ),
+    ]
@@ -1,5 +1,6 @@
 # notifications/models.py
 from django.db import models
+from django.utils import timezone
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
@@ -25,6 +26,131 @@ class Notification(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Keyset pagination of a user's notifications
+            models.Index(fields=['recipient', '-created_at', '-id'], name='notif_recipient_created_id'),
+            # Unread counts and unread lists
+            models.Index(fields=['recipient', 'is_read', 'created_at'], name='notif_recipient_read_created'),
+        ]
     
     def __str__(self):
         return f"{self.title} - {self.recipient.username}"
+
+
+class ArchivedNotification(models.Model):
+    """
+    Read notifications moved out of the live table by `archive_notifications`.
+    Keeps the original id as primary key so clients can still refer to them.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    recipient = models.ForeignKey(User, on_delete=models.CASCADE, related_name='archived_notifications')
+    sender = models.ForeignKey(User, on_delete=models.CASCADE, related_name='archived_sent_notifications', null=True)
+    notification_type = models.CharField(max_length=50, choices=Notification.NOTIFICATION_TYPES)
+    title = models.CharField(max_length=255)
+    message = models.TextField()
+    is_read = models.BooleanField(default=True)
+    link = models.CharField(max_length=500, blank=True, null=True)
+    created_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['recipient', '-created_at', '-id'], name='archnotif_recipient_created'),
+        ]
+    
+    def __str__(self):
+        return f"{self.title} - {self.recipient.username} (archived)"
+
+
+class QueuedJob(models.Model):
+    """
+    Background job written by request handlers and processed in batches by
+    `python manage.py notification_worker`. Finished jobs are deleted.
+    """
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('failed', 'Failed'),
+    ]
+    
+    kind = models.CharField(max_length=50)
+    payload = models.JSONField(default=dict)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    attempts = models.IntegerField(default=0)
+    last_error = models.TextField(blank=True, null=True)
+    run_after = models.DateTimeField(default=timezone.now)
+    locked_at = models.DateTimeField(blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['status', 'run_after'], name='queuedjob_status_run_after'),
+        ]
+    
+    def __str__(self):
+        return f"{self.kind} #{self.id} ({self.status})"
+
+
+class SheetExportRun(models.Model):
+    """Progress of a bulk student export to a spreadsheet, used to resume after a failure"""
+    STATUS_CHOICES = [
+        ('running', 'Running'),
+        ('completed', 'Completed'),
+        ('failed', 'Failed'),
+    ]
+    
+    spreadsheet_name = models.CharField(max_length=255)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='running')
+    total = models.IntegerField(default=0)
+    exported = models.IntegerField(default=0)
+    # Students are exported in id order; everything up to here is in the sheet
+    last_student_id = models.BigIntegerField(default=0)
+    error = models.TextField(blank=True, default='')
+    started_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+    
+    class Meta:
+        ordering = ['-started_at']
+    
+    def __str__(self):
+        return f"{self.spreadsheet_name} - {self.status} ({self.exported}/{self.total})"
+
+
+class SheetSyncState(models.Model):
+    """
+    Watermark of the incremental student sync of a spreadsheet: every student
+    up to (synced_updated_at, synced_user_id) in (updated_at, id) order is
+    in the sheet as of its last change.
+    Also holds the sheet's row map and write lock, shared by every process
+    (web workers and the queue worker) writing to the sheet.
+    """
+    spreadsheet_name = models.CharField(max_length=255, unique=True)
+    synced_updated_at = models.DateTimeField(blank=True, null=True)
+    synced_user_id = models.BigIntegerField(default=0)
+    last_appended = models.IntegerField(default=0)
+    last_updated = models.IntegerField(default=0)
+    last_synced_at = models.DateTimeField(blank=True, null=True)
+    # {student id: row number}, null when the Email column must be re-read
+    row_map = models.JSONField(blank=True, null=True)
+    # Set while an export or sync writes to the sheet
+    locked_at = models.DateTimeField(blank=True, null=True)
+    
+    def __str__(self):
+        return f"{self.spreadsheet_name} - synced up to {self.synced_updated_at}"
+
+
+class StreamTicket(models.Model):
+    """
+    Short-lived, single-use credential for opening the notification stream.
+    Browsers' EventSource cannot send an Authorization header, and a JWT in
+    the query string would end up in access logs; a ticket in a logged URL
+    is already spent or expired.
+    """
+    key = models.CharField(max_length=64, unique=True)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='stream_tickets')
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    
+    def __str__(self):
+        return f"Stream ticket for {self.user.username}"
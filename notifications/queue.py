@@ -0,0 +1,131 @@
+# notifications/queue.py
+from datetime import timedelta
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Min
+from django.utils import timezone
+from .models import QueuedJob
+
+
+# kind -> callable(jobs) returning {job_id: error} for the jobs that failed
+HANDLERS = {}
+
+MAX_ATTEMPTS = 5
+RETRY_BASE_SECONDS = 30
+
+# A job still "running" after this long belongs to a worker that died
+STALE_AFTER = timedelta(minutes=10)
+
+
+def register_handler(kind):
+    """Decorator registering the batch handler for a job kind"""
+    def decorator(func):
+        HANDLERS[kind] = func
+        return func
+    return decorator
+
+
+def queue_enabled():
+    return getattr(settings, 'NOTIFICATION_QUEUE_ENABLED', True)
+
+
+def enqueue_job(kind, **payload):
+    """Store a job for the worker and return it"""
+    return QueuedJob.objects.create(kind=kind, payload=payload)
+
+
+def claim_jobs(limit=100):
+    """
+    Lock up to `limit` due jobs for this worker.
+    Uses SKIP LOCKED where the database supports it so several workers can run.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        job_ids = list(
+            QueuedJob.objects.select_for_update(skip_locked=True).filter(
+                status='pending',
+                run_after__lte=now
+            ).order_by('id').values_list('id', flat=True)[:limit]
+        )
+        if not job_ids:
+            return []
+        QueuedJob.objects.filter(id__in=job_ids).update(
+            status='running',
+            locked_at=now,
+            attempts=F('attempts') + 1
+        )
+    return list(QueuedJob.objects.filter(id__in=job_ids).order_by('id'))
+
+
+def requeue_stale_jobs():
+    """
+    Hand jobs abandoned by a crashed worker back to the queue as a failed
+    attempt (counted when they were claimed), so a job that keeps killing
+    its worker stops after MAX_ATTEMPTS instead of being retried forever.
+    """
+    with transaction.atomic():
+        jobs = list(
+            QueuedJob.objects.select_for_update(skip_locked=True).filter(
+                status='running',
+                locked_at__lt=timezone.now() - STALE_AFTER
+            )
+        )
+        for job in jobs:
+            _fail_job(job, "Worker stopped while running the job")
+    return len(jobs)
+
+
+def _fail_job(job, error):
+    job.last_error = str(error)
+    job.locked_at = None
+    if job.attempts >= MAX_ATTEMPTS:
+        job.status = 'failed'
+    else:
+        job.status = 'pending'
+        job.run_after = timezone.now() + timedelta(seconds=RETRY_BASE_SECONDS * 2 ** (job.attempts - 1))
+    job.save(update_fields=['status', 'last_error', 'locked_at', 'run_after'])
+
+
+def run_jobs(jobs):
+    """
+    Run claimed jobs grouped by kind, one handler call per kind.
+    Successful jobs are deleted, failed ones are retried with exponential
+    backoff until MAX_ATTEMPTS. Returns (succeeded, failed) counts.
+    """
+    by_kind = {}
+    for job in jobs:
+        by_kind.setdefault(job.kind, []).append(job)
+
+    succeeded = 0
+    failed = 0
+    for kind, kind_jobs in by_kind.items():
+        handler = HANDLERS.get(kind)
+        try:
+            if handler is None:
+                raise ValueError(f"No handler registered for job kind '{kind}'")
+            errors = handler(kind_jobs) or {}
+        except Exception as e:
+            errors = {job.id: e for job in kind_jobs}
+
+        done_ids = [job.id for job in kind_jobs if job.id not in errors]
+        QueuedJob.objects.filter(id__in=done_ids).delete()
+        succeeded += len(done_ids)
+
+        for job in kind_jobs:
+            if job.id in errors:
+                print(f"⚠️ Job {job.kind} #{job.id} failed (attempt {job.attempts}): {errors[job.id]}")
+                _fail_job(job, errors[job.id])
+                failed += 1
+
+    return succeeded, failed
+
+
+def queue_depth():
+    """Queue depth metric: job counts per status and age of the oldest pending job"""
+    depth = {'pending': 0, 'running': 0, 'failed': 0}
+    for row in QueuedJob.objects.order_by().values('status').annotate(count=Count('id')):
+        depth[row['status']] = row['count']
+
+    oldest = QueuedJob.objects.filter(status='pending').aggregate(oldest=Min('created_at'))['oldest']
+    depth['oldest_pending_seconds'] = round((timezone.now() - oldest).total_seconds(), 1) if oldest else 0
+    return depth
@@ -0,0 +1,54 @@
+# notifications/retention.py
+from datetime import timedelta
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from .models import Notification, ArchivedNotification
+
+
+ARCHIVED_FIELDS = [
+    'id', 'recipient_id', 'sender_id', 'notification_type', 'title',
+    'message', 'is_read', 'link', 'created_at',
+]
+
+
+def retention_days():
+    return getattr(settings, 'NOTIFICATION_RETENTION_DAYS', 90)
+
+
+def archive_batch(cutoff, batch_size):
+    """
+    Move one batch of read notifications older than `cutoff` to the archive.
+    Each batch is its own short transaction (copy, then delete by primary key)
+    so the live table is never locked for long. Returns the rows moved.
+    """
+    with transaction.atomic():
+        rows = list(
+            Notification.objects.filter(
+                is_read=True,
+                created_at__lt=cutoff
+            ).order_by('id').values(*ARCHIVED_FIELDS)[:batch_size]
+        )
+        if not rows:
+            return 0
+
+        ArchivedNotification.objects.bulk_create(
+            [ArchivedNotification(**row) for row in rows],
+            ignore_conflicts=True
+        )
+        Notification.objects.filter(id__in=[row['id'] for row in rows]).delete()
+    return len(rows)
+
+
+def archive_read_notifications(days=None, batch_size=1000, max_batches=None):
+    """Archive read notifications older than `days`, batch by batch. Returns the total moved."""
+    cutoff = timezone.now() - timedelta(days=retention_days() if days is None else days)
+    total = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        moved = archive_batch(cutoff, batch_size)
+        if not moved:
+            break
+        total += moved
+        batches += 1
+    return total
@@ -1,6 +1,6 @@
 # notifications/serializers.py
 from rest_framework import serializers
-from .models import Notification
+from .models import Notification, ArchivedNotification
 
 class NotificationSerializer(serializers.ModelSerializer):
     sender_name = serializers.SerializerMethodField()
@@ -27,4 +27,11 @@ class NotificationSerializer(serializers.ModelSerializer):
         elif diff.seconds >= 60:
             return f"{diff.seconds // 60}m ago"
         else:
-            return "Just now"
\ No newline at end of file
+            return "Just now"
+
+
+class ArchivedNotificationSerializer(NotificationSerializer):
+    class Meta:
+        model = ArchivedNotification
+        fields = ['id', 'notification_type', 'title', 'message', 'is_read',
+                  'link', 'created_at', 'archived_at', 'sender_name', 'time_ago']
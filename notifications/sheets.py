@@ -0,0 +1,541 @@
+# notifications/sheets.py
+import csv
+import os
+import re
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from django.utils import timezone
+from authentication.models import User, StudentProfile
+from .queue import register_handler
+from .integrations import registry
+
+
+# Columns of the bulk student export
+EXPORT_HEADERS = [
+    "First Name", "Last Name", "Email", "Phone", "Gender",
+    "Date of Birth", "Blood Group", "Address",
+    "Guardian Name", "Guardian Phone"
+]
+
+EXPORT_CHUNK_SIZE = 500
+# Larger chunks risk hitting the Sheets API request size limit
+EXPORT_MAX_CHUNK_SIZE = 5000
+
+# Sheet receiving one row per student registration
+REGISTRATION_SPREADSHEET = "Tefora_Registrations"
+REGISTRATION_HEADERS = [
+    "First Name", "Last Name", "Email", "Phone", "Gender",
+    "Date of Birth", "Blood Group", "Address",
+    "Guardian Name", "Guardian Phone", "Photo"
+]
+
+
+# ===== Backends =====
+
+class SheetBackend:
+    """
+    Minimal spreadsheet interface used by the exports.
+    Every method is one request to the underlying service, so callers batch
+    rows instead of writing them one at a time.
+    """
+
+    def append_rows(self, rows):
+        """
+        Append rows after the last non-empty row.
+        Returns the row number the first appended row landed on.
+        """
+        raise NotImplementedError
+
+    def update_range(self, start_row, rows):
+        """Overwrite rows starting at `start_row` (1-based), from column A"""
+        raise NotImplementedError
+
+    def get_column(self, index):
+        """Values of column `index` (1-based), trailing empty cells dropped"""
+        raise NotImplementedError
+
+    def update_rows(self, rows_by_number):
+        """Overwrite scattered rows {row number: values} in a single request"""
+        raise NotImplementedError
+
+    def insert_row(self, row, index):
+        """Insert a row before row `index` (1-based), shifting the rows below down"""
+        raise NotImplementedError
+
+
+class GspreadBackend(SheetBackend):
+    """
+    Google Sheets through gspread. The client and the opened spreadsheet come
+    from the shared integration registry, so only the first export in a
+    process authorizes and looks the sheet up.
+    """
+
+    def __init__(self, spreadsheet_name, credentials_source='env'):
+        self.spreadsheet_name = spreadsheet_name
+        self.credentials_source = credentials_source
+        self._worksheet = None
+
+    @property
+    def worksheet(self):
+        if self._worksheet is None:
+            self._worksheet = registry.spreadsheet(self.spreadsheet_name, self.credentials_source).sheet1
+        return self._worksheet
+
+    def append_rows(self, rows):
+        response = self.worksheet.append_rows(rows, value_input_option='USER_ENTERED')
+        # e.g. "Sheet1!A402:J404"
+        updated_range = response['updates']['updatedRange']
+        return int(re.match(r"[A-Z]+(\d+)", updated_range.rsplit('!', 1)[-1]).group(1))
+
+    def update_range(self, start_row, rows):
+        self.worksheet.update(values=rows, range_name=f"A{start_row}", value_input_option='USER_ENTERED')
+
+    def get_column(self, index):
+        return self.worksheet.col_values(index)
+
+    def update_rows(self, rows_by_number):
+        self.worksheet.batch_update(
+            [{'range': f"A{number}", 'values': [row]} for number, row in rows_by_number.items()],
+            value_input_option='USER_ENTERED'
+        )
+
+    def insert_row(self, row, index):
+        self.worksheet.insert_row(row, index, value_input_option='USER_ENTERED')
+
+
+class MemoryBackend(SheetBackend):
+    """
+    In-memory stand-in for tests and offline benchmarks.
+    `latency` seconds are slept per request to mimic the API round trip.
+    """
+
+    def __init__(self, latency=0):
+        self.rows = []
+        self.latency = latency
+        self.requests = 0
+
+    def _request(self):
+        self.requests += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def append_rows(self, rows):
+        self._request()
+        first_row = len(self.rows) + 1
+        self.rows.extend([list(row) for row in rows])
+        return first_row
+
+    def update_range(self, start_row, rows):
+        self._request()
+        end = start_row - 1 + len(rows)
+        while len(self.rows) < end:
+            self.rows.append([])
+        self.rows[start_row - 1:end] = [list(row) for row in rows]
+
+    def get_column(self, index):
+        self._request()
+        values = [row[index - 1] if len(row) >= index else "" for row in self.rows]
+        while values and values[-1] == "":
+            values.pop()
+        return values
+
+    def update_rows(self, rows_by_number):
+        self._request()
+        for number, row in rows_by_number.items():
+            while len(self.rows) < number:
+                self.rows.append([])
+            self.rows[number - 1] = list(row)
+
+    def insert_row(self, row, index):
+        self._request()
+        self.rows.insert(index - 1, list(row))
+
+
+class CSVBackend(MemoryBackend):
+    """Local CSV file stand-in; the file is rewritten after every request"""
+
+    def __init__(self, path, latency=0):
+        super().__init__(latency=latency)
+        self.path = path
+        if os.path.exists(path):
+            with open(path, newline='') as f:
+                self.rows = [row for row in csv.reader(f)]
+
+    def _save(self):
+        with open(self.path, 'w', newline='') as f:
+            csv.writer(f).writerows(self.rows)
+
+    def append_rows(self, rows):
+        first_row = super().append_rows(rows)
+        self._save()
+        return first_row
+
+    def update_range(self, start_row, rows):
+        super().update_range(start_row, rows)
+        self._save()
+
+    def update_rows(self, rows_by_number):
+        super().update_rows(rows_by_number)
+        self._save()
+
+    def insert_row(self, row, index):
+        super().insert_row(row, index)
+        self._save()
+
+
+def get_sheet_backend(spreadsheet_name, credentials_source='env'):
+    """
+    Backend selected by SHEET_BACKEND: 'gspread' (default), 'csv' (one file
+    per spreadsheet in SHEET_CSV_DIR) or 'memory'. `credentials_source` picks
+    the service account for gspread, see integrations.CREDENTIAL_SOURCES.
+    """
+    kind = getattr(settings, 'SHEET_BACKEND', 'gspread')
+    if kind == 'memory':
+        return MemoryBackend()
+    if kind == 'csv':
+        directory = getattr(settings, 'SHEET_CSV_DIR', settings.BASE_DIR)
+        return CSVBackend(os.path.join(directory, f"{spreadsheet_name}.csv"))
+    return GspreadBackend(spreadsheet_name, credentials_source)
+
+
+# ===== Student export =====
+
+def _safe(value):
+    return str(value).strip() if value else ""
+
+
+def student_export_row(student):
+    profile = getattr(student, "student_profile", None)
+    return [
+        _safe(student.first_name),
+        _safe(student.last_name),
+        _safe(student.email),
+        _safe(student.phone),
+        _safe(profile.gender if profile else ""),
+        profile.date_of_birth.strftime("%Y-%m-%d") if profile and profile.date_of_birth else "",
+        _safe(profile.blood_group if profile else ""),
+        _safe(profile.address if profile else ""),
+        _safe(profile.guardian_name if profile else ""),
+        _safe(profile.guardian_phone if profile else ""),
+    ]
+
+
+def ensure_headers(backend, headers):
+    """
+    Write the header row when the sheet is empty, or insert it above the
+    existing rows when the sheet starts with something else (e.g. data rows
+    written before the headers existed). Returns whether the sheet changed.
+    """
+    first_column = backend.get_column(1)
+    if not first_column:
+        backend.append_rows([headers])
+        return True
+    if first_column[0] != headers[0]:
+        backend.insert_row(headers, 1)
+        return True
+    return False
+
+
+def ensure_headers_cached(backend, spreadsheet_name, headers):
+    """
+    ensure_headers() once per sheet: afterwards the cache remembers the
+    layout is in place and no read request is made.
+    """
+    key = f"sheets:headers:{spreadsheet_name}"
+    if cache.get(key) == headers:
+        return
+    if ensure_headers(backend, headers):
+        forget_row_map(spreadsheet_name)
+    cache.set(key, headers, timeout=None)
+
+
+def start_export_run(spreadsheet_name, resume=True):
+    """Continue the last unfinished export of this sheet, or start a new one"""
+    from .models import SheetExportRun
+
+    if resume:
+        run = SheetExportRun.objects.filter(
+            spreadsheet_name=spreadsheet_name,
+            status__in=['running', 'failed']
+        ).order_by('-id').first()
+        if run:
+            return run
+
+    return SheetExportRun.objects.create(
+        spreadsheet_name=spreadsheet_name,
+        total=User.objects.filter(role="student").count()
+    )
+
+
+def export_students(backend, run, chunk_size=EXPORT_CHUNK_SIZE, progress=None):
+    """
+    Export students in id order, one append_rows request per chunk.
+    After every chunk the run records the last exported id, so a failed run
+    resumes after the rows that already reached the sheet. `progress` is
+    called with the run after each chunk. Holds the sheet's lock, see
+    sheet_lock().
+    """
+
+    with sheet_lock(run.spreadsheet_name):
+        run.status = 'running'
+        run.error = ''
+        run.save(update_fields=['status', 'error'])
+
+        try:
+            # Rows appended here are unknown to the incremental sync's row map
+            forget_row_map(run.spreadsheet_name)
+            if not run.last_student_id:
+                ensure_headers(backend, EXPORT_HEADERS)
+
+            students = User.objects.filter(
+                role="student",
+                id__gt=run.last_student_id
+            ).select_related("student_profile").order_by('id')
+
+            chunk = []
+            for student in students.iterator(chunk_size=chunk_size):
+                chunk.append(student)
+                if len(chunk) == chunk_size:
+                    _write_chunk(backend, run, chunk, progress)
+                    chunk = []
+            if chunk:
+                _write_chunk(backend, run, chunk, progress)
+
+        except Exception as e:
+            run.status = 'failed'
+            run.error = str(e)
+            run.save(update_fields=['status', 'error'])
+            print(f" Google Sheet export failed after {run.exported} row(s): {e}")
+            raise
+
+        forget_row_map(run.spreadsheet_name)
+        run.status = 'completed'
+        run.finished_at = timezone.now()
+        run.save(update_fields=['status', 'finished_at'])
+    return run
+
+
+def _write_chunk(backend, run, students, progress):
+    backend.append_rows([student_export_row(student) for student in students])
+    run.last_student_id = students[-1].id
+    run.exported += len(students)
+    run.save(update_fields=['last_student_id', 'exported'])
+    if progress:
+        progress(run)
+
+
+# ===== Incremental sync =====
+
+EMAIL_COLUMN = EXPORT_HEADERS.index("Email") + 1
+
+# A crashed export or sync releases its lock after this long
+SYNC_LOCK_SECONDS = 30 * 60
+
+
+@contextmanager
+def sheet_lock(spreadsheet_name):
+    """
+    Hold the write lock of a sheet, stored on its SheetSyncState so that it
+    covers every process. Raises ValueError while another export or sync
+    holds it; a lock older than SYNC_LOCK_SECONDS is taken over. The row is
+    only locked to claim the lock, not for the length of the (slow) sync.
+    """
+    from .models import SheetSyncState
+
+    now = timezone.now()
+    with transaction.atomic():
+        state, _ = SheetSyncState.objects.select_for_update().get_or_create(spreadsheet_name=spreadsheet_name)
+        if state.locked_at and state.locked_at > now - timedelta(seconds=SYNC_LOCK_SECONDS):
+            raise ValueError("An export or sync of this sheet is already running.")
+        state.locked_at = now
+        state.save(update_fields=['locked_at'])
+
+    try:
+        yield state
+    finally:
+        # Unless a takeover already replaced it
+        SheetSyncState.objects.filter(pk=state.pk, locked_at=now).update(locked_at=None)
+
+
+def forget_row_map(spreadsheet_name):
+    """
+    Drop the stored row map. Every path that adds, inserts or moves rows in
+    a sheet outside sync_students() must call this, the next sync then
+    re-reads the Email column.
+    """
+    from .models import SheetSyncState
+
+    SheetSyncState.objects.filter(spreadsheet_name=spreadsheet_name).update(row_map=None)
+
+
+def load_row_map(backend, state):
+    """
+    {student id (as a string): row number} for the sheet.
+    Stored on the sync state between syncs, so a student keeps their row
+    when their email changes. The Email column is only read again when the
+    map was dropped by another writer or a sync failed halfway, matching
+    rows to the students' current emails. Appended rows are numbered from
+    where the append landed, never from a remembered end of the sheet.
+    """
+    if state.row_map is not None:
+        return state.row_map
+
+    student_ids = {
+        email.strip().lower(): student_id
+        for student_id, email in User.objects.filter(role="student").exclude(email='').values_list('id', 'email')
+    }
+    row_map = {}
+    # Row 1 holds the headers
+    for number, email in enumerate(backend.get_column(EMAIL_COLUMN)[1:], start=2):
+        student_id = student_ids.get(email.strip().lower())
+        if student_id:
+            row_map.setdefault(str(student_id), number)
+    return row_map
+
+
+def reset_sync(spreadsheet_name):
+    """Forget the watermark and the row map, the next sync revisits every student"""
+    from .models import SheetSyncState
+
+    SheetSyncState.objects.filter(spreadsheet_name=spreadsheet_name).update(
+        synced_updated_at=None,
+        synced_user_id=0,
+        row_map=None
+    )
+
+
+def sync_students(backend, spreadsheet_name, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Push students created or changed since the sheet's watermark.
+    Students already in the sheet are overwritten in place, the rest
+    appended: at most one update and one append request per chunk.
+    The watermark and the row map are saved after every chunk, so a failed
+    sync resumes there. Students without an email are skipped, a rebuilt
+    row map could not find their rows.
+    """
+    with sheet_lock(spreadsheet_name) as state:
+        try:
+            state.last_appended = 0
+            state.last_updated = 0
+
+            ensure_headers_cached(backend, spreadsheet_name, EXPORT_HEADERS)
+            # Reloaded: the headers check may have dropped the map
+            state.refresh_from_db(fields=['row_map'])
+            row_map = load_row_map(backend, state)
+
+            students = User.objects.filter(role="student").select_related("student_profile").order_by('updated_at', 'id')
+            if state.synced_updated_at:
+                students = students.filter(
+                    Q(updated_at__gt=state.synced_updated_at) |
+                    Q(updated_at=state.synced_updated_at, id__gt=state.synced_user_id)
+                )
+
+            chunk = []
+            for student in students.iterator(chunk_size=chunk_size):
+                chunk.append(student)
+                if len(chunk) == chunk_size:
+                    _sync_chunk(backend, state, row_map, chunk)
+                    chunk = []
+            if chunk:
+                _sync_chunk(backend, state, row_map, chunk)
+
+            state.last_synced_at = timezone.now()
+            state.save(update_fields=['last_appended', 'last_updated', 'last_synced_at'])
+            return state
+
+        except Exception:
+            # An append may have landed without the map knowing its rows
+            forget_row_map(spreadsheet_name)
+            raise
+
+
+def _sync_chunk(backend, state, row_map, students):
+    updates = {}
+    appends = {}
+    for student in students:
+        if not _safe(student.email):
+            continue
+        number = row_map.get(str(student.id))
+        if number:
+            updates[number] = student_export_row(student)
+        else:
+            appends[str(student.id)] = student_export_row(student)
+
+    if updates:
+        backend.update_rows(updates)
+    if appends:
+        first_row = backend.append_rows(list(appends.values()))
+        for offset, student_id in enumerate(appends):
+            row_map[student_id] = first_row + offset
+
+    state.synced_updated_at = students[-1].updated_at
+    state.synced_user_id = students[-1].id
+    state.last_appended += len(appends)
+    state.last_updated += len(updates)
+    state.row_map = row_map
+    state.save(update_fields=['synced_updated_at', 'synced_user_id', 'last_appended', 'last_updated', 'row_map'])
+
+
+@receiver(post_save, sender=StudentProfile)
+def touch_student_updated_at(sender, instance, **kwargs):
+    # Profile edits must move the user past the sheet sync watermark
+    User.objects.filter(pk=instance.user_id).update(updated_at=timezone.now())
+
+
+# ===== Registration outbox =====
+
+def registration_row(user, photo_url=""):
+    profile = getattr(user, "student_profile", None)
+    if not photo_url and profile and getattr(profile, "photo", None):
+        photo_url = f"{settings.MEDIA_URL}{profile.photo.url}"
+    return student_export_row(user) + [f'=IMAGE("{photo_url}")' if photo_url else ""]
+
+
+def registration_backend():
+    return get_sheet_backend(REGISTRATION_SPREADSHEET, 'env')
+
+
+def write_registrations(backend, users_with_photos):
+    """Append registration rows for [(user, photo_url)] with a single request"""
+    ensure_headers_cached(backend, REGISTRATION_SPREADSHEET, REGISTRATION_HEADERS)
+    backend.append_rows([registration_row(user, photo_url) for user, photo_url in users_with_photos])
+    forget_row_map(REGISTRATION_SPREADSHEET)
+
+
+@register_handler('sheet_registration')
+def _sheet_registration_jobs(jobs):
+    """
+    Flush queued registrations: one query for the users, one append_rows for
+    the whole batch. A failed write fails every job so they are retried together.
+    """
+
+    users = User.objects.select_related("student_profile").in_bulk(
+        [job.payload['user_id'] for job in jobs]
+    )
+    rows = [
+        (users[job.payload['user_id']], job.payload.get('photo_url', ''))
+        for job in jobs
+        # Users deleted (e.g. rejected) before the flush are skipped
+        if job.payload['user_id'] in users
+    ]
+    if not rows:
+        return {}
+
+    try:
+        write_registrations(registration_backend(), rows)
+    except Exception as e:
+        # The sheet may have been cleared or replaced, reopen it and
+        # re-check headers next time
+        cache.delete(f"sheets:headers:{REGISTRATION_SPREADSHEET}")
+        registry.forget_spreadsheet(REGISTRATION_SPREADSHEET, 'env')
+        return {job.id: e for job in jobs}
+
+    print(f" Exported {len(rows)} registration(s) to Google Sheet")
+    return {}
@@ -0,0 +1,122 @@
+# notifications/stream.py
+import asyncio
+import json
+import secrets
+from datetime import timedelta
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.http import JsonResponse, StreamingHttpResponse
+from django.utils import timezone
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError, AuthenticationFailed
+from .broker import get_broker
+from .counters import get_unread_count
+from .models import Notification, StreamTicket
+from .serializers import NotificationSerializer
+
+
+def ticket_ttl():
+    return getattr(settings, 'NOTIFICATION_STREAM_TICKET_TTL', 30)
+
+
+def issue_stream_ticket(user):
+    """Create a ticket for `user` and drop the expired ones"""
+    StreamTicket.objects.filter(created_at__lt=timezone.now() - timedelta(seconds=ticket_ttl())).delete()
+    return StreamTicket.objects.create(key=secrets.token_urlsafe(32), user=user)
+
+
+def _redeem_ticket(key):
+    """Consume a ticket and return its user, None if unknown, used or expired"""
+    with transaction.atomic():
+        ticket = StreamTicket.objects.select_for_update().select_related('user').filter(key=key).first()
+        if ticket is None:
+            return None
+        ticket.delete()
+    if ticket.created_at < timezone.now() - timedelta(seconds=ticket_ttl()):
+        return None
+    return ticket.user if ticket.user.is_active else None
+
+
+def _authenticate(request):
+    """
+    JWT from the Authorization header, or a ticket from ?ticket= because
+    browsers' EventSource cannot send headers. Tokens are never accepted in
+    the query string, where they would be logged.
+    """
+    header = request.headers.get('Authorization', '')
+    if header.startswith('Bearer '):
+        auth = JWTAuthentication()
+        try:
+            return auth.get_user(auth.get_validated_token(header.split(' ', 1)[1]))
+        except (InvalidToken, TokenError, AuthenticationFailed):
+            return None
+
+    ticket = request.GET.get('ticket')
+    return _redeem_ticket(ticket) if ticket else None
+
+
+def _latest_notification_id(user_id):
+    return Notification.objects.filter(recipient_id=user_id).order_by('-id').values_list('id', flat=True).first() or 0
+
+
+def _new_notifications(user_id, last_id):
+    notifications = Notification.objects.filter(
+        recipient_id=user_id,
+        id__gt=last_id
+    ).select_related('sender').order_by('id')[:100]
+    return NotificationSerializer(notifications, many=True).data, get_unread_count(user_id)
+
+
+def _event(event, data, event_id=None):
+    lines = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{lines}event: {event}\ndata: {json.dumps(data, cls=DjangoJSONEncoder)}\n\n"
+
+
+async def _event_stream(user_id, last_id):
+    broker = get_broker()
+    heartbeat = getattr(settings, 'NOTIFICATION_STREAM_HEARTBEAT', 15)
+    subscription = broker.subscribe(user_id)
+    try:
+        yield "retry: 5000\n\n"
+        while True:
+            notifications, unread = await sync_to_async(_new_notifications)(user_id, last_id)
+            for notification in notifications:
+                last_id = notification['id']
+                yield _event('notification', notification, event_id=last_id)
+            if notifications:
+                yield _event('unread_count', {'count': unread})
+
+            try:
+                await asyncio.wait_for(subscription.wait(), timeout=heartbeat)
+            except asyncio.TimeoutError:
+                # Keeps proxies from closing the connection; the loop then
+                # re-checks the database in case a wakeup was missed
+                yield ": heartbeat\n\n"
+    finally:
+        broker.unsubscribe(user_id, subscription)
+
+
+async def notification_stream(request):
+    """
+    Server-Sent Events stream of the user's new notifications.
+    Emits `notification` events (serialized like the REST API) followed by an
+    `unread_count` event. Reconnecting clients resume from Last-Event-ID,
+    with a fresh ticket from the stream ticket endpoint.
+    """
+    user = await sync_to_async(_authenticate)(request)
+    if user is None:
+        return JsonResponse({'error': 'Authentication credentials were not provided or are invalid'}, status=401)
+
+    last_id = request.headers.get('Last-Event-ID')
+    if last_id and last_id.isdigit():
+        last_id = int(last_id)
+    else:
+        last_id = await sync_to_async(_latest_notification_id)(user.id)
+
+    response = StreamingHttpResponse(_event_stream(user.id, last_id), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Stop nginx from buffering the stream
+    response['X-Accel-Buffering'] = 'no'
+    return response
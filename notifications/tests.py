@@ -1,3 +1,571 @@
-from django.test import TestCase
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient, APIRequestFactory, force_authenticate
+from rest_framework_simplejwt.tokens import AccessToken
+from authentication.models import User, StudentProfile
+from courses.models import Course, Batch
+from notifications.models import (
+    Notification, ArchivedNotification, QueuedJob, SheetExportRun, SheetSyncState, StreamTicket,
+)
+from notifications.utils import (
+    create_notification, notify_on_task_submission, export_student_to_google_sheet,
+)
+from notifications.counters import get_unread_count, reconcile_unread_counts
+from notifications.stream import _authenticate
+from notifications.views import StreamTicketView
+from notifications.retention import archive_read_notifications
+from notifications import queue
+from notifications.sheets import (
+    REGISTRATION_HEADERS, MemoryBackend, GspreadBackend, EXPORT_HEADERS, ensure_headers,
+    export_students, start_export_run, sync_students,
+)
+from notifications.integrations import CREDENTIAL_SOURCES, IntegrationRegistry
 
-# Create your tests here.
+
+class NotificationFanOutTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.sender = User.objects.create(username='sender', role='admin')
+        self.users = [User.objects.create(username=f'u{i}', role='student') for i in range(5)]
+
+    def test_duplicates_and_the_sender_are_skipped(self):
+        recipients = [self.users[0], self.users[0].id, self.users[1], self.sender, None]
+        create_notification(recipients, self.sender, 'task_created', 'Title', 'Message')
+        self.assertEqual(
+            sorted(Notification.objects.values_list('recipient_id', flat=True)),
+            [self.users[0].id, self.users[1].id]
+        )
+
+    def test_rows_are_inserted_in_chunks(self):
+        with mock.patch('notifications.utils.NOTIFICATION_BATCH_SIZE', 2):
+            with CaptureQueriesContext(connection) as queries:
+                ids = create_notification(self.users, self.sender, 'task_created', 'Title', 'Message')
+        inserts = [q for q in queries.captured_queries if q['sql'].startswith('INSERT INTO "notifications_notification"')]
+        self.assertEqual(len(inserts), 3)
+        self.assertEqual(len(ids), 5)
+        self.assertEqual(Notification.objects.count(), 5)
+
+    @override_settings(NOTIFICATION_QUEUE_ENABLED=False)
+    def test_submission_notifies_the_batch_mentor_and_admins(self):
+        from tasks.models import Task, TaskSubmission
+
+        mentor = User.objects.create(username='mentor', role='mentor')
+        student = self.users[0]
+        course = Course.objects.create(name='Python', code='PY1', description='d', duration_weeks=4)
+        batch = Batch.objects.create(name='B1', course=course, mentor=mentor, start_date='2025-01-01', end_date='2025-12-01')
+        task = Task.objects.create(course=course, batch=batch, title='T', description='x', due_date=timezone.now())
+        submission = TaskSubmission.objects.create(task=task, student=student)
+        Notification.objects.all().delete()
+
+        notify_on_task_submission(task, student, submission)
+        self.assertEqual(
+            set(Notification.objects.filter(notification_type='task_submitted').values_list('recipient_id', flat=True)),
+            {mentor.id, self.sender.id}
+        )
+
+
+class KeysetPaginationTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(username='student', role='student')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        notifications = [
+            Notification(recipient=self.user, notification_type='task_created', title=f'N{i}', message='m')
+            for i in range(7)
+        ]
+        created = Notification.objects.bulk_create(notifications)
+        # Ties on created_at must be broken by id across page boundaries
+        same_time = timezone.now()
+        Notification.objects.filter(id__in=[n.id for n in created[2:6]]).update(created_at=same_time)
+        Notification.objects.filter(id__in=[n.id for n in created[6:]]).update(created_at=same_time + timedelta(seconds=1))
+
+    def test_cursor_round_trip_visits_every_row_once_in_order(self):
+        expected = list(Notification.objects.filter(recipient=self.user).order_by('-created_at', '-id').values_list('id', flat=True))
+
+        seen = []
+        url = '/api/notifications/notifications/?page_size=3'
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertLessEqual(len(response.data['results']), 3)
+            seen += [row['id'] for row in response.data['results']]
+            url = response.data['next']
+
+        self.assertEqual(seen, expected)
+
+    def test_invalid_cursor_is_rejected(self):
+        response = self.client.get('/api/notifications/notifications/?cursor=not-a-cursor')
+        self.assertEqual(response.status_code, 404)
+
+
+class NotificationArchiveTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create(username='student', role='student')
+        self.old_read = [self.make(f'old {i}', is_read=True, days=100) for i in range(3)]
+        self.old_unread = self.make('old unread', is_read=False, days=100)
+        self.recent_read = self.make('recent', is_read=True, days=1)
+
+    def make(self, title, is_read, days):
+        notification = Notification.objects.create(
+            recipient=self.user, notification_type='task_created', title=title, message='m', is_read=is_read
+        )
+        Notification.objects.filter(id=notification.id).update(created_at=timezone.now() - timedelta(days=days))
+        notification.refresh_from_db()
+        return notification
+
+    def test_old_read_notifications_are_copied_then_deleted(self):
+        self.assertEqual(archive_read_notifications(days=90, batch_size=2), 3)
+
+        self.assertEqual(
+            set(Notification.objects.values_list('id', flat=True)),
+            {self.old_unread.id, self.recent_read.id}
+        )
+        archived = {row.id: row for row in ArchivedNotification.objects.all()}
+        self.assertEqual(set(archived), {n.id for n in self.old_read})
+        for notification in self.old_read:
+            copy = archived[notification.id]
+            self.assertEqual(
+                (copy.recipient_id, copy.title, copy.message, copy.is_read, copy.created_at),
+                (notification.recipient_id, notification.title, notification.message, True, notification.created_at)
+            )
+
+    def test_batches_can_be_limited_and_resumed(self):
+        self.assertEqual(archive_read_notifications(days=90, batch_size=2, max_batches=1), 2)
+        self.assertEqual(archive_read_notifications(days=90, batch_size=2), 1)
+        self.assertEqual(archive_read_notifications(days=90, batch_size=2), 0)
+        self.assertEqual(ArchivedNotification.objects.count(), 3)
+
+    def test_command_uses_the_retention_setting(self):
+        out = StringIO()
+        with self.settings(NOTIFICATION_RETENTION_DAYS=0):
+            call_command('archive_notifications', stdout=out)
+        self.assertIn('Archived 4', out.getvalue())
+        self.assertEqual(list(Notification.objects.values_list('id', flat=True)), [self.old_unread.id])
+
+
+class RegistrationExportTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.backend = MemoryBackend()
+        patcher = mock.patch('notifications.sheets.registration_backend', return_value=self.backend)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def register(self, name):
+        user = User.objects.create(username=name, role='student', email=f'{name}@example.com')
+        export_student_to_google_sheet(user, photo_url=f'https://example.com/{name}.jpg')
+        return user
+
+    def flush(self):
+        return queue.run_jobs(queue.claim_jobs())
+
+    def test_registrations_are_queued_and_written_in_one_append(self):
+        self.register('a')
+        self.register('b')
+        self.assertEqual(QueuedJob.objects.filter(kind='sheet_registration').count(), 2)
+        self.assertEqual(self.backend.requests, 0)
+
+        self.assertEqual(self.flush(), (2, 0))
+        self.assertEqual(self.backend.rows[0], REGISTRATION_HEADERS)
+        self.assertEqual([row[2] for row in self.backend.rows[1:]], ['a@example.com', 'b@example.com'])
+        self.assertEqual(self.backend.rows[1][-1], '=IMAGE("https://example.com/a.jpg")')
+        # Header check, header write, one append
+        self.assertEqual(self.backend.requests, 3)
+
+    def test_header_check_is_cached_between_flushes(self):
+        self.register('a')
+        self.flush()
+        requests = self.backend.requests
+        self.register('b')
+        self.flush()
+        self.assertEqual(self.backend.requests, requests + 1)
+
+    def test_deleted_users_are_skipped(self):
+        self.register('a')
+        self.register('gone').delete()
+        self.assertEqual(self.flush(), (2, 0))
+        self.assertEqual([row[2] for row in self.backend.rows[1:]], ['a@example.com'])
+
+    def test_failed_write_retries_every_job(self):
+        self.register('a')
+        with mock.patch.object(self.backend, 'append_rows', side_effect=ConnectionError('down')):
+            self.assertEqual(self.flush(), (0, 1))
+        job = QueuedJob.objects.get()
+        self.assertEqual((job.status, job.attempts), ('pending', 1))
+
+
+class IntegrationRegistryTests(TestCase):
+
+    def setUp(self):
+        self.registry = IntegrationRegistry()
+        self.load_credentials = mock.Mock(return_value='credentials')
+        self.client = mock.Mock()
+        patchers = [
+            mock.patch.dict(CREDENTIAL_SOURCES, {'env': self.load_credentials}),
+            mock.patch('gspread.authorize', return_value=self.client),
+            mock.patch('notifications.sheets.registry', self.registry),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_backends_share_credentials_client_and_spreadsheet(self):
+        for _ in range(3):
+            GspreadBackend('Sheet').get_column(1)
+
+        self.load_credentials.assert_called_once()
+        self.client.open.assert_called_once_with('Sheet')
+        self.assertEqual(self.registry.stats['clients'], {'hits': 2, 'misses': 1})
+        self.assertEqual(self.registry.stats['spreadsheets'], {'hits': 2, 'misses': 1})
+
+    def test_forgotten_spreadsheets_are_reopened(self):
+        GspreadBackend('Sheet').get_column(1)
+        self.registry.forget_spreadsheet('Sheet')
+        GspreadBackend('Sheet').get_column(1)
+        self.assertEqual(self.client.open.call_count, 2)
+        self.load_credentials.assert_called_once()
+
+    def test_clear_authorizes_again(self):
+        GspreadBackend('Sheet').get_column(1)
+        self.registry.clear()
+        GspreadBackend('Sheet').get_column(1)
+        self.assertEqual(self.load_credentials.call_count, 2)
+
+
+class FailingBackend(MemoryBackend):
+    """Memory backend whose append requests start failing after `fail_after` appends"""
+
+    def __init__(self, fail_after):
+        super().__init__()
+        self.fail_after = fail_after
+        self.appends = 0
+
+    def append_rows(self, rows):
+        self.appends += 1
+        if self.appends > self.fail_after:
+            raise ConnectionError('quota exceeded')
+        return super().append_rows(rows)
+
+
+class SheetExportTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.students = [
+            User.objects.create(username=f's{i}', role='student', email=f's{i}@example.com', first_name=f'S{i}')
+            for i in range(5)
+        ]
+        User.objects.create(username='mentor', role='mentor', email='mentor@example.com')
+
+    def emails(self, backend):
+        return [row[2] for row in backend.rows[1:]]
+
+    def test_students_are_written_one_request_per_chunk(self):
+        backend = MemoryBackend()
+        run = export_students(backend, start_export_run('Sheet'), chunk_size=2)
+
+        self.assertEqual(backend.rows[0], EXPORT_HEADERS)
+        self.assertEqual(self.emails(backend), [s.email for s in self.students])
+        # Header check, header write and three chunks
+        self.assertEqual(backend.requests, 5)
+        self.assertEqual((run.status, run.exported, run.total), ('completed', 5, 5))
+
+    def test_failed_run_resumes_after_the_rows_already_written(self):
+        backend = FailingBackend(fail_after=2)
+        with self.assertRaises(ConnectionError):
+            export_students(backend, start_export_run('Sheet'), chunk_size=2)
+        run = SheetExportRun.objects.get()
+        self.assertEqual((run.status, run.exported, run.last_student_id), ('failed', 2, self.students[1].id))
+
+        backend.fail_after = 10
+        resumed = start_export_run('Sheet')
+        self.assertEqual(resumed.id, run.id)
+        export_students(backend, resumed, chunk_size=2)
+        self.assertEqual(self.emails(backend), [s.email for s in self.students])
+
+    def test_headers_are_inserted_above_existing_rows(self):
+        backend = MemoryBackend()
+        backend.rows = [['Old', 'Row', 'old@example.com']]
+        self.assertTrue(ensure_headers(backend, EXPORT_HEADERS))
+        self.assertEqual(backend.rows, [EXPORT_HEADERS, ['Old', 'Row', 'old@example.com']])
+        self.assertFalse(ensure_headers(backend, EXPORT_HEADERS))
+
+
+class IncrementalSheetSyncTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.backend = MemoryBackend()
+        for i in range(3):
+            self.add_student(f's{i}')
+
+    def add_student(self, name):
+        return User.objects.create(username=name, role='student', email=f'{name}@example.com', first_name=name)
+
+    def rows_for(self, email):
+        return [number for number, row in enumerate(self.backend.rows, start=1) if len(row) > 2 and row[2] == email]
+
+    def test_first_sync_appends_everyone_below_the_headers(self):
+        state = sync_students(self.backend, 'Sheet')
+        self.assertEqual(self.backend.rows[0], EXPORT_HEADERS)
+        self.assertEqual(state.last_appended, 3)
+        self.assertEqual(len(self.backend.rows), 4)
+
+    def test_unchanged_students_are_not_sent_again(self):
+        sync_students(self.backend, 'Sheet')
+        requests = self.backend.requests
+        state = sync_students(self.backend, 'Sheet')
+        self.assertEqual((state.last_appended, state.last_updated), (0, 0))
+        self.assertEqual(self.backend.requests, requests)
+
+    def test_changed_students_are_updated_in_place(self):
+        sync_students(self.backend, 'Sheet')
+        student = User.objects.get(username='s1')
+        row_number = self.rows_for('s1@example.com')[0]
+
+        student.first_name = 'Changed'
+        student.save()
+        state = sync_students(self.backend, 'Sheet')
+
+        self.assertEqual((state.last_appended, state.last_updated), (0, 1))
+        self.assertEqual(self.rows_for('s1@example.com'), [row_number])
+        self.assertEqual(self.backend.rows[row_number - 1][0], 'Changed')
+
+    def test_profile_edits_are_picked_up(self):
+        sync_students(self.backend, 'Sheet')
+        StudentProfile.objects.create(user=User.objects.get(username='s2'), guardian_name='Guardian')
+        state = sync_students(self.backend, 'Sheet')
+        self.assertEqual(state.last_updated, 1)
+        self.assertEqual(self.backend.rows[self.rows_for('s2@example.com')[0] - 1][8], 'Guardian')
+
+    def test_rows_appended_by_a_full_export_do_not_shift_the_mapping(self):
+        sync_students(self.backend, 'Sheet')
+        export_students(self.backend, start_export_run('Sheet'))
+
+        new = self.add_student('new')
+        sync_students(self.backend, 'Sheet')
+        [row_number] = self.rows_for('new@example.com')
+        self.assertEqual(row_number, len(self.backend.rows))
+
+        before = [list(row) for row in self.backend.rows]
+        new.first_name = 'Edited'
+        new.save()
+        sync_students(self.backend, 'Sheet')
+
+        changed = [i + 1 for i, (old, row) in enumerate(zip(before, self.backend.rows)) if old != row]
+        self.assertEqual(changed, [row_number])
+        self.assertEqual(len(self.backend.rows), len(before))
+
+    def test_headers_are_inserted_above_existing_rows(self):
+        self.backend.rows = [['Old', 'Row', 'old@example.com']]
+        sync_students(self.backend, 'Sheet')
+        self.assertEqual(self.backend.rows[0], EXPORT_HEADERS)
+        self.assertEqual(self.backend.rows[1][2], 'old@example.com')
+
+    def test_email_change_updates_the_same_row(self):
+        sync_students(self.backend, 'Sheet')
+        row_number = self.rows_for('s1@example.com')[0]
+        student = User.objects.get(username='s1')
+        student.email = 'renamed@example.com'
+        student.save()
+
+        state = sync_students(self.backend, 'Sheet')
+        self.assertEqual((state.last_appended, state.last_updated), (0, 1))
+        self.assertEqual(self.rows_for('renamed@example.com'), [row_number])
+        self.assertEqual(self.rows_for('s1@example.com'), [])
+
+    def test_row_map_is_shared_through_the_database(self):
+        sync_students(self.backend, 'Sheet')
+        # Another process: nothing in its cache
+        cache.clear()
+        student = User.objects.get(username='s0')
+        student.first_name = 'Changed'
+        student.save()
+
+        requests = self.backend.requests
+        sync_students(self.backend, 'Sheet')
+        # Headers re-checked, then one update; the Email column is not read
+        self.assertEqual(self.backend.requests, requests + 2)
+        self.assertEqual(len(self.backend.rows), 4)
+
+    def test_running_sync_holds_the_lock(self):
+        SheetSyncState.objects.create(spreadsheet_name='Sheet', locked_at=timezone.now())
+        with self.assertRaises(ValueError):
+            sync_students(self.backend, 'Sheet')
+        with self.assertRaises(ValueError):
+            export_students(self.backend, start_export_run('Sheet'))
+        self.assertEqual(self.backend.rows, [])
+
+    def test_stale_lock_is_taken_over_and_released(self):
+        SheetSyncState.objects.create(spreadsheet_name='Sheet', locked_at=timezone.now() - timedelta(hours=1))
+        state = sync_students(self.backend, 'Sheet')
+        self.assertEqual(state.last_appended, 3)
+        self.assertIsNone(SheetSyncState.objects.get(spreadsheet_name='Sheet').locked_at)
+
+
+class JobQueueRetryTests(TestCase):
+
+    def setUp(self):
+        self.calls = 0
+
+        def failing_handler(jobs):
+            self.calls += 1
+            return {job.id: RuntimeError('boom') for job in jobs}
+
+        queue.HANDLERS['test_failing'] = failing_handler
+        queue.HANDLERS['test_ok'] = lambda jobs: {}
+
+    def tearDown(self):
+        queue.HANDLERS.pop('test_failing', None)
+        queue.HANDLERS.pop('test_ok', None)
+
+    def make_due(self, job):
+        QueuedJob.objects.filter(id=job.id).update(run_after=timezone.now())
+
+    def test_successful_jobs_are_deleted(self):
+        queue.enqueue_job('test_ok', value=1)
+        self.assertEqual(queue.run_jobs(queue.claim_jobs()), (1, 0))
+        self.assertFalse(QueuedJob.objects.exists())
+
+    def test_failed_job_backs_off_then_stops_at_max_attempts(self):
+        job = queue.enqueue_job('test_failing')
+
+        for attempt in range(1, queue.MAX_ATTEMPTS + 1):
+            self.make_due(job)
+            claimed = queue.claim_jobs()
+            self.assertEqual([j.id for j in claimed], [job.id])
+            queue.run_jobs(claimed)
+            job.refresh_from_db()
+            self.assertEqual(job.attempts, attempt)
+            if attempt < queue.MAX_ATTEMPTS:
+                self.assertEqual(job.status, 'pending')
+                # Not due again until the backoff has passed
+                self.assertGreater(job.run_after, timezone.now())
+                self.assertEqual(queue.claim_jobs(), [])
+
+        self.assertEqual(job.status, 'failed')
+        self.assertEqual(job.last_error, 'boom')
+        self.make_due(job)
+        self.assertEqual(queue.claim_jobs(), [])
+        self.assertEqual(self.calls, queue.MAX_ATTEMPTS)
+
+    def test_jobs_of_a_crashed_worker_count_as_failed_attempts(self):
+        job = queue.enqueue_job('test_failing')
+
+        for _ in range(queue.MAX_ATTEMPTS):
+            self.make_due(job)
+            self.assertEqual(len(queue.claim_jobs()), 1)
+            # The worker dies without reporting back
+            QueuedJob.objects.filter(id=job.id).update(locked_at=timezone.now() - queue.STALE_AFTER * 2)
+            self.assertEqual(queue.requeue_stale_jobs(), 1)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'failed')
+        self.assertEqual(job.attempts, queue.MAX_ATTEMPTS)
+
+
+class UnreadCounterTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.sender = User.objects.create(username='sender', role='admin')
+        self.user = User.objects.create(username='student', role='student')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.url = '/api/notifications/notifications/unread_count/'
+
+    def notify(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            create_notification([self.user], self.sender, 'task_created', 'Title', 'Message')
+
+    def test_process_local_cache_counts_from_the_database(self):
+        self.notify()
+        self.assertEqual(self.client.get(self.url).data['count'], 1)
+        # Written by another process: no invalidation reaches this one
+        Notification.objects.create(
+            recipient=self.user, sender=self.sender, notification_type='task_created', title='T', message='M'
+        )
+        self.assertEqual(self.client.get(self.url).data['count'], 2)
+        reconcile_unread_counts([self.user.id])
+        self.assertEqual(cache.get(f'notifications:unread:{self.user.id}'), None)
+
+    @mock.patch('notifications.counters.cache_is_shared', return_value=True)
+    def test_shared_cache_is_invalidated_by_writes(self, _shared):
+        self.notify()
+        self.assertEqual(self.client.get(self.url).data['count'], 1)
+        with self.assertNumQueries(0):
+            self.assertEqual(get_unread_count(self.user.id), 1)
+
+        self.notify()
+        self.assertEqual(self.client.get(self.url).data['count'], 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post('/api/notifications/notifications/mark_all_read/')
+        self.assertEqual(self.client.get(self.url).data['count'], 0)
+
+    @mock.patch('notifications.counters.cache_is_shared', return_value=True)
+    def test_recount_racing_with_a_write_is_not_cached(self, _shared):
+        self.notify()
+        counted = Notification.objects.filter(recipient=self.user, is_read=False).count()
+
+        def count_then_write(user_id):
+            self.notify()
+            return counted
+
+        with mock.patch('notifications.counters.count_unread', side_effect=count_then_write):
+            self.assertEqual(get_unread_count(self.user.id), 1)
+        self.assertEqual(get_unread_count(self.user.id), 2)
+
+
+class StreamTicketTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create(username='student', role='student')
+
+    def issue_ticket(self):
+        request = APIRequestFactory().post('/api/notifications/stream/ticket/')
+        force_authenticate(request, self.user)
+        response = StreamTicketView.as_view()(request)
+        self.assertEqual(response.status_code, 201)
+        return response.data['ticket']
+
+    def authenticate(self, **params):
+        return _authenticate(RequestFactory().get('/api/notifications/stream/', params))
+
+    def test_ticket_opens_the_stream_once(self):
+        ticket = self.issue_ticket()
+        self.assertEqual(self.authenticate(ticket=ticket), self.user)
+        self.assertIsNone(self.authenticate(ticket=ticket))
+        self.assertFalse(StreamTicket.objects.exists())
+
+    def test_expired_ticket_is_rejected(self):
+        ticket = self.issue_ticket()
+        StreamTicket.objects.update(created_at=timezone.now() - timedelta(minutes=5))
+        self.assertIsNone(self.authenticate(ticket=ticket))
+
+    def test_issuing_drops_expired_tickets(self):
+        self.issue_ticket()
+        StreamTicket.objects.update(created_at=timezone.now() - timedelta(minutes=5))
+        self.issue_ticket()
+        self.assertEqual(StreamTicket.objects.count(), 1)
+
+    def test_jwt_in_the_query_string_is_rejected(self):
+        self.assertIsNone(self.authenticate(token=str(AccessToken.for_user(self.user))))
+
+    def test_stream_is_not_routed_outside_asgi(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        self.assertEqual(client.get('/api/notifications/stream/').status_code, 404)
+        self.assertEqual(client.post('/api/notifications/stream/ticket/').status_code, 404)
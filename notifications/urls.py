@@ -1,10 +1,21 @@
+from django.conf import settings
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import NotificationViewSet
+from .views import NotificationViewSet, NotificationQueueStatsView, StreamTicketView
+from .stream import notification_stream
 
 router = DefaultRouter()
 router.register('notifications', NotificationViewSet, basename='notification')
 
 urlpatterns = [
+    path('queue-stats/', NotificationQueueStatsView.as_view(), name='notification-queue-stats'),
     path('', include(router.urls)),
 ]
+
+# The stream holds its connection open, which would tie up a WSGI worker per
+# client; it is only served by the ASGI application (see asgi.py)
+if settings.NOTIFICATION_STREAM_ENABLED:
+    urlpatterns = [
+        path('stream/', notification_stream, name='notification-stream'),
+        path('stream/ticket/', StreamTicketView.as_view(), name='notification-stream-ticket'),
+    ] + urlpatterns
@@ -1,5 +1,10 @@
 from .models import Notification
+from .queue import enqueue_job, queue_enabled, register_handler
+from .counters import invalidate_unread_counts
+from .broker import publish_new_notifications
 from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.core.exceptions import ObjectDoesNotExist
 
 
 
@@ -23,31 +28,60 @@ from django.utils import timezone
 
 User = get_user_model()
 
-def create_notification(recipients, sender, notification_type, title, message, link=None):
-    """Create notifications for multiple recipients"""
+# Rows per INSERT when fanning notifications out
+NOTIFICATION_BATCH_SIZE = 500
+
+
+def build_notifications(recipients, sender, notification_type, title, message, link=None):
+    """
+    Build (unsaved) notifications, one per distinct recipient.
+    Recipients may be users or user ids; duplicates are dropped by id and the
+    sender never notifies themselves.
+    """
+    sender_id = sender.id if sender else None
+    seen = set()
     notifications = []
-    unique_recipients = list(set(recipients))
     
-    for recipient in unique_recipients:
-        if recipient == sender:
+    for recipient in recipients:
+        recipient_id = getattr(recipient, 'id', recipient)
+        if recipient_id is None or recipient_id == sender_id or recipient_id in seen:
             continue
-            
-        notif = Notification.objects.create(
-            recipient=recipient,
+        seen.add(recipient_id)
+        
+        notifications.append(Notification(
+            recipient_id=recipient_id,
             sender=sender,
             notification_type=notification_type,
             title=title,
             message=message,
             link=link
-        )
-        notifications.append(notif)
+        ))
     
-    print(f" Created {len(notifications)} notifications for {notification_type}")
     return notifications
 
 
-def notify_on_task_submission(task, student, submission):
-    """Notify mentor and admin when student submits a task"""
+def save_notifications(notifications):
+    """Write notifications with chunked bulk inserts and return the created ids"""
+    if not notifications:
+        return []
+    created = Notification.objects.bulk_create(notifications, batch_size=NOTIFICATION_BATCH_SIZE)
+    invalidate_unread_counts(notif.recipient_id for notif in created if not notif.is_read)
+    publish_new_notifications(notif.recipient_id for notif in created)
+    return [notif.id for notif in created]
+
+
+def create_notification(recipients, sender, notification_type, title, message, link=None):
+    """Create notifications for multiple recipients, returns the created ids"""
+    notification_ids = save_notifications(
+        build_notifications(recipients, sender, notification_type, title, message, link)
+    )
+    
+    print(f" Created {len(notification_ids)} notifications for {notification_type}")
+    return notification_ids
+
+
+def build_task_submission_notifications(task, student, submission):
+    """Notifications for mentor and admin when student submits a task"""
     recipients = []
     
     print(f"\n{'='*60}")
@@ -58,26 +92,25 @@ def notify_on_task_submission(task, student, submission):
     print(f"Batch: {task.batch}")
     
     # Get mentor from batch
-    if task.batch and task.batch.mentor:
-        recipients.append(task.batch.mentor)
-        print(f" Added mentor: {task.batch.mentor.username}")
+    if task.batch and task.batch.mentor_id:
+        recipients.append(task.batch.mentor_id)
+        print(f" Added mentor: {task.batch.mentor_id}")
     else:
         print(f" No mentor found for batch: {task.batch}")
         # For course-wide tasks, get all mentors of course batches
-        if task.course:
+        if task.course_id:
             from courses.models import Batch
-            course_batches = Batch.objects.filter(course=task.course)
-            for batch in course_batches:
-                if batch.mentor:
-                    recipients.append(batch.mentor)
-                    print(f" Added mentor from {batch.name}: {batch.mentor.username}")
+            course_mentor_ids = Batch.objects.filter(
+                course_id=task.course_id,
+                mentor__isnull=False
+            ).values_list('mentor_id', flat=True)
+            recipients.extend(course_mentor_ids)
+            print(f" Added {len(recipients)} mentor(s) from course batches")
     
     # Get all admins
-    admins = User.objects.filter(role='admin')
-    recipients.extend(admins)
-    print(f" Added {admins.count()} admin(s)")
-    for admin in admins:
-        print(f"   - {admin.username}")
+    admin_ids = list(User.objects.filter(role='admin').values_list('id', flat=True))
+    recipients.extend(admin_ids)
+    print(f" Added {len(admin_ids)} admin(s)")
     
     if not recipients:
         print(f"❌ ERROR: No recipients found!")
@@ -85,10 +118,11 @@ def notify_on_task_submission(task, student, submission):
         return []
     
     print(f"\n Total unique recipients: {len(set(recipients))}")
+    print(f"{'='*60}\n")
     
     link = f"/mentor/grade-submissions/{task.batch.id}" if task.batch else "/admin/tasks"
     
-    result = create_notification(
+    return build_notifications(
         recipients=recipients,
         sender=student,
         notification_type='task_submitted',
@@ -96,16 +130,13 @@ def notify_on_task_submission(task, student, submission):
         message=f"{student.first_name} {student.last_name} submitted '{task.title}'",
         link=link
     )
-    
-    print(f"{'='*60}\n")
-    return result
 
 
-def notify_on_task_graded(submission, grader):
-    """Notify student when task is graded"""
+def build_task_graded_notifications(submission, grader):
+    """Notification for the student when their task is graded"""
     print(f" Task graded notification for {submission.student.username}")
-    return create_notification(
-        recipients=[submission.student],
+    return build_notifications(
+        recipients=[submission.student_id],
         sender=grader,
         notification_type='task_graded',
         title=f"Task Graded: {submission.task.title}",
@@ -114,22 +145,38 @@ def notify_on_task_graded(submission, grader):
     )
 
 
-def notify_on_task_created(task, creator):
-    """Notify students when new task is created"""
-    recipients = list(task.assigned_to.filter(is_approved=True))
+def build_tasks_graded_notifications(submissions, grader):
+    """Notifications for a batch of graded submissions, one per submission"""
+    notifications = []
+    for submission in submissions:
+        notifications.extend(build_notifications(
+            recipients=[submission.student_id],
+            sender=grader,
+            notification_type='task_graded',
+            title=f"Task Graded: {submission.task.title}",
+            message=f"You received {submission.marks_obtained}/{submission.task.max_marks} marks",
+            link="/student/submissions"
+        ))
+    print(f" Task graded notifications for {len(notifications)} submission(s)")
+    return notifications
+
+
+def build_task_created_notifications(task, creator):
+    """Notifications for students (and mentor/admin) when a new task is created"""
+    recipients = list(task.assigned_to.filter(is_approved=True).values_list('id', flat=True))
     
     print(f"Task created notification - {task.title}")
     print(f"   Assigned to {len(recipients)} students")
     
     # If mentor creates task, notify admin
     if creator.role == 'mentor':
-        recipients.extend(User.objects.filter(role='admin'))
+        recipients.extend(User.objects.filter(role='admin').values_list('id', flat=True))
     
     # If admin creates task, notify mentor
-    if creator.role == 'admin' and task.batch and task.batch.mentor:
-        recipients.append(task.batch.mentor)
+    if creator.role == 'admin' and task.batch and task.batch.mentor_id:
+        recipients.append(task.batch.mentor_id)
     
-    return create_notification(
+    return build_notifications(
         recipients=recipients,
         sender=creator,
         notification_type='task_created',
@@ -139,91 +186,176 @@ def notify_on_task_created(task, creator):
     )
 
 
+def build_tasks_imported_notifications(tasks, creator):
+    """One notification per student for a batch of imported tasks, instead of one per task"""
+    from tasks.models import Task
+    tasks = list(tasks)
+    if not tasks:
+        return []
+    
+    recipients = list(
+        Task.assigned_to.through.objects.filter(
+            task_id__in=[task.id for task in tasks],
+            user__is_approved=True
+        ).values_list('user_id', flat=True).distinct()
+    )
+    
+    batch = tasks[0].batch
+    if creator.role == 'mentor':
+        recipients.extend(User.objects.filter(role='admin').values_list('id', flat=True))
+    if creator.role == 'admin' and batch and batch.mentor_id:
+        recipients.append(batch.mentor_id)
+    
+    print(f"Tasks imported notification - {len(tasks)} task(s) for {len(set(recipients))} recipient(s)")
+    
+    return build_notifications(
+        recipients=recipients,
+        sender=creator,
+        notification_type='task_created',
+        title="New Tasks Assigned",
+        message=f"{len(tasks)} new tasks have been assigned in {tasks[0].course.name}",
+        link="/student/tasks"
+    )
 
 
+def notify_on_task_submission(task, student, submission):
+    """Notify mentor and admin when student submits a task"""
+    if queue_enabled():
+        return enqueue_job('task_submitted', task_id=task.id, student_id=student.id, submission_id=submission.id)
+    return save_notifications(build_task_submission_notifications(task, student, submission))
 
-# ============google sheet integration===============
 
+def notify_on_task_graded(submission, grader):
+    """Notify student when task is graded"""
+    if queue_enabled():
+        return enqueue_job('task_graded', submission_id=submission.id, grader_id=grader.id)
+    return save_notifications(build_task_graded_notifications(submission, grader))
+
+
+def notify_on_tasks_graded(submissions, grader):
+    """Notify students of a bulk grading, as a single job / bulk insert"""
+    if queue_enabled():
+        return enqueue_job('tasks_graded', submission_ids=[sub.id for sub in submissions], grader_id=grader.id)
+    return save_notifications(build_tasks_graded_notifications(submissions, grader))
+
+
+def notify_on_tasks_imported(tasks, creator):
+    """Notify students once for a whole task import"""
+    if queue_enabled():
+        return enqueue_job('tasks_imported', task_ids=[task.id for task in tasks], creator_id=creator.id)
+    return save_notifications(build_tasks_imported_notifications(tasks, creator))
+
+
+def notify_on_task_created(task, creator):
+    """Notify students when new task is created"""
+    if queue_enabled():
+        return enqueue_job('task_created', task_id=task.id, creator_id=creator.id)
+    return save_notifications(build_task_created_notifications(task, creator))
+
+
+# ===== Queue handlers (run by `manage.py notification_worker`) =====
+
+def notification_job_handler(build):
+    """
+    Wrap a per-job builder into a batch handler: notifications of every job in
+    the batch are written together with one chunked bulk insert.
+    """
+    def handler(jobs):
+        errors = {}
+        notifications = []
+        for job in jobs:
+            try:
+                notifications.extend(build(job.payload))
+            except ObjectDoesNotExist:
+                # Task/submission was deleted before the worker got to it
+                continue
+            except Exception as e:
+                errors[job.id] = e
+        
+        with transaction.atomic():
+            notification_ids = save_notifications(notifications)
+        print(f" Worker created {len(notification_ids)} notifications for {len(jobs) - len(errors)} job(s)")
+        return errors
+    return handler
+
+
+@register_handler('task_submitted')
+@notification_job_handler
+def _task_submitted_job(payload):
+    from tasks.models import Task, TaskSubmission
+    task = Task.objects.select_related('batch').get(id=payload['task_id'])
+    student = User.objects.get(id=payload['student_id'])
+    submission = TaskSubmission.objects.get(id=payload['submission_id'])
+    return build_task_submission_notifications(task, student, submission)
+
+
+@register_handler('task_graded')
+@notification_job_handler
+def _task_graded_job(payload):
+    from tasks.models import TaskSubmission
+    submission = TaskSubmission.objects.select_related('task', 'student').get(id=payload['submission_id'])
+    grader = User.objects.get(id=payload['grader_id'])
+    return build_task_graded_notifications(submission, grader)
+
+
+@register_handler('tasks_graded')
+@notification_job_handler
+def _tasks_graded_job(payload):
+    from tasks.models import TaskSubmission
+    submissions = TaskSubmission.objects.select_related('task').filter(id__in=payload['submission_ids'])
+    grader = User.objects.get(id=payload['grader_id'])
+    return build_tasks_graded_notifications(submissions, grader)
+
+
+@register_handler('tasks_imported')
+@notification_job_handler
+def _tasks_imported_job(payload):
+    from tasks.models import Task
+    tasks = Task.objects.select_related('course', 'batch').filter(id__in=payload['task_ids'])
+    creator = User.objects.get(id=payload['creator_id'])
+    return build_tasks_imported_notifications(tasks, creator)
+
+
+@register_handler('task_created')
+@notification_job_handler
+def _task_created_job(payload):
+    from tasks.models import Task
+    task = Task.objects.select_related('batch').get(id=payload['task_id'])
+    creator = User.objects.get(id=payload['creator_id'])
+    return build_task_created_notifications(task, creator)
+
+
+
+
+
+# ============google sheet integration===============
 
 
-import os, json, base64
-from google.oauth2.service_account import Credentials
 
 def get_google_credentials():
-    """Load Google credentials from BASE64 environment variable"""
-    data = os.getenv("GOOGLE_SHEET_CREDENTIALS_BASE64")
-    if not data:
-        raise ValueError("GOOGLE_SHEET_CREDENTIALS_BASE64 not found in environment.")
-
-    creds_dict = json.loads(base64.b64decode(data))
-    creds = Credentials.from_service_account_info(
-        creds_dict,
-        scopes=[
-            "https://www.googleapis.com/auth/spreadsheets",
-            "https://www.googleapis.com/auth/drive"
-        ]
-    )
-    return creds
+    """Google credentials from the BASE64 environment variable, cached per process"""
+    from .integrations import registry
+    return registry.credentials('env')
         
 
 
 
 
-def export_student_to_google_sheet(user):
-    """Export a single newly registered student (with photo) to Google Sheet"""
+def export_student_to_google_sheet(user, photo_url=""):
+    """
+    Export a newly registered student (with photo) to the registrations sheet.
+    Queued for the worker, which flushes registrations in batches, so the
+    request itself does no Google API calls. Written directly when the queue
+    is disabled.
+    """
+    from .sheets import registration_backend, write_registrations
 
-    try:
-        #  Load credentials from BASE64 (no JSON file needed)
-        creds = get_google_credentials()
-
-        #  Authorize client
-        client = gspread.authorize(creds)
-
-        #  Open Google Sheet
-        sheet = client.open("Tefora_Registrations").sheet1
-
-        #  Add headers if sheet is empty
-        if not sheet.get_all_values():
-            headers = [
-                "First Name", "Last Name", "Email", "Phone", "Gender",
-                "Date of Birth", "Blood Group", "Address",
-                "Guardian Name", "Guardian Phone", "Photo"
-            ]
-            sheet.append_row(headers)
-
-        #  Safe text helper
-        def safe(value):
-            return str(value).strip() if value else ""
-
-        #  Get student profile
-        profile = getattr(user, "student_profile", None)
-
-        #  Get photo URL (if uploaded)
-        photo_url = ""
-        if profile and getattr(profile, "photo", None):
-            request = getattr(user, "_request", None)
-            if request:
-                photo_url = request.build_absolute_uri(profile.photo.url)
-            else:
-                photo_url = f"{settings.MEDIA_URL}{profile.photo.url}"
-
-        #  Append data row
-        sheet.append_row([
-            safe(user.first_name),
-            safe(user.last_name),
-            safe(user.email),
-            safe(getattr(user, "phone", "")),
-            safe(profile.gender if profile else ""),
-            profile.date_of_birth.strftime("%Y-%m-%d") if profile and profile.date_of_birth else "",
-            safe(profile.blood_group if profile else ""),
-            safe(profile.address if profile else ""),
-            safe(profile.guardian_name if profile else ""),
-            safe(profile.guardian_phone if profile else ""),
-            f'=IMAGE("{photo_url}")' if photo_url else ""
-        ])
+    if queue_enabled():
+        return enqueue_job('sheet_registration', user_id=user.id, photo_url=photo_url)
 
+    try:
+        write_registrations(registration_backend(), [(user, photo_url)])
         print(f" Exported {user.email} (with photo) to Google Sheet successfully.")
-
     except Exception as e:
         print(f" Google Sheet export failed: {e}")
 
@@ -3,29 +3,47 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from .models import Notification
-from .serializers import NotificationSerializer
+from rest_framework.views import APIView
+from authentication.permissions import IsAdmin
+from .models import Notification, ArchivedNotification
+from .serializers import NotificationSerializer, ArchivedNotificationSerializer
+from .queue import queue_depth
+from .integrations import registry
+from .counters import get_unread_count, invalidate_unread_counts
+from .stream import issue_stream_ticket, ticket_ttl
+from student_management.pagination import KeysetPagination
 
 class NotificationViewSet(viewsets.ModelViewSet):
     serializer_class = NotificationSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
     
     def get_queryset(self):
         return Notification.objects.filter(recipient=self.request.user)
     
+    def perform_update(self, serializer):
+        was_read = serializer.instance.is_read
+        notification = serializer.save()
+        if notification.is_read != was_read:
+            invalidate_unread_counts([notification.recipient_id])
+    
+    def perform_destroy(self, instance):
+        was_unread = not instance.is_read
+        instance.delete()
+        if was_unread:
+            invalidate_unread_counts([instance.recipient_id])
+    
     @action(detail=False, methods=['get'])
     def unread_count(self, request):
-        count = Notification.objects.filter(
-            recipient=request.user,
-            is_read=False
-        ).count()
-        return Response({'count': count})
+        return Response({'count': get_unread_count(request.user.id)})
     
     @action(detail=True, methods=['post'])
     def mark_read(self, request, pk=None):
         notification = self.get_object()
-        notification.is_read = True
-        notification.save()
+        if not notification.is_read:
+            notification.is_read = True
+            notification.save()
+            invalidate_unread_counts([request.user.id])
         return Response({'status': 'marked as read'})
     
     @action(detail=False, methods=['post'])
@@ -34,4 +52,38 @@ class NotificationViewSet(viewsets.ModelViewSet):
             recipient=request.user,
             is_read=False
         ).update(is_read=True)
-        return Response({'status': 'all marked as read'})
\ No newline at end of file
+        invalidate_unread_counts([request.user.id])
+        return Response({'status': 'all marked as read'})
+    
+    @action(detail=False, methods=['get'])
+    def archived(self, request):
+        """Read notifications moved to the archive by the retention job"""
+        queryset = ArchivedNotification.objects.filter(
+            recipient=request.user
+        ).select_related('sender')
+        page = self.paginate_queryset(queryset)
+        serializer = ArchivedNotificationSerializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+
+class NotificationQueueStatsView(APIView):
+    """
+    Queue depth of the background notification worker, plus this process's
+    integration client cache hit/miss counters (admins only)
+    """
+    permission_classes = [IsAuthenticated, IsAdmin]
+    
+    def get(self, request):
+        return Response({**queue_depth(), 'integrations': registry.stats})
+
+
+class StreamTicketView(APIView):
+    """Single-use ticket for opening the notification stream with ?ticket="""
+    permission_classes = [IsAuthenticated]
+    
+    def post(self, request):
+        ticket = issue_stream_ticket(request.user)
+        return Response(
+            {'ticket': ticket.key, 'expires_in': ticket_ttl()},
+            status=status.HTTP_201_CREATED
+        )
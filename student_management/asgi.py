@@ -12,5 +12,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'student_management.settings')
+# Serve the notification stream, which WSGI workers cannot hold open
+os.environ.setdefault('NOTIFICATION_STREAM_ENABLED', 'True')
 
 application = get_asgi_application()
@@ -0,0 +1,88 @@
+# student_management/cache.py
+import hashlib
+import time
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+from rest_framework.response import Response
+
+
+# Each scope has a version number stored in the cache. Cached responses embed
+# the versions of the scopes they depend on, so bumping a scope makes every
+# dependent key unreachable without having to know or delete the keys.
+SCOPE_KEY = 'scope-version:{}'
+
+
+def cache_is_shared():
+    """
+    Whether every process sees the same default cache. LocMemCache (used
+    when REDIS_URL is unset) lives inside one process, so an invalidation by
+    a write in another gunicorn worker or in the queue worker never reaches
+    it. Data that is invalidated on write is only cached in a shared cache.
+    """
+    return not isinstance(caches['default'], LocMemCache)
+
+
+def _seed_version(key):
+    """
+    Start a missing (never set or evicted) version at the current time in
+    nanoseconds. Counters restarting from a small constant could come back
+    to a version still embedded in live keys and serve stale responses; a
+    clock reading is ahead of any version handed out before the eviction.
+    """
+    cache.add(key, time.time_ns(), timeout=None)
+
+
+def scope_version(scope):
+    key = SCOPE_KEY.format(scope)
+    version = cache.get(key)
+    if version is None:
+        _seed_version(key)
+        # Another process may have seeded it first, use whatever won
+        version = cache.get(key)
+    return version
+
+
+def bump_scopes(*scopes):
+    """Invalidate every cached response depending on any of these scopes"""
+    if not cache_is_shared():
+        return
+    for scope in scopes:
+        key = SCOPE_KEY.format(scope)
+        try:
+            cache.incr(key)
+        except ValueError:
+            _seed_version(key)
+            cache.incr(key)
+
+
+class CachedListMixin:
+    """
+    Cache the serialized response of a list view.
+    Keys combine the view, the user (or only the role when `cache_per_user`
+    is False), the request host and query string, and the current versions
+    of `cache_scopes`. Responses are only cached in a shared cache, see
+    cache_is_shared(); with a per-process cache every request is served
+    from the database.
+    """
+    cache_scopes = ()
+    cache_per_user = True
+    cache_timeout = None
+
+    def get_cache_key(self, request):
+        user = request.user
+        owner = f"user-{user.id}" if self.cache_per_user else f"role-{user.role}"
+        versions = '.'.join(str(scope_version(scope)) for scope in self.cache_scopes)
+        query = hashlib.md5(request.get_full_path().encode()).hexdigest()
+        return f"list:{type(self).__name__}:{owner}:{request.get_host()}:{versions}:{query}"
+
+    def list(self, request, *args, **kwargs):
+        if not cache_is_shared():
+            return super().list(request, *args, **kwargs)
+        key = self.get_cache_key(request)
+        data = cache.get(key)
+        if data is None:
+            data = super().list(request, *args, **kwargs).data
+            timeout = self.cache_timeout or getattr(settings, 'LIST_CACHE_TIMEOUT', 300)
+            cache.set(key, data, timeout=timeout)
+        return Response(data)
@@ -0,0 +1,81 @@
+# student_management/pagination.py
+import base64
+import json
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Newest-first keyset pagination on (ordering_field, id).
+    Each page is a range scan starting after the last row of the previous one,
+    so the cost stays the same however deep the client pages. Only a `next`
+    cursor is returned.
+    """
+    ordering_field = 'created_at'
+    page_size = 50
+    max_page_size = 200
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except ValueError:
+            return self.page_size
+        return min(max(size, 1), self.max_page_size)
+
+    def encode_cursor(self, row):
+        value = getattr(row, self.ordering_field)
+        raw = json.dumps([value.isoformat(), row.id])
+        return base64.urlsafe_b64encode(raw.encode()).decode()
+
+    def decode_cursor(self, cursor):
+        try:
+            value, row_id = json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+            value = parse_datetime(value)
+            if value is None:
+                raise ValueError
+            return value, int(row_id)
+        except (TypeError, ValueError, UnicodeDecodeError):
+            raise NotFound('Invalid cursor')
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        page_size = self.get_page_size(request)
+        field = self.ordering_field
+
+        queryset = queryset.order_by(f'-{field}', '-id')
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            value, row_id = self.decode_cursor(cursor)
+            queryset = queryset.filter(
+                Q(**{f'{field}__lt': value}) |
+                Q(**{field: value, 'id__lt': row_id})
+            )
+
+        rows = list(queryset[:page_size + 1])
+        self.has_next = len(rows) > page_size
+        rows = rows[:page_size]
+        self.next_cursor = self.encode_cursor(rows[-1]) if self.has_next else None
+        return rows
+
+    def get_next_link(self):
+        if not self.next_cursor:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.next_cursor)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
+
+
+class SubmissionKeysetPagination(KeysetPagination):
+    ordering_field = 'submitted_at'
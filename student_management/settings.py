@@ -220,4 +220,66 @@ EMAIL_HOST_USER = os.getenv('EMAIL_HOST_USER')
 EMAIL_HOST_PASSWORD = os.getenv('EMAIL_HOST_PASSWORD')
 EMAIL_PORT = os.getenv('EMAIL_PORT')
 EMAIL_USE_TLS = os.getenv('EMAIL_USE_TLS') == 'True'
-DEFAULT_FROM_EMAIL = os.getenv('DEFAULT_FROM_EMAIL')
\ No newline at end of file
+DEFAULT_FROM_EMAIL = os.getenv('DEFAULT_FROM_EMAIL')
+
+
+# Notifications are queued and written by `python manage.py notification_worker`
+# (deployed as the aptms-worker systemd unit, see deploy/). Set to False to write them inside the request instead (no worker needed).
+NOTIFICATION_QUEUE_ENABLED = config("NOTIFICATION_QUEUE_ENABLED", default=True, cast=bool)
+
+# Cache used for list responses and unread-notification counters. Set
+# REDIS_URL in production: the locmem default is private to each process,
+# so writes in one gunicorn worker (or the queue worker) could not
+# invalidate the others. With locmem both caches are off and those reads go
+# to the database.
+REDIS_URL = config("REDIS_URL", default="")
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+LIST_CACHE_TIMEOUT = config("LIST_CACHE_TIMEOUT", default=300, cast=int)
+
+# Cached unread-notification counters expire after this many seconds and are
+# recounted on the next read. Run `manage.py reconcile_unread_counts` from cron
+# to overwrite them all at once. Only used with a shared cache (REDIS_URL);
+# otherwise every read counts from the database.
+NOTIFICATION_UNREAD_TTL = config("NOTIFICATION_UNREAD_TTL", default=3600, cast=int)
+
+# Server-Sent Events stream at /api/notifications/stream/, only routed when
+# NOTIFICATION_STREAM_ENABLED is set, which asgi.py does: serve it with an
+# ASGI server such as uvicorn or daphne. Clients authenticate with a
+# single-use ticket from POST /api/notifications/stream/ticket/ that expires
+# after NOTIFICATION_STREAM_TICKET_TTL seconds. The broker wakes open streams
+# when notifications are saved, including by the queue worker process:
+# PostgresBroker fans out over LISTEN/NOTIFY. InProcessBroker only reaches
+# streams of the saving process and is meant for single-process development.
+NOTIFICATION_BROKER = config(
+    "NOTIFICATION_BROKER",
+    default=(
+        "notifications.broker.PostgresBroker"
+        if DATABASES["default"]["ENGINE"] == "django.db.backends.postgresql"
+        else "notifications.broker.InProcessBroker"
+    )
+)
+NOTIFICATION_STREAM_ENABLED = config("NOTIFICATION_STREAM_ENABLED", default=False, cast=bool)
+NOTIFICATION_STREAM_TICKET_TTL = config("NOTIFICATION_STREAM_TICKET_TTL", default=30, cast=int)
+NOTIFICATION_STREAM_HEARTBEAT = config("NOTIFICATION_STREAM_HEARTBEAT", default=15, cast=int)
+
+# Read notifications older than this are moved to the archive table by
+# `python manage.py archive_notifications` (run it daily from cron).
+NOTIFICATION_RETENTION_DAYS = config("NOTIFICATION_RETENTION_DAYS", default=90, cast=int)
+
+# Spreadsheet backend for the Google Sheets exports: "gspread" (default),
+# or the offline stand-ins "csv" (files in SHEET_CSV_DIR) and "memory".
+SHEET_BACKEND = config("SHEET_BACKEND", default="gspread")
+SHEET_CSV_DIR = config("SHEET_CSV_DIR", default=os.path.join(BASE_DIR, "sheets"))
@@ -0,0 +1,130 @@
+# tasks/analytics.py
+from django.db.models import Avg, Count, ExpressionWrapper, F, FloatField, Q
+from django.utils import timezone
+from courses.models import Batch
+from .models import Task, TaskSubmission, WeeklyRollup
+
+
+TaskAssignment = Task.assigned_to.through
+
+
+def _batch_task_filter(batch, prefix=''):
+    """The batch's own tasks plus course-wide tasks of its course"""
+    return (
+        Q(**{f'{prefix}batch_id': batch.id}) |
+        Q(**{f'{prefix}task_type': 'course', f'{prefix}course_id': batch.course_id})
+    )
+
+
+def refresh_weekly_rollups(batch, weeks=None):
+    """
+    Recompute the rollup rows of a batch (only `weeks` when given) with three
+    grouped queries, then upsert them. Recomputing instead of patching keeps
+    the rows exact whatever path changed the underlying data.
+    """
+    student_ids = batch.students.values('id')
+
+    assigned = TaskAssignment.objects.filter(
+        _batch_task_filter(batch, prefix='task__'),
+        user_id__in=student_ids
+    )
+    submissions = TaskSubmission.objects.filter(
+        _batch_task_filter(batch, prefix='task__'),
+        student_id__in=student_ids
+    )
+    if weeks is not None:
+        assigned = assigned.filter(task__week_number__in=weeks)
+        submissions = submissions.filter(task__week_number__in=weeks)
+
+    rows = {}
+
+    def row(week):
+        return rows.setdefault(week, {'assigned': 0, 'submitted': 0, 'graded': 0, 'mean_percentage': None})
+
+    for item in assigned.order_by().values('task__week_number').annotate(total=Count('id')):
+        row(item['task__week_number'])['assigned'] = item['total']
+
+    percentage = ExpressionWrapper(F('marks_obtained') / F('task__max_marks') * 100.0, output_field=FloatField())
+    graded = Q(marks_obtained__isnull=False, task__max_marks__gt=0)
+    for item in submissions.order_by().values('task__week_number').annotate(
+        submitted=Count('id'),
+        graded=Count('id', filter=Q(marks_obtained__isnull=False)),
+        mean_percentage=Avg(percentage, filter=graded),
+    ):
+        week = row(item['task__week_number'])
+        week['submitted'] = item['submitted']
+        week['graded'] = item['graded']
+        week['mean_percentage'] = round(item['mean_percentage'], 2) if item['mean_percentage'] is not None else None
+
+    stale = WeeklyRollup.objects.filter(batch=batch).exclude(week_number__in=list(rows))
+    if weeks is not None:
+        stale = stale.filter(week_number__in=weeks)
+    stale.delete()
+
+    existing = {
+        rollup.week_number: rollup
+        for rollup in WeeklyRollup.objects.filter(batch=batch, week_number__in=list(rows))
+    }
+    to_create = []
+    to_update = []
+    now = timezone.now()
+    for week, values in rows.items():
+        rollup = existing.get(week)
+        if rollup is None:
+            to_create.append(WeeklyRollup(batch=batch, week_number=week, **values))
+            continue
+        if any(getattr(rollup, field) != value for field, value in values.items()):
+            for field, value in values.items():
+                setattr(rollup, field, value)
+            # bulk_update does not apply auto_now
+            rollup.updated_at = now
+            to_update.append(rollup)
+
+    if to_create:
+        WeeklyRollup.objects.bulk_create(to_create, ignore_conflicts=True)
+    if to_update:
+        WeeklyRollup.objects.bulk_update(
+            to_update,
+            ['assigned', 'submitted', 'graded', 'mean_percentage', 'updated_at']
+        )
+
+
+def batches_for_tasks(tasks):
+    """Batches whose rollups include any of these tasks (Task objects or value dicts)"""
+    batch_ids = set()
+    course_ids = set()
+    for task in tasks:
+        get = task.get if isinstance(task, dict) else lambda field: getattr(task, field)
+        if get('batch_id'):
+            batch_ids.add(get('batch_id'))
+        if get('task_type') == 'course':
+            course_ids.add(get('course_id'))
+    return Batch.objects.filter(Q(id__in=batch_ids) | Q(course_id__in=course_ids))
+
+
+def refresh_rollups_for_tasks(task_ids, weeks=None):
+    """Explicit refresh for bulk paths that bypass signals (bulk_create, update)"""
+    tasks = Task.objects.filter(id__in=task_ids).values('batch_id', 'course_id', 'task_type')
+    for batch in batches_for_tasks(tasks):
+        refresh_weekly_rollups(batch, weeks=weeks)
+
+
+def refresh_rollups_for_submission(task, student_id):
+    """Refresh the week of `task` in the batches where this student's submission counts"""
+    if task.batch_id:
+        batches = Batch.objects.filter(id=task.batch_id)
+    elif task.task_type == 'course':
+        batches = Batch.objects.filter(course_id=task.course_id, students=student_id)
+    else:
+        return
+    for batch in batches:
+        refresh_weekly_rollups(batch, weeks=[task.week_number])
+
+
+def get_weekly_rollups(batch):
+    """Rollup rows of a batch, built on first use"""
+    rollups = list(WeeklyRollup.objects.filter(batch=batch).order_by('week_number'))
+    if not rollups:
+        refresh_weekly_rollups(batch)
+        rollups = list(WeeklyRollup.objects.filter(batch=batch).order_by('week_number'))
+    return rollups
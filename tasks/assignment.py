@@ -0,0 +1,75 @@
+from django.db.models import Q
+from authentication.models import User
+from student_management.cache import bump_scopes
+from .models import Task
+from .analytics import refresh_rollups_for_tasks
+
+
+TaskAssignment = Task.assigned_to.through
+
+
+def assign_tasks_to_students(task_ids, student_ids):
+    """
+    Assign every task to every student.
+    Works out the missing (task, student) pairs with set arithmetic and writes
+    them with a single bulk insert on the through table.
+    Returns the number of new assignments.
+    """
+    task_ids = set(task_ids)
+    student_ids = set(student_ids)
+    if not task_ids or not student_ids:
+        return 0
+
+    existing = set(
+        TaskAssignment.objects.filter(
+            task_id__in=task_ids,
+            user_id__in=student_ids
+        ).values_list('task_id', 'user_id')
+    )
+    missing = {
+        (task_id, student_id)
+        for task_id in task_ids
+        for student_id in student_ids
+    } - existing
+
+    if missing:
+        TaskAssignment.objects.bulk_create(
+            [TaskAssignment(task_id=task_id, user_id=student_id) for task_id, student_id in missing],
+            ignore_conflicts=True,
+            batch_size=1000
+        )
+        # bulk_create skips m2m_changed, so invalidate cached task lists and
+        # refresh the weekly rollups here
+        bump_scopes('tasks')
+        refresh_rollups_for_tasks(task_ids)
+    return len(missing)
+
+
+def batch_task_ids(batches):
+    """Ids of batch-specific tasks of the batches plus course-wide tasks of their courses"""
+    batches = list(batches)
+    return set(
+        Task.objects.filter(
+            Q(batch__in=batches) |
+            Q(task_type='course', course_id__in={batch.course_id for batch in batches})
+        ).values_list('id', flat=True)
+    )
+
+
+def assign_batch_tasks(batches, student_ids):
+    """
+    Give approved students every existing task of the batches they were added to.
+    Returns (task_count, student_count, new_assignments).
+    """
+    student_ids = set(
+        User.objects.filter(
+            id__in=student_ids,
+            role='student',
+            is_approved=True
+        ).values_list('id', flat=True)
+    )
+    if not student_ids:
+        return 0, 0, 0
+
+    task_ids = batch_task_ids(batches)
+    return len(task_ids), len(student_ids), assign_tasks_to_students(task_ids, student_ids)
@@ -0,0 +1,145 @@
+# tasks/grade_stats.py
+from django.db import transaction
+from django.db.models import Case, CharField, Count, ExpressionWrapper, F, FloatField, Sum, Value, When
+from django.db.models.lookups import GreaterThanOrEqual
+from .models import TaskSubmission, GradeStats
+
+
+# (label, minimum percentage), checked top down
+GRADE_BANDS = [
+    ('A (90-100%)', 90),
+    ('B (80-89%)', 80),
+    ('C (70-79%)', 70),
+    ('D (60-69%)', 60),
+    ('F (Below 60%)', 0),
+]
+
+
+def grade_band(marks_obtained, max_marks):
+    percentage = (marks_obtained / max_marks * 100) if max_marks else 0
+    for label, minimum in GRADE_BANDS:
+        if percentage >= minimum:
+            return label
+    return GRADE_BANDS[-1][0]
+
+
+def empty_histogram():
+    return {label: 0 for label, _ in GRADE_BANDS}
+
+
+def _add(stats, course_id, marks_obtained, max_marks, sign=1):
+    """Add (sign=1) or remove (sign=-1) one graded submission from the totals"""
+    stats.graded_count += sign
+    stats.marks_obtained += sign * marks_obtained
+    stats.max_marks += sign * max_marks
+
+    course = stats.courses.setdefault(str(course_id), {'tasks_graded': 0, 'marks_obtained': 0, 'max_marks': 0})
+    course['tasks_graded'] += sign
+    course['marks_obtained'] += sign * marks_obtained
+    course['max_marks'] += sign * max_marks
+    if course['tasks_graded'] <= 0:
+        del stats.courses[str(course_id)]
+
+    band = grade_band(marks_obtained, max_marks)
+    stats.histogram[band] = stats.histogram.get(band, 0) + sign
+
+
+def band_case():
+    """SQL Case/When giving the GRADE_BANDS label of a submission's percentage"""
+    percentage = ExpressionWrapper(
+        F('marks_obtained') / F('task__max_marks') * 100.0,
+        output_field=FloatField()
+    )
+    return Case(
+        When(task__max_marks__lte=0, then=Value(GRADE_BANDS[-1][0])),
+        *[
+            When(GreaterThanOrEqual(percentage, minimum), then=Value(label))
+            for label, minimum in GRADE_BANDS[:-1]
+        ],
+        default=Value(GRADE_BANDS[-1][0]),
+        output_field=CharField()
+    )
+
+
+def rebuild_grade_stats(student):
+    """
+    Recompute a student's GradeStats from their graded submissions.
+    Banding and per-course totals are grouped in the database, so this is two
+    queries however many submissions the student has.
+    """
+    graded = TaskSubmission.objects.filter(
+        student=student,
+        marks_obtained__isnull=False
+    ).order_by()
+
+    courses = {}
+    graded_count = 0
+    marks_obtained = 0.0
+    max_marks = 0
+    for row in graded.values('task__course_id').annotate(
+        tasks_graded=Count('id'),
+        obtained=Sum('marks_obtained'),
+        maximum=Sum('task__max_marks'),
+    ):
+        courses[str(row['task__course_id'])] = {
+            'tasks_graded': row['tasks_graded'],
+            'marks_obtained': row['obtained'],
+            'max_marks': row['maximum'],
+        }
+        graded_count += row['tasks_graded']
+        marks_obtained += row['obtained']
+        max_marks += row['maximum']
+
+    histogram = empty_histogram()
+    for row in graded.annotate(band=band_case()).values('band').annotate(count=Count('id')):
+        histogram[row['band']] = row['count']
+
+    stats, _ = GradeStats.objects.update_or_create(
+        student=student,
+        defaults={
+            'graded_count': graded_count,
+            'marks_obtained': marks_obtained,
+            'max_marks': max_marks,
+            'courses': courses,
+            'histogram': histogram,
+        }
+    )
+    return stats
+
+
+def get_grade_stats(student):
+    """Stored GradeStats for a student, built on first use"""
+    try:
+        return GradeStats.objects.get(student=student)
+    except GradeStats.DoesNotExist:
+        return rebuild_grade_stats(student)
+
+
+def apply_grade(submission, previous_marks):
+    """
+    Fold a grade change into the student's stats.
+    `previous_marks` is the submission's marks before this save (None if it
+    was ungraded). Students without stats yet are skipped, their first read
+    rebuilds everything anyway.
+    """
+    if previous_marks == submission.marks_obtained:
+        return
+
+    with transaction.atomic():
+        try:
+            stats = GradeStats.objects.select_for_update().get(student_id=submission.student_id)
+        except GradeStats.DoesNotExist:
+            return
+
+        course_id = submission.task.course_id
+        max_marks = submission.task.max_marks
+        if previous_marks is not None:
+            _add(stats, course_id, previous_marks, max_marks, sign=-1)
+        if submission.marks_obtained is not None:
+            _add(stats, course_id, submission.marks_obtained, max_marks)
+        stats.save()
+
+
+def invalidate_grade_stats(student_ids):
+    """Drop stats that can no longer be patched (they are rebuilt on next read)"""
+    GradeStats.objects.filter(student_id__in=student_ids).delete()
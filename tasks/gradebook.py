@@ -0,0 +1,196 @@
+# tasks/gradebook.py
+from itertools import groupby
+from django.db.models import Count, Q
+from .models import Task, TaskSubmission
+
+
+TaskAssignment = Task.assigned_to.through
+
+
+def batch_roster_stats(batch, student_ids=None):
+    """
+    Per-student task counts for a batch, keyed by student id.
+    Two grouped queries regardless of batch size: one over the assignment
+    through table and one over submissions.
+    """
+    assigned = TaskAssignment.objects.filter(task__batch=batch)
+    submitted = TaskSubmission.objects.filter(task__batch=batch)
+    if student_ids is not None:
+        assigned = assigned.filter(user_id__in=student_ids)
+        submitted = submitted.filter(student_id__in=student_ids)
+
+    stats = {}
+    for row in assigned.order_by().values('user_id').annotate(total=Count('task_id', distinct=True)):
+        stats.setdefault(row['user_id'], {'total_assigned_tasks': 0, 'submitted_tasks': 0})
+        stats[row['user_id']]['total_assigned_tasks'] = row['total']
+
+    for row in submitted.order_by().values('student_id').annotate(total=Count('id')):
+        stats.setdefault(row['student_id'], {'total_assigned_tasks': 0, 'submitted_tasks': 0})
+        stats[row['student_id']]['submitted_tasks'] = row['total']
+
+    return stats
+
+
+class SubmissionMatrix:
+    """
+    Batch x task submission matrix.
+    Built from four queries (students, tasks, submissions, assignment pairs)
+    no matter how many students or tasks the batch has.
+    """
+
+    def __init__(self, batch):
+        self.batch = batch
+        batch_student_ids = batch.students.values('id')
+
+        self.students = list(
+            batch.students.order_by('id').values('id', 'first_name', 'last_name', 'email')
+        )
+        self.students_by_id = {s['id']: s for s in self.students}
+
+        # Both batch-specific and course-wide tasks
+        self.tasks = list(
+            Task.objects.filter(
+                Q(batch=batch) |
+                Q(task_type='course', course=batch.course)
+            ).distinct().order_by('week_number', 'task_order', 'created_at')
+        )
+        task_ids = [task.id for task in self.tasks]
+
+        # (task_id, student_id) -> submission row
+        self.submissions = {
+            (row['task_id'], row['student_id']): row
+            for row in TaskSubmission.objects.filter(
+                task_id__in=task_ids,
+                student_id__in=batch_student_ids
+            ).values('id', 'task_id', 'student_id', 'submitted_at', 'marks_obtained')
+        }
+
+        self.assigned = set(
+            TaskAssignment.objects.filter(
+                task_id__in=task_ids,
+                user_id__in=batch_student_ids
+            ).values_list('task_id', 'user_id')
+        )
+
+    def task_rows(self):
+        """Per-task view used by BatchTaskSubmissionsView"""
+        rows = []
+        for task in self.tasks:
+            submissions = [
+                self.submissions[(task.id, student['id'])]
+                for student in self.students
+                if (task.id, student['id']) in self.submissions
+            ]
+            # Newest first, as TaskSubmission.Meta.ordering lists them
+            submissions.sort(key=lambda sub: (sub['submitted_at'], sub['id']), reverse=True)
+            rows.append({
+                'task_id': task.id,
+                'task_title': task.title,
+                'task_type': task.task_type,
+                'due_date': task.due_date,
+                'max_marks': task.max_marks,
+                'total_assigned': sum(1 for student in self.students if (task.id, student['id']) in self.assigned),
+                'total_submitted': len(submissions),
+                'submissions': [
+                    {
+                        'submission_id': sub['id'],
+                        'student_name': f"{self.students_by_id[sub['student_id']]['first_name']} {self.students_by_id[sub['student_id']]['last_name']}",
+                        'student_email': self.students_by_id[sub['student_id']]['email'],
+                        'submitted_at': sub['submitted_at'],
+                        'marks_obtained': sub['marks_obtained'],
+                        'is_graded': sub['marks_obtained'] is not None,
+                    }
+                    for sub in submissions
+                ]
+            })
+        return rows
+
+    def columnar(self):
+        """
+        Compact layout for large gradebooks: marks[i][j] is the mark of
+        student_ids[i] on task_ids[j]. A cell is None when the task is not
+        assigned, 'unsubmitted', 'submitted' (ungraded) or the marks.
+        """
+        marks = []
+        for student in self.students:
+            row = []
+            for task in self.tasks:
+                key = (task.id, student['id'])
+                sub = self.submissions.get(key)
+                if sub is not None:
+                    row.append(sub['marks_obtained'] if sub['marks_obtained'] is not None else 'submitted')
+                elif key in self.assigned:
+                    row.append('unsubmitted')
+                else:
+                    row.append(None)
+            marks.append(row)
+
+        return {
+            'student_ids': [student['id'] for student in self.students],
+            'student_names': [f"{student['first_name']} {student['last_name']}" for student in self.students],
+            'task_ids': [task.id for task in self.tasks],
+            'task_titles': [task.title for task in self.tasks],
+            'max_marks': [task.max_marks for task in self.tasks],
+            'marks': marks,
+        }
+
+
+def gradebook_rows(batch, chunk_size=500):
+    """
+    Yield the batch gradebook (students x tasks marks) row by row for export.
+    Students and submissions are both read with server-side cursors ordered
+    by student id and merged, so only one student's marks are held at a time.
+    """
+    tasks = list(
+        Task.objects.filter(
+            Q(batch=batch) |
+            Q(task_type='course', course=batch.course)
+        ).distinct().order_by('week_number', 'task_order', 'created_at').values('id', 'title', 'max_marks')
+    )
+    task_ids = [task['id'] for task in tasks]
+    batch_student_ids = batch.students.values('id')
+
+    yield (
+        ['Student ID', 'Name', 'Email', 'Enrollment Number']
+        + [f"{task['title']} ({task['max_marks']})" for task in tasks]
+        + ['Total Obtained', 'Total Max', 'Percentage']
+    )
+
+    students = batch.students.order_by('id').values_list(
+        'id', 'first_name', 'last_name', 'email', 'student_profile__enrollment_number'
+    ).iterator(chunk_size=chunk_size)
+
+    submissions = TaskSubmission.objects.filter(
+        task_id__in=task_ids,
+        student_id__in=batch_student_ids
+    ).order_by('student_id').values_list('student_id', 'task_id', 'marks_obtained').iterator(chunk_size=chunk_size)
+    grouped = groupby(submissions, key=lambda row: row[0])
+    pending_group = next(grouped, None)
+
+    for student_id, first_name, last_name, email, enrollment_number in students:
+        marks = {}
+        # Both cursors are ordered by student id, advance submissions up to this student
+        while pending_group is not None and pending_group[0] <= student_id:
+            if pending_group[0] == student_id:
+                marks = {task_id: mark for _, task_id, mark in pending_group[1]}
+            pending_group = next(grouped, None)
+
+        obtained = 0
+        max_total = 0
+        cells = []
+        for task in tasks:
+            if task['id'] not in marks:
+                cells.append('')
+            elif marks[task['id']] is None:
+                cells.append('Pending')
+            else:
+                cells.append(marks[task['id']])
+                obtained += marks[task['id']]
+                max_total += task['max_marks']
+
+        percentage = round(obtained / max_total * 100, 2) if max_total else ''
+        yield (
+            [student_id, f"{first_name} {last_name}".strip(), email, enrollment_number or '']
+            + cells
+            + [obtained, max_total, percentage]
+        )
@@ -0,0 +1,103 @@
+# tasks/grading.py
+import math
+from django.db import transaction
+from django.utils import timezone
+from .models import TaskSubmission
+from .progression import refresh_task_progress
+from .grade_stats import apply_grade
+from .analytics import refresh_rollups_for_tasks
+
+
+def validate_bulk_grades(grader, entries):
+    """
+    Check a list of {submission_id, marks_obtained, feedback} against the
+    submissions and their tasks' max_marks, loaded with one query.
+    Returns (submissions with the new values set, errors). Nothing is saved.
+    """
+    if not isinstance(entries, list) or not entries:
+        return [], [{'error': 'grades must be a non-empty list'}]
+
+    errors = []
+    parsed = {}
+    for index, entry in enumerate(entries):
+        if not isinstance(entry, dict):
+            errors.append({'index': index, 'error': 'Each grade must be an object'})
+            continue
+        submission_id = entry.get('submission_id')
+        try:
+            submission_id = int(submission_id)
+            marks_obtained = float(entry.get('marks_obtained'))
+        except (TypeError, ValueError):
+            errors.append({'index': index, 'submission_id': submission_id,
+                           'error': 'submission_id and marks_obtained must be numbers'})
+            continue
+        if not math.isfinite(marks_obtained):
+            errors.append({'index': index, 'submission_id': submission_id,
+                           'error': 'marks_obtained must be a finite number'})
+            continue
+        if submission_id in parsed:
+            errors.append({'index': index, 'submission_id': submission_id, 'error': 'Submission listed twice'})
+            continue
+        parsed[submission_id] = (index, marks_obtained, entry.get('feedback', ''))
+
+    submissions = TaskSubmission.objects.select_related(
+        'task', 'task__batch', 'student'
+    ).in_bulk(list(parsed))
+
+    graded = []
+    for submission_id, (index, marks_obtained, feedback) in parsed.items():
+        submission = submissions.get(submission_id)
+        if submission is None:
+            errors.append({'index': index, 'submission_id': submission_id, 'error': 'Submission not found'})
+            continue
+        if grader.role != 'admin' and submission.task.batch and submission.task.batch.mentor_id != grader.id:
+            errors.append({'index': index, 'submission_id': submission_id,
+                           'error': 'You do not have access to this submission'})
+            continue
+        if marks_obtained < 0 or marks_obtained > submission.task.max_marks:
+            errors.append({'index': index, 'submission_id': submission_id,
+                           'error': f'Marks must be between 0 and {submission.task.max_marks}'})
+            continue
+
+        submission.previous_marks = submission.marks_obtained
+        submission.marks_obtained = marks_obtained
+        submission.feedback = feedback
+        graded.append(submission)
+
+    errors.sort(key=lambda error: error.get('index', 0))
+    return graded, errors
+
+
+def apply_bulk_grades(grader, submissions):
+    """
+    Save validated grades with one bulk_update and refresh everything derived
+    from them, in a single transaction. bulk_update skips save() and signals,
+    so status, graded_at and the derived tables are handled here.
+    """
+    from notifications.utils import notify_on_tasks_graded
+
+    now = timezone.now()
+    with transaction.atomic():
+        for submission in submissions:
+            submission.graded_by = grader
+            submission.graded_at = now
+            submission.status = 'graded'
+        TaskSubmission.objects.bulk_update(
+            submissions,
+            ['marks_obtained', 'feedback', 'graded_by', 'graded_at', 'status'],
+            batch_size=500
+        )
+
+        # Grades may unlock (or re-lock) each student's next task
+        for student, course_id in {(sub.student, sub.task.course_id) for sub in submissions}:
+            refresh_task_progress(student, course_id=course_id)
+
+        for submission in submissions:
+            apply_grade(submission, submission.previous_marks)
+
+        refresh_rollups_for_tasks(
+            {sub.task_id for sub in submissions},
+            weeks={sub.task.week_number for sub in submissions}
+        )
+
+        notify_on_tasks_graded(submissions, grader)
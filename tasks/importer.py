@@ -0,0 +1,69 @@
+# tasks/importer.py
+import tablib
+from django.db import transaction
+from rest_framework import serializers
+from authentication.models import User
+from student_management.cache import bump_scopes
+from .models import Task
+from .assignment import assign_tasks_to_students
+
+
+class TaskImportRowSerializer(serializers.Serializer):
+    """One row of a weekly syllabus template"""
+    title = serializers.CharField(max_length=200)
+    description = serializers.CharField()
+    week_number = serializers.IntegerField(min_value=1, default=1)
+    task_order = serializers.IntegerField(min_value=0, default=0)
+    due_date = serializers.DateTimeField()
+    max_marks = serializers.IntegerField(min_value=1, default=100)
+    release_date = serializers.DateTimeField(required=False, allow_null=True)
+
+
+def rows_from_csv(upload):
+    """Read an uploaded CSV (header row with the serializer's field names) into dicts"""
+    dataset = tablib.Dataset().load(upload.read().decode('utf-8-sig'), format='csv')
+    return [
+        # Empty cells fall back to the serializer defaults
+        {key: value for key, value in row.items() if value not in (None, '')}
+        for row in dataset.dict
+    ]
+
+
+def import_tasks(rows, course, batch, creator):
+    """
+    Create a syllabus worth of tasks in one transaction: one bulk insert for
+    the tasks, one for the assignments and a single queued notification job.
+    `batch` None makes them course-wide tasks. Returns (tasks, assigned).
+    """
+    from notifications.utils import notify_on_tasks_imported
+
+    with transaction.atomic():
+        tasks = Task.objects.bulk_create([
+            Task(
+                course=course,
+                batch=batch,
+                task_type='batch' if batch else 'course',
+                created_by=creator,
+                is_scheduled=row.get('release_date') is not None,
+                **row
+            )
+            for row in rows
+        ])
+
+        if batch:
+            student_ids = batch.students.filter(is_approved=True).values_list('id', flat=True)
+        else:
+            student_ids = User.objects.filter(
+                role='student',
+                is_approved=True,
+                enrolled_batches__course=course
+            ).values_list('id', flat=True).distinct()
+        assigned = assign_tasks_to_students([task.id for task in tasks], student_ids)
+
+        # bulk_create sends no post_save, invalidate cached task lists here
+        bump_scopes('tasks')
+
+        notify_on_tasks_imported(tasks, creator)
+
+    print(f" Imported {len(tasks)} task(s) for '{course.name}' ({assigned} assignments)")
+    return tasks, assigned
@@ -0,0 +1,71 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from authentication.models import User
+from notifications.models import Notification
+from tasks.models import Task, TaskSubmission, StudentProgressReview
+
+
+def _first_id(queryset):
+    return queryset.order_by().values_list('id', flat=True).first() or 0
+
+
+class Command(BaseCommand):
+    help = (
+        "Run EXPLAIN on the hot view querysets. On PostgreSQL, fails when any of "
+        "them plans a sequential scan of the table it filters."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--allow-seqscan', action='store_true',
+            help="Keep the planner free to pick sequential scans (small tables usually get them)"
+        )
+
+    def get_querysets(self):
+        student_id = _first_id(User.objects.filter(role='student'))
+        mentor_id = _first_id(User.objects.filter(role='mentor'))
+        task = Task.objects.order_by().values('id', 'course_id', 'batch_id').first() or {}
+
+        return [
+            ('unread notification count', 'notifications_notification',
+             Notification.objects.filter(recipient_id=student_id, is_read=False)),
+            ('notification page', 'notifications_notification',
+             Notification.objects.filter(recipient_id=student_id).order_by('-created_at', '-id')[:51]),
+            ('graded submissions of a student', 'tasks_tasksubmission',
+             TaskSubmission.objects.filter(student_id=student_id, marks_obtained__isnull=False)),
+            ('pending submissions of a task', 'tasks_tasksubmission',
+             TaskSubmission.objects.filter(task_id=task.get('id', 0), marks_obtained__isnull=True)),
+            ('course-wide tasks of a course', 'tasks_task',
+             Task.objects.filter(course_id=task.get('course_id', 0), task_type='course')),
+            ('weekly task sequence of a batch', 'tasks_task',
+             Task.objects.filter(batch_id=task.get('batch_id') or 0).order_by('week_number', 'task_order')),
+            ('progress reviews by a mentor', 'tasks_studentprogressreview',
+             StudentProgressReview.objects.filter(reviewed_by_id=mentor_id).order_by('-reviewed_at')),
+        ]
+
+    def handle(self, *args, **options):
+        is_postgres = connection.vendor == 'postgresql'
+        failures = []
+
+        with transaction.atomic():
+            if is_postgres and not options['allow_seqscan']:
+                # Only checks that an index can serve each query, whatever the table size
+                with connection.cursor() as cursor:
+                    cursor.execute('SET LOCAL enable_seqscan = off')
+
+            for label, table, queryset in self.get_querysets():
+                plan = queryset.explain()
+                self.stdout.write(self.style.MIGRATE_HEADING(label))
+                self.stdout.write(plan)
+
+                if is_postgres and f'Seq Scan on {table}' in plan:
+                    failures.append(label)
+
+        if not is_postgres:
+            self.stdout.write(self.style.WARNING(
+                f"Index usage is only asserted on PostgreSQL (database is {connection.vendor})"
+            ))
+        elif failures:
+            raise CommandError(f"Sequential scan in: {', '.join(failures)}")
+        else:
+            self.stdout.write(self.style.SUCCESS("All queries use index scans"))
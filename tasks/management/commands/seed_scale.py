@@ -0,0 +1,388 @@
+import random
+import time
+from contextlib import contextmanager
+from datetime import datetime, time as dt_time, timedelta
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+from authentication.models import User, StudentProfile, MentorProfile
+from courses.models import Course, Batch
+from notifications.counters import invalidate_unread_counts
+from notifications.models import Notification
+from tasks.models import Task, TaskSubmission, TaskProgress, StudentProgressReview
+from tasks.analytics import refresh_weekly_rollups
+from student_management.cache import bump_scopes
+
+
+BULK_BATCH_SIZE = 5000
+
+NOTIFICATION_TYPES = [choice for choice, _ in Notification.NOTIFICATION_TYPES]
+
+
+@contextmanager
+def explicit_timestamps(*models):
+    """
+    Let bulk_create keep the timestamps we generate instead of stamping
+    every row with now(), so the data spreads over the course weeks.
+    This switches off auto_now/auto_now_add on the model fields themselves,
+    i.e. for every save in the process, so it is only meant for this command.
+    The flags are restored on exit, also when the seeding fails.
+    """
+    fields = [
+        field for model in models for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False)
+    ]
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate a large synthetic dataset (courses, batches, mentors, students, weekly tasks, "
+        "assignments, submissions, grades, reviews, notifications) with bulk inserts. "
+        "The same --seed always produces the same data."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--prefix', default='seed', help="Prefix of generated usernames, course codes and batch names")
+        parser.add_argument('--courses', type=int, default=5)
+        parser.add_argument('--batches-per-course', type=int, default=4)
+        parser.add_argument('--mentors', type=int, default=20)
+        parser.add_argument('--students', type=int, default=2000)
+        parser.add_argument('--weeks', type=int, default=8, help="Weeks of tasks per batch")
+        parser.add_argument('--tasks-per-week', type=int, default=3, help="Batch-specific tasks per week")
+        parser.add_argument('--course-tasks', type=int, default=2, help="Course-wide tasks per course")
+        parser.add_argument('--submission-rate', type=float, default=0.8, help="Share of assignments submitted")
+        parser.add_argument('--graded-rate', type=float, default=0.7, help="Share of submissions graded")
+        parser.add_argument('--review-rate', type=float, default=0.5, help="Share of student-weeks reviewed")
+        parser.add_argument('--notifications', type=int, default=20, help="Notifications per student")
+        parser.add_argument('--start-date', default=None,
+                            help="First day of the batches, YYYY-MM-DD (default: so the last week ends today)")
+        parser.add_argument('--clear', action='store_true', help="Delete data from a previous run with this prefix first")
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        self.prefix = options['prefix']
+        self.options = options
+        # Rows inserted per table; everything else goes in self.details
+        self.counts = {}
+        self.details = {}
+
+        if options['start_date']:
+            start = datetime.strptime(options['start_date'], '%Y-%m-%d').date()
+        else:
+            start = timezone.localdate() - timedelta(weeks=options['weeks'])
+        self.start = timezone.make_aware(datetime.combine(start, dt_time(9, 0)))
+
+        existing = User.objects.filter(username__startswith=f"{self.prefix}_")
+        if existing.exists():
+            if not options['clear']:
+                raise CommandError(f"Users prefixed '{self.prefix}_' already exist, pass --clear or another --prefix")
+            self.clear()
+
+        began = time.perf_counter()
+        with transaction.atomic(), explicit_timestamps(
+            User, Course, Batch, Task, TaskSubmission, StudentProgressReview, Notification
+        ):
+            mentors, students = self.create_users()
+            batches = self.create_courses(mentors, students)
+            tasks = self.create_tasks(batches)
+            assignments = self.create_assignments(tasks, batches)
+            self.create_submissions(assignments, batches)
+            self.create_reviews(batches)
+            self.create_notifications(students, mentors)
+
+        # Bulk inserts bypass the signals that keep these up to date;
+        # GradeStats and TaskProgress rebuild lazily on first read
+        for batch in batches:
+            refresh_weekly_rollups(batch)
+        bump_scopes('courses', 'batches', 'tasks')
+
+        elapsed = time.perf_counter() - began
+        total = sum(self.counts.values())
+        for label, count in self.counts.items():
+            self.stdout.write(f"  {label}: {count}")
+        for label, count in self.details.items():
+            self.stdout.write(f"  ({label}: {count})")
+        self.stdout.write(self.style.SUCCESS(
+            f"Seeded {total} rows in {elapsed:.1f}s ({total / elapsed:.0f} rows/s)"
+        ))
+
+    @transaction.atomic
+    def clear(self):
+        users = User.objects.filter(username__startswith=f"{self.prefix}_")
+        # Stored progress points at the submissions deleted below
+        TaskProgress.objects.filter(student__in=users).delete()
+        # Submissions have post_delete receivers, which would make the cascade
+        # delete them one row at a time; remove them with a single DELETE first
+        user_ids, params = users.values('id').query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {connection.ops.quote_name(TaskSubmission._meta.db_table)} "
+                f"WHERE student_id IN ({user_ids})",
+                params
+            )
+        # Courses cascade to batches, tasks and reviews
+        Course.objects.filter(code__startswith=f"{self.prefix.upper()}-").delete()
+        users.delete()
+        self.stdout.write(f"Cleared previous '{self.prefix}' data")
+
+    def bulk(self, label, model, objs):
+        model.objects.bulk_create(objs, batch_size=BULK_BATCH_SIZE)
+        self.counts[label] = self.counts.get(label, 0) + len(objs)
+
+    def at(self, week, day=0, hours=0):
+        """Timestamp `day` days and `hours` hours into week `week` (1-based)"""
+        return self.start + timedelta(weeks=week - 1, days=day, hours=hours)
+
+    # ===== Users =====
+
+    def create_users(self):
+        opts = self.options
+        # Hashing is deliberately slow, every generated user shares one hash
+        password = make_password('password123')
+        joined = self.start - timedelta(days=14)
+
+        users = []
+        for i in range(opts['mentors']):
+            users.append(User(
+                username=f"{self.prefix}_mentor_{i}",
+                email=f"{self.prefix}_mentor_{i}@example.com",
+                first_name=f"Mentor{i}", last_name=self.prefix.title(),
+                role='mentor', is_approved=True, password=password,
+                created_at=joined, updated_at=joined, date_joined=joined,
+            ))
+        for i in range(opts['students']):
+            created = joined + timedelta(minutes=self.rng.randrange(14 * 24 * 60))
+            users.append(User(
+                username=f"{self.prefix}_student_{i}",
+                email=f"{self.prefix}_student_{i}@example.com",
+                first_name=f"Student{i}", last_name=self.prefix.title(),
+                phone=f"9{self.rng.randrange(10 ** 9):09d}",
+                role='student', is_approved=True, password=password,
+                created_at=created, updated_at=created, date_joined=created,
+            ))
+        self.bulk('users', User, users)
+
+        generated = User.objects.filter(username__startswith=f"{self.prefix}_").order_by('id')
+        mentors = list(generated.filter(role='mentor'))
+        students = list(generated.filter(role='student'))
+
+        self.bulk('mentor profiles', MentorProfile, [
+            MentorProfile(
+                user=mentor,
+                specialization=self.rng.choice(['Python', 'Django', 'React', 'Data Science', 'DevOps']),
+                experience_years=self.rng.randint(1, 15),
+            )
+            for mentor in mentors
+        ])
+        self.bulk('student profiles', StudentProfile, [
+            StudentProfile(
+                user=student,
+                enrollment_number=f"{self.prefix.upper()}{student.id:07d}",
+                date_of_birth=(self.start - timedelta(days=self.rng.randint(18 * 365, 30 * 365))).date(),
+                gender=self.rng.choice(['male', 'female', 'other']),
+                blood_group=self.rng.choice([choice for choice, _ in StudentProfile.BLOOD_GROUP_CHOICES]),
+                guardian_name=f"Guardian{student.id}",
+                guardian_phone=f"8{self.rng.randrange(10 ** 9):09d}",
+            )
+            for student in students
+        ])
+        return mentors, students
+
+    # ===== Courses and batches =====
+
+    def create_courses(self, mentors, students):
+        opts = self.options
+        admin = User.objects.filter(role='admin').order_by('id').first()
+        code_prefix = f"{self.prefix.upper()}-"
+
+        self.bulk('courses', Course, [
+            Course(
+                name=f"{self.prefix.title()} Course {i}",
+                code=f"{code_prefix}{i:03d}",
+                description=f"Synthetic course {i}",
+                duration_weeks=opts['weeks'],
+                mentor=self.rng.choice(mentors) if mentors else None,
+                created_by=admin,
+                created_at=self.start - timedelta(days=30),
+                updated_at=self.start - timedelta(days=30),
+            )
+            for i in range(opts['courses'])
+        ])
+        courses = list(Course.objects.filter(code__startswith=code_prefix).order_by('id'))
+
+        batch_objs = []
+        for course in courses:
+            for j in range(opts['batches_per_course']):
+                batch_objs.append(Batch(
+                    name=f"{course.code} Batch {j}",
+                    course=course,
+                    start_date=self.start.date(),
+                    end_date=(self.start + timedelta(weeks=opts['weeks'])).date(),
+                    mentor=self.rng.choice(mentors) if mentors else None,
+                    max_students=0,
+                    created_at=self.start - timedelta(days=21),
+                ))
+        self.bulk('batches', Batch, batch_objs)
+        batches = list(Batch.objects.filter(course__in=courses).select_related('course').order_by('id'))
+
+        # Every student joins one batch, spread round-robin after a seeded shuffle
+        shuffled = list(students)
+        self.rng.shuffle(shuffled)
+        self.roster = {batch.id: [] for batch in batches}
+        for index, student in enumerate(shuffled):
+            if batches:
+                self.roster[batches[index % len(batches)].id].append(student.id)
+
+        Enrollment = Batch.students.through
+        self.bulk('batch enrollments', Enrollment, [
+            Enrollment(batch_id=batch_id, user_id=student_id)
+            for batch_id, student_ids in self.roster.items()
+            for student_id in student_ids
+        ])
+        Batch.objects.filter(id__in=self.roster).update(max_students=max(
+            [len(ids) for ids in self.roster.values()] + [30]
+        ))
+        return batches
+
+    # ===== Tasks =====
+
+    def create_tasks(self, batches):
+        opts = self.options
+        tasks = []
+        for batch in batches:
+            for week in range(1, opts['weeks'] + 1):
+                for order in range(1, opts['tasks_per_week'] + 1):
+                    release = self.at(week)
+                    tasks.append(Task(
+                        course=batch.course, batch=batch, task_type='batch',
+                        title=f"{batch.name} W{week} T{order}",
+                        description="Synthetic weekly task",
+                        due_date=release + timedelta(days=6),
+                        max_marks=self.rng.choice([10, 20, 50, 100]),
+                        created_by=batch.mentor,
+                        week_number=week, task_order=order,
+                        release_date=release, is_scheduled=True,
+                        created_at=release - timedelta(days=3),
+                        updated_at=release - timedelta(days=3),
+                    ))
+
+        courses = {batch.course_id: batch.course for batch in batches}
+        for course in courses.values():
+            for k in range(opts['course_tasks']):
+                week = self.rng.randint(1, max(opts['weeks'], 1))
+                release = self.at(week)
+                tasks.append(Task(
+                    course=course, batch=None, task_type='course',
+                    title=f"{course.code} Course task {k}",
+                    description="Synthetic course-wide task",
+                    due_date=release + timedelta(days=6),
+                    max_marks=100,
+                    created_by=course.mentor,
+                    week_number=week, task_order=opts['tasks_per_week'] + k + 1,
+                    release_date=release, is_scheduled=True,
+                    created_at=release - timedelta(days=3),
+                    updated_at=release - timedelta(days=3),
+                ))
+        self.bulk('tasks', Task, tasks)
+
+        return list(Task.objects.filter(course_id__in=courses).order_by('id'))
+
+    def create_assignments(self, tasks, batches):
+        """Batch tasks go to their batch, course-wide tasks to every batch of the course"""
+        course_batches = {}
+        for batch in batches:
+            course_batches.setdefault(batch.course_id, []).append(batch)
+
+        Assignment = Task.assigned_to.through
+        assignments = []
+        for task in tasks:
+            targets = [task.batch_id] if task.batch_id else [batch.id for batch in course_batches[task.course_id]]
+            for batch_id in targets:
+                for student_id in self.roster[batch_id]:
+                    assignments.append((task, batch_id, student_id))
+
+        self.bulk('task assignments', Assignment, [
+            Assignment(task_id=task.id, user_id=student_id) for task, _, student_id in assignments
+        ])
+        return assignments
+
+    # ===== Submissions, grades and reviews =====
+
+    def create_submissions(self, assignments, batches):
+        opts = self.options
+        mentors = {batch.id: batch.mentor_id for batch in batches}
+        submissions = []
+        for task, batch_id, student_id in assignments:
+            if self.rng.random() >= opts['submission_rate']:
+                continue
+            submitted = task.release_date + timedelta(hours=self.rng.randint(1, 7 * 24))
+            submission = TaskSubmission(
+                task_id=task.id, student_id=student_id,
+                submission_text="Synthetic submission",
+                submitted_at=submitted, status='submitted',
+            )
+            if self.rng.random() < opts['graded_rate']:
+                # Skewed towards good marks, like real cohorts
+                percentage = min(max(self.rng.gauss(72, 15), 0), 100)
+                submission.marks_obtained = round(task.max_marks * percentage / 100, 1)
+                submission.status = 'graded'
+                submission.feedback = "Synthetic feedback"
+                submission.graded_by_id = mentors[batch_id]
+                submission.graded_at = submitted + timedelta(hours=self.rng.randint(1, 72))
+            submissions.append(submission)
+
+        self.bulk('submissions', TaskSubmission, submissions)
+        # Grades are fields of the submission rows above, not rows of their own
+        self.details['graded submissions'] = sum(1 for submission in submissions if submission.marks_obtained is not None)
+
+    def create_reviews(self, batches):
+        opts = self.options
+        reviews = []
+        for batch in batches:
+            for week in range(1, opts['weeks'] + 1):
+                reviewed = self.at(week, day=6)
+                for student_id in self.roster[batch.id]:
+                    if self.rng.random() >= opts['review_rate']:
+                        continue
+                    reviews.append(StudentProgressReview(
+                        batch=batch, student_id=student_id, week_number=week,
+                        mentor_feedback="Synthetic internal note",
+                        student_feedback="Synthetic feedback",
+                        reviewed_by_id=batch.mentor_id,
+                        reviewed_at=reviewed, created_at=reviewed,
+                    ))
+        self.bulk('progress reviews', StudentProgressReview, reviews)
+
+    # ===== Notifications =====
+
+    def create_notifications(self, students, mentors):
+        opts = self.options
+        span = max(opts['weeks'], 1) * 7 * 24 * 60
+        notifications = []
+        for student in students:
+            for _ in range(opts['notifications']):
+                kind = self.rng.choice(NOTIFICATION_TYPES)
+                notifications.append(Notification(
+                    recipient_id=student.id,
+                    sender_id=self.rng.choice(mentors).id if mentors else None,
+                    notification_type=kind,
+                    title=kind.replace('_', ' ').title(),
+                    message="Synthetic notification",
+                    is_read=self.rng.random() < 0.6,
+                    created_at=self.start + timedelta(minutes=self.rng.randrange(span)),
+                ))
+        self.bulk('notifications', Notification, notifications)
+        # bulk_create skips the counter invalidation of create_notification()
+        invalidate_unread_counts({
+            notification.recipient_id for notification in notifications if not notification.is_read
+        })
@@ -0,0 +1,55 @@
+# Generated by Django 5.2.7 on 2026-10-16 23:37
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0002_course_syllabus_alter_course_created_by'),
+        ('tasks', '0004_alter_task_options_task_is_scheduled_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tasksubmission',
+            name='status',
+            field=models.CharField(choices=[('submitted', 'Submitted'), ('graded', 'Graded')], default='submitted', help_text='Current status of the submission', max_length=20),
+        ),
+        migrations.AlterField(
+            model_name='tasksubmission',
+            name='feedback',
+            field=models.TextField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='tasksubmission',
+            name='marks_obtained',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='tasksubmission',
+            name='submission_text',
+            field=models.TextField(blank=True, null=True),
+        ),
+        migrations.CreateModel(
+            name='StudentProgressReview',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('week_number', models.IntegerField(help_text='Week number (1, 2, 3, etc.)')),
+                ('mentor_feedback', models.TextField(blank=True, help_text='Only visible to mentor and admin', null=True)),
+                ('student_feedback', models.TextField(blank=True, help_text='Visible to student', null=True)),
+                ('reviewed_at', models.DateTimeField(auto_now=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('batch', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='progress_reviews', to='courses.batch')),
+                ('reviewed_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='given_progress_reviews', to=settings.AUTH_USER_MODEL)),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='progress_reviews', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-week_number', 'student__first_name'],
+                'unique_together': {('batch', 'student', 'week_number')},
+            },
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.7 on 2026-10-16 23:37
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0005_tasksubmission_status_alter_tasksubmission_feedback_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskProgress',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('state', models.CharField(choices=[('locked', 'Locked'), ('unlocked', 'Unlocked'), ('submitted', 'Submitted'), ('graded', 'Graded')], default='locked', max_length=20)),
+                ('lock_code', models.CharField(blank=True, max_length=30, null=True)),
+                ('previous_percentage', models.FloatField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('previous_task', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='tasks.task')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='task_progress', to=settings.AUTH_USER_MODEL)),
+                ('submission', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='tasks.tasksubmission')),
+                ('task', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='progress', to='tasks.task')),
+            ],
+            options={
+                'verbose_name_plural': 'Task progress',
+                'unique_together': {('student', 'task')},
+            },
+        ),
+    ]
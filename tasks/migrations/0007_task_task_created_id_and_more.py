@@ -0,0 +1,28 @@
+# Generated by Django 5.2.7 on 2026-10-16 23:38
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0002_course_syllabus_alter_course_created_by'),
+        ('tasks', '0006_taskprogress'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['-created_at', '-id'], name='task_created_id'),
+        ),
+        migrations.AddIndex(
+            model_name='tasksubmission',
+            index=models.Index(fields=['-submitted_at', '-id'], name='submission_submitted_id'),
+        ),
+        migrations.AddIndex(
+            model_name='tasksubmission',
+            index=models.Index(fields=['student', '-submitted_at', '-id'], name='submission_student_submitted'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.7 on 2026-10-16 23:38
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0002_course_syllabus_alter_course_created_by'),
+        ('tasks', '0007_task_task_created_id_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='studentprogressreview',
+            index=models.Index(fields=['reviewed_by', 'reviewed_at'], name='review_reviewer_reviewed_at'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['course', 'task_type'], name='task_course_type'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['batch', 'week_number', 'task_order'], name='task_batch_week_order'),
+        ),
+        migrations.AddIndex(
+            model_name='tasksubmission',
+            index=models.Index(fields=['student', 'marks_obtained'], name='submission_student_marks'),
+        ),
+        migrations.AddIndex(
+            model_name='tasksubmission',
+            index=models.Index(fields=['task', 'marks_obtained'], name='submission_task_marks'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.7 on 2026-10-16 23:39
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0008_studentprogressreview_review_reviewer_reviewed_at_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GradeStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('graded_count', models.IntegerField(default=0)),
+                ('marks_obtained', models.FloatField(default=0)),
+                ('max_marks', models.IntegerField(default=0)),
+                ('courses', models.JSONField(default=dict)),
+                ('histogram', models.JSONField(default=dict)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('student', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='grade_stats', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name_plural': 'Grade stats',
+            },
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.7 on 2026-10-16 23:39
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0002_course_syllabus_alter_course_created_by'),
+        ('tasks', '0009_gradestats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WeeklyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('week_number', models.IntegerField()),
+                ('assigned', models.IntegerField(default=0)),
+                ('submitted', models.IntegerField(default=0)),
+                ('graded', models.IntegerField(default=0)),
+                ('mean_percentage', models.FloatField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('batch', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='weekly_rollups', to='courses.batch')),
+            ],
+            options={
+                'ordering': ['batch', 'week_number'],
+                'unique_together': {('batch', 'week_number')},
+            },
+        ),
+    ]
@@ -25,6 +25,13 @@ class Task(models.Model):
     
     class Meta:
         ordering = ['week_number', 'task_order', 'created_at']
+        indexes = [
+            # Keyset pagination of task lists
+            models.Index(fields=['-created_at', '-id'], name='task_created_id'),
+            # Course-wide task lookups and the weekly sequence of a batch
+            models.Index(fields=['course', 'task_type'], name='task_course_type'),
+            models.Index(fields=['batch', 'week_number', 'task_order'], name='task_batch_week_order'),
+        ]
     
     def __str__(self):
         return f"Week {self.week_number} - {self.title}"
@@ -68,6 +75,14 @@ class TaskSubmission(models.Model):
     class Meta:
         unique_together = ['task', 'student']
         ordering = ['-submitted_at']
+        indexes = [
+            # Keyset pagination of submission lists
+            models.Index(fields=['-submitted_at', '-id'], name='submission_submitted_id'),
+            models.Index(fields=['student', '-submitted_at', '-id'], name='submission_student_submitted'),
+            # Graded / pending splits per student and per task
+            models.Index(fields=['student', 'marks_obtained'], name='submission_student_marks'),
+            models.Index(fields=['task', 'marks_obtained'], name='submission_task_marks'),
+        ]
     
     @property
     def is_graded(self):
@@ -106,3 +121,86 @@ class StudentProgressReview(models.Model):
     class Meta:
         unique_together = ['batch', 'student', 'week_number']
         ordering = ['-week_number', 'student__first_name']
+        indexes = [
+            models.Index(fields=['reviewed_by', 'reviewed_at'], name='review_reviewer_reviewed_at'),
+        ]
+
+
+class TaskProgress(models.Model):
+    """
+    Persisted progression state of a task for a student.
+    Refreshed for the student's course whenever one of their submissions changes,
+    and checked against the current tasks and submissions when read back.
+    """
+    STATE_CHOICES = [
+        ('locked', 'Locked'),
+        ('unlocked', 'Unlocked'),
+        ('submitted', 'Submitted'),
+        ('graded', 'Graded'),
+    ]
+    
+    student = models.ForeignKey(User, on_delete=models.CASCADE, related_name='task_progress')
+    task = models.ForeignKey(Task, on_delete=models.CASCADE, related_name='progress')
+    submission = models.ForeignKey(TaskSubmission, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    state = models.CharField(max_length=20, choices=STATE_CHOICES, default='locked')
+    
+    # Why the task is locked (None when unlocked)
+    lock_code = models.CharField(max_length=30, blank=True, null=True)
+    previous_task = models.ForeignKey(Task, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    previous_percentage = models.FloatField(blank=True, null=True)
+    
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"{self.student.username} - {self.task.title} ({self.state})"
+    
+    class Meta:
+        unique_together = ['student', 'task']
+        verbose_name_plural = 'Task progress'
+
+
+class GradeStats(models.Model):
+    """
+    Running totals of a student's graded submissions, read by the student dashboards.
+    Updated incrementally when a submission is graded or regraded, rebuilt from
+    the submissions whenever the row is missing.
+    """
+    student = models.OneToOneField(User, on_delete=models.CASCADE, related_name='grade_stats')
+    graded_count = models.IntegerField(default=0)
+    marks_obtained = models.FloatField(default=0)
+    max_marks = models.IntegerField(default=0)
+    
+    # {course_id: {'tasks_graded', 'marks_obtained', 'max_marks'}}
+    courses = models.JSONField(default=dict)
+    # {grade band label: count}, labels from tasks.grade_stats.GRADE_BANDS
+    histogram = models.JSONField(default=dict)
+    
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"{self.student.username} - {self.graded_count} graded"
+    
+    class Meta:
+        verbose_name_plural = 'Grade stats'
+
+
+class WeeklyRollup(models.Model):
+    """
+    Precomputed week-by-week numbers of a batch for the analytics API.
+    Covers the batch's own tasks plus course-wide tasks of its course, counted
+    over the batch's students. Kept current by tasks.analytics.
+    """
+    batch = models.ForeignKey(Batch, on_delete=models.CASCADE, related_name='weekly_rollups')
+    week_number = models.IntegerField()
+    assigned = models.IntegerField(default=0)
+    submitted = models.IntegerField(default=0)
+    graded = models.IntegerField(default=0)
+    mean_percentage = models.FloatField(blank=True, null=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"{self.batch.name} - Week {self.week_number}"
+    
+    class Meta:
+        unique_together = ['batch', 'week_number']
+        ordering = ['batch', 'week_number']
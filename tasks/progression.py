@@ -0,0 +1,229 @@
+from django.utils import timezone
+from .models import Task, TaskSubmission, TaskProgress
+
+
+# Minimum percentage on the previous task needed to unlock the next one
+UNLOCK_PERCENTAGE = 70
+
+
+class TaskLockState:
+    """Lock state of one task in a student's course sequence"""
+
+    def __init__(self, task, submission=None, previous_task=None):
+        self.task = task
+        self.submission = submission
+        self.previous_task = previous_task
+        self.is_locked = False
+        self.reason = None          # 'scheduled', 'previous_missing', 'previous_ungraded', 'previous_low_score'
+        self.previous_percentage = None
+
+    @classmethod
+    def from_progress(cls, progress):
+        """Rebuild a lock state from a persisted TaskProgress row"""
+        state = cls(progress.task, progress.submission, progress.previous_task)
+        state.is_locked = progress.lock_code is not None
+        state.reason = progress.lock_code
+        state.previous_percentage = progress.previous_percentage
+        return state
+
+    @property
+    def progress_state(self):
+        """Value stored in TaskProgress.state"""
+        if self.submission is not None:
+            return 'graded' if self.submission.marks_obtained is not None else 'submitted'
+        return 'locked' if self.is_locked else 'unlocked'
+
+    def lock_reason(self, verbose=False):
+        """Human readable lock reason (verbose is the wording used on the task detail page)"""
+        if not self.is_locked:
+            return None
+
+        if self.reason == 'scheduled':
+            return f"Available from {self.task.release_date.strftime('%B %d, %Y at %I:%M %p')}"
+
+        title = self.previous_task.title
+        if self.reason == 'previous_missing':
+            if verbose:
+                return f"You must complete '{title}' first"
+            return f"Complete '{title}' first"
+        if self.reason == 'previous_ungraded':
+            return f"Waiting for '{title}' to be graded"
+
+        if verbose:
+            return (
+                f"You need to score at least {UNLOCK_PERCENTAGE}% in '{title}' to unlock this task. "
+                f"Current score: {self.previous_percentage:.1f}%"
+            )
+        return f"Score at least {UNLOCK_PERCENTAGE}% in '{title}' (Current: {self.previous_percentage:.1f}%)"
+
+
+def released_tasks_for(student):
+    """All tasks assigned to a student that are already released, in progression order"""
+    return Task.objects.filter(
+        assigned_to=student
+    ).exclude(
+        is_scheduled=True,
+        release_date__gt=timezone.now()
+    ).select_related('course', 'batch').order_by('week_number', 'task_order', 'created_at', 'id')
+
+
+def _group_by_course(states):
+    """Reorder lock states so each course sequence is contiguous (same shape as build_progression)"""
+    course_sequences = {}
+    for state in states:
+        course_sequences.setdefault(state.task.course_id, []).append(state)
+    return {
+        state.task.id: state
+        for sequence in course_sequences.values()
+        for state in sequence
+    }
+
+
+def build_progression(student, tasks):
+    """
+    Compute lock state for every task in `tasks` (already in progression order).
+    Loads all the student's submissions for those tasks in a single query and
+    walks each course sequence in memory.
+    Returns a dict of task_id -> TaskLockState grouped by course, each course
+    sequence in progression order.
+    """
+    tasks = list(tasks)
+    submissions = {
+        sub.task_id: sub
+        for sub in TaskSubmission.objects.filter(
+            student=student,
+            task_id__in=[task.id for task in tasks]
+        )
+    }
+
+    now = timezone.now()
+    states = []
+    previous_by_course = {}
+
+    for task in tasks:
+        previous_task = previous_by_course.get(task.course_id)
+        state = TaskLockState(task, submissions.get(task.id), previous_task)
+
+        if task.is_scheduled and task.release_date and now < task.release_date:
+            state.is_locked = True
+            state.reason = 'scheduled'
+        elif previous_task is not None:
+            previous_submission = submissions.get(previous_task.id)
+            if not previous_submission:
+                state.is_locked = True
+                state.reason = 'previous_missing'
+            elif previous_submission.marks_obtained is None:
+                state.is_locked = True
+                state.reason = 'previous_ungraded'
+            else:
+                percentage = (previous_submission.marks_obtained / previous_task.max_marks) * 100
+                if percentage < UNLOCK_PERCENTAGE:
+                    state.is_locked = True
+                    state.reason = 'previous_low_score'
+                    state.previous_percentage = percentage
+
+        states.append(state)
+        previous_by_course[task.course_id] = task
+
+    return _group_by_course(states)
+
+
+def build_student_progression(student):
+    """Lock state for all released tasks of a student (two queries in total)"""
+    return build_progression(student, released_tasks_for(student))
+
+
+def _progress_values(state):
+    """TaskProgress field values for a lock state"""
+    return {
+        'submission': state.submission,
+        'state': state.progress_state,
+        'lock_code': state.reason if state.is_locked else None,
+        'previous_task': state.previous_task,
+        'previous_percentage': state.previous_percentage,
+    }
+
+
+def _progress_matches(progress, state):
+    """Whether a stored TaskProgress row still holds this lock state"""
+    return (
+        progress.submission_id == (state.submission.id if state.submission else None)
+        and progress.state == state.progress_state
+        and progress.lock_code == (state.reason if state.is_locked else None)
+        and progress.previous_task_id == (state.previous_task.id if state.previous_task else None)
+        and progress.previous_percentage == state.previous_percentage
+    )
+
+
+def refresh_task_progress(student, course_id=None):
+    """
+    Recompute and persist TaskProgress rows for a student.
+    Pass course_id to limit the refresh to the course whose sequence changed.
+    """
+    tasks = released_tasks_for(student)
+    existing = TaskProgress.objects.filter(student=student)
+    if course_id is not None:
+        tasks = tasks.filter(course_id=course_id)
+        existing = existing.filter(task__course_id=course_id)
+
+    states = build_progression(student, tasks)
+    existing = {progress.task_id: progress for progress in existing}
+
+    to_create = []
+    to_update = []
+    for task_id, state in states.items():
+        values = _progress_values(state)
+        progress = existing.get(task_id)
+        if progress is None:
+            to_create.append(TaskProgress(student=student, task=state.task, **values))
+            continue
+
+        if not _progress_matches(progress, state):
+            for field, value in values.items():
+                setattr(progress, field, value)
+            progress.updated_at = timezone.now()
+            to_update.append(progress)
+
+    stale_ids = [progress.id for task_id, progress in existing.items() if task_id not in states]
+    if stale_ids:
+        TaskProgress.objects.filter(id__in=stale_ids).delete()
+    if to_create:
+        TaskProgress.objects.bulk_create(to_create, ignore_conflicts=True)
+    if to_update:
+        TaskProgress.objects.bulk_update(
+            to_update,
+            ['submission', 'state', 'lock_code', 'previous_task', 'previous_percentage', 'updated_at']
+        )
+
+    return states
+
+
+def load_student_progress(student, course_id=None):
+    """
+    Read a student's lock states from TaskProgress.
+    The stored rows are checked against the released, assigned tasks and
+    against a recomputation from the rows' tasks and the student's current
+    submissions (one more query). Anything written without going through the
+    views that refresh progress (a task edited, moved or reordered, a
+    submission added, regraded or deleted from the admin, with
+    QuerySet.update() or by a cascade) makes them stale, and they are
+    refreshed.
+    """
+    rows = TaskProgress.objects.filter(student=student).select_related(
+        'task', 'task__course', 'task__batch', 'submission', 'previous_task'
+    ).order_by('task__week_number', 'task__task_order', 'task__created_at', 'task__id')
+    released_ids = released_tasks_for(student)
+    if course_id is not None:
+        rows = rows.filter(task__course_id=course_id)
+        released_ids = released_ids.filter(course_id=course_id)
+
+    rows = list(rows)
+    if {progress.task_id for progress in rows} != set(released_ids.values_list('id', flat=True)):
+        return refresh_task_progress(student, course_id)
+
+    # Rows are in progression order, so this walks the same sequences
+    current = build_progression(student, [progress.task for progress in rows])
+    if not all(_progress_matches(progress, current[progress.task_id]) for progress in rows):
+        return refresh_task_progress(student, course_id)
+
+    return _group_by_course(TaskLockState.from_progress(progress) for progress in rows)
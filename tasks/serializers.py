@@ -1,3 +1,4 @@
+import math
 from rest_framework import serializers
 from .models import Task, TaskSubmission
 from authentication.serializers import UserSerializer
@@ -69,42 +70,36 @@ class TaskSerializer(serializers.ModelSerializer):
         task = Task.objects.create(**validated_data)
         
         #  CRITICAL FIX: Handle task assignment based on task_type
+        from .assignment import assign_tasks_to_students
+        
         if validated_data.get('task_type') == 'course':
             # Course-wide task: assign to ALL approved students in ALL batches of this course
-            batches = course.batches.all()
-            all_students = User.objects.filter(
+            student_ids = User.objects.filter(
                 role='student',
                 is_approved=True,
-                enrolled_batches__in=batches
-            ).distinct()
-            task.assigned_to.set(all_students)
-            print(f" Course-wide task '{task.title}': Assigned to {all_students.count()} students")
-            print(f"   Students: {[s.username for s in all_students]}")
+                enrolled_batches__course=course
+            ).values_list('id', flat=True).distinct()
+            assigned = assign_tasks_to_students([task.id], student_ids)
+            print(f" Course-wide task '{task.title}': Assigned to {assigned} students")
         else:
             # Batch-specific task
             if assigned_to_ids:
                 # Specific students selected by admin
-                students = User.objects.filter(
+                student_ids = User.objects.filter(
                     id__in=assigned_to_ids, 
                     role='student', 
                     is_approved=True
-                )
-                task.assigned_to.set(students)
-                print(f" Batch task '{task.title}': Assigned to {students.count()} specific students")
-                print(f"   Students: {[s.username for s in students]}")
+                ).values_list('id', flat=True)
+                assigned = assign_tasks_to_students([task.id], student_ids)
+                print(f" Batch task '{task.title}': Assigned to {assigned} specific students")
             elif batch:
                 # No specific students: assign to ALL approved students in batch
-                students = batch.students.filter(is_approved=True)
-                task.assigned_to.set(students)
-                print(f" Batch task '{task.title}': Assigned to {students.count()} students in batch '{batch.name}'")
-                print(f"   Students: {[s.username for s in students]}")
+                student_ids = batch.students.filter(is_approved=True).values_list('id', flat=True)
+                assigned = assign_tasks_to_students([task.id], student_ids)
+                print(f" Batch task '{task.title}': Assigned to {assigned} students in batch '{batch.name}'")
             else:
                 print(f"⚠️ WARNING: Task '{task.title}' created but no students assigned!")
         
-        #  Final verification
-        final_count = task.assigned_to.count()
-        print(f" TASK CREATION COMPLETE: '{task.title}' has {final_count} assigned students")
-        
         return task
 
 
@@ -139,6 +134,8 @@ class GradeSubmissionSerializer(serializers.ModelSerializer):
         fields = ['marks_obtained', 'feedback']
     
     def validate_marks_obtained(self, value):
+        if not math.isfinite(value):
+            raise serializers.ValidationError("Marks must be a finite number")
         if value < 0:
             raise serializers.ValidationError("Marks cannot be negative")
         if value > self.instance.task.max_marks:
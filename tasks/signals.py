@@ -1,38 +1,180 @@
-from django.db.models.signals import m2m_changed
+from django.db.models.signals import m2m_changed, post_save, post_delete, pre_save, pre_delete
+from django.db.models import QuerySet
 from django.dispatch import receiver
-from courses.models import Batch
-from tasks.models import Task
+from authentication.models import User, StudentProfile
+from courses.models import Course, Batch
+from tasks.models import Task, TaskSubmission
+from tasks.assignment import assign_batch_tasks
+from tasks.grade_stats import invalidate_grade_stats
+from tasks.analytics import (
+    batches_for_tasks,
+    refresh_weekly_rollups,
+    refresh_rollups_for_tasks,
+    refresh_rollups_for_submission,
+)
+from student_management.cache import bump_scopes
 
 
+def _deleted_with(origin, *models):
+    """
+    Whether a delete cascades from an instance or queryset of one of these
+    models. Handlers of cascaded rows use it to leave the work to the
+    handlers of the row that started the delete.
+    """
+    model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    return issubclass(model, models)
+
+
+@receiver(m2m_changed, sender=Batch.students.through)
+def assign_existing_tasks_to_new_student(sender, instance, action, pk_set, reverse=False, **kwargs):
+    """Assign a batch's existing tasks to students added to it (one bulk insert)"""
+    if action != "post_add" or not pk_set:
+        return
+    
+    if reverse:
+        # student.enrolled_batches.add(...): instance is the student, pk_set the batches
+        batches = Batch.objects.filter(id__in=pk_set)
+        student_ids = [instance.id]
+    else:
+        batches = [instance]
+        student_ids = pk_set
+    
+    task_count, student_count, created = assign_batch_tasks(batches, student_ids)
+    if created:
+        print(f" AUTO-ASSIGNED {task_count} tasks to {student_count} new student(s) ({created} new assignments)")
+
+
+@receiver(post_save, sender=Task)
+def invalidate_task_grade_stats(sender, instance, created=False, **kwargs):
+    """A task edit may change max_marks or course, so the graded students' stats are rebuilt"""
+    if created:
+        return
+    invalidate_grade_stats(
+        TaskSubmission.objects.filter(task=instance, marks_obtained__isnull=False).values('student_id')
+    )
+
+
+@receiver(post_delete, sender=TaskSubmission)
+def invalidate_submission_grade_stats(sender, instance, origin=None, **kwargs):
+    if _deleted_with(origin, Task, Batch, Course):
+        # invalidate_deleted_task_grade_stats covers it once per task
+        return
+    if instance.marks_obtained is not None:
+        invalidate_grade_stats([instance.student_id])
+
+
+@receiver(pre_delete, sender=Task)
+def remember_graded_students(sender, instance, **kwargs):
+    # The submissions are gone by post_delete
+    instance._graded_student_ids = list(
+        TaskSubmission.objects.filter(task=instance, marks_obtained__isnull=False).values_list('student_id', flat=True)
+    )
+
+
+@receiver(post_delete, sender=Task)
+def invalidate_deleted_task_grade_stats(sender, instance, **kwargs):
+    invalidate_grade_stats(getattr(instance, '_graded_student_ids', []))
+
+
+# ===== Weekly rollups =====
+
+@receiver(post_save, sender=TaskSubmission)
+@receiver(post_delete, sender=TaskSubmission)
+def refresh_submission_rollups(sender, instance, origin=None, **kwargs):
+    if _deleted_with(origin, Task, Batch, Course):
+        # refresh_task_rollups covers it once per task
+        return
+    refresh_rollups_for_submission(instance.task, instance.student_id)
+
+
+@receiver(m2m_changed, sender=Task.assigned_to.through)
+def refresh_assignment_rollups(sender, instance, action, pk_set, reverse=False, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if reverse:
+        # student.assigned_tasks.add(...): pk_set holds task ids (None on clear)
+        if pk_set:
+            refresh_rollups_for_tasks(pk_set)
+        else:
+            for batch in instance.enrolled_batches.all():
+                refresh_weekly_rollups(batch)
+    else:
+        for batch in batches_for_tasks([instance]):
+            refresh_weekly_rollups(batch, weeks=[instance.week_number])
+
+
+@receiver(pre_save, sender=Task)
+def remember_task_placement(sender, instance, raw=False, **kwargs):
+    instance._previous_placement = None
+    if instance.pk and not raw:
+        instance._previous_placement = Task.objects.filter(pk=instance.pk).values(
+            'batch_id', 'course_id', 'task_type'
+        ).first()
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+def refresh_task_rollups(sender, instance, created=False, origin=None, **kwargs):
+    """
+    Edits can move a task to another week, so the whole batch is recomputed,
+    and to another batch or course, so the batches it left are recomputed too
+    """
+    if created:
+        return
+    if _deleted_with(origin, Batch, Course):
+        # The batches and their rollups are deleted along with the task
+        return
+    tasks = [instance]
+    if getattr(instance, '_previous_placement', None):
+        tasks.append(instance._previous_placement)
+    for batch in batches_for_tasks(tasks):
+        refresh_weekly_rollups(batch)
+
+
+@receiver(m2m_changed, sender=Batch.students.through)
+def refresh_roster_rollups(sender, instance, action, pk_set, reverse=False, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if reverse:
+        batches = Batch.objects.filter(id__in=pk_set) if pk_set else []
+    else:
+        batches = [instance]
+    for batch in batches:
+        refresh_weekly_rollups(batch)
+
+
+# ===== List cache invalidation =====
+# Course serializers nest into batches, batches into tasks, and users
+# (mentors, students) into all three, so changes bump every dependent scope.
+
+@receiver(post_save, sender=Course)
+@receiver(post_delete, sender=Course)
+def invalidate_course_cache(sender, **kwargs):
+    bump_scopes('courses', 'batches', 'tasks')
+
+
+@receiver(post_save, sender=Batch)
+@receiver(post_delete, sender=Batch)
 @receiver(m2m_changed, sender=Batch.students.through)
-def assign_existing_tasks_to_new_student(sender, instance, action, pk_set, **kwargs):
-  
-    if action == "post_add":
-        batch = instance
-        
-        from authentication.models import User
-        new_students = User.objects.filter(
-            id__in=pk_set, 
-            role='student', 
-            is_approved=True
-        )
-        
-        if new_students.exists():
-          
-            batch_tasks = Task.objects.filter(batch=batch)
-            
-           
-            course_tasks = Task.objects.filter(
-                course=batch.course, 
-                task_type='course'
-            )
-            
-            all_tasks = batch_tasks | course_tasks
-            
-           
-            for task in all_tasks.distinct():
-                for student in new_students:
-                    task.assigned_to.add(student)
-      
-            if all_tasks.exists():
-                print(f" AUTO-ASSIGNED {all_tasks.count()} tasks to {new_students.count()} new student(s) in batch '{batch.name}'")
+def invalidate_batch_cache(sender, action=None, **kwargs):
+    if action is not None and not action.startswith('post_'):
+        return
+    bump_scopes('batches', 'tasks')
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+@receiver(m2m_changed, sender=Task.assigned_to.through)
+def invalidate_task_cache(sender, action=None, **kwargs):
+    if action is not None and not action.startswith('post_'):
+        return
+    bump_scopes('tasks')
+
+
+@receiver(post_save, sender=User)
+@receiver(post_save, sender=StudentProfile)
+def invalidate_user_cache(sender, update_fields=None, **kwargs):
+    # Logins only touch last_login, which no cached list shows
+    if update_fields and set(update_fields) <= {'last_login'}:
+        return
+    bump_scopes('courses', 'batches', 'tasks')
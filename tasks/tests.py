@@ -1,3 +1,580 @@
+import csv
+import io
+from datetime import timedelta
+from unittest import mock, skipUnless
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+from authentication.models import User
+from courses.models import Course, Batch
+from tasks.models import Task, TaskSubmission, TaskProgress, GradeStats, WeeklyRollup
+from tasks.progression import build_student_progression, load_student_progress
+from tasks.assignment import assign_tasks_to_students
+from tasks.grade_stats import apply_grade, get_grade_stats, rebuild_grade_stats
+from notifications.models import Notification, QueuedJob
+from tasks.management.commands.explain_queries import Command as ExplainQueriesCommand
 
-# Create your tests here.
+
+class TaskFixtureMixin:
+    """A course with one batch, two students and a three-week task sequence"""
+
+    def setUp(self):
+        cache.clear()
+        self.mentor = User.objects.create(username='mentor', role='mentor', is_approved=True)
+        self.student = User.objects.create(username='student', role='student', is_approved=True)
+        self.other = User.objects.create(username='other', role='student', is_approved=True)
+        self.course = Course.objects.create(name='Python', code='PY1', description='d', duration_weeks=4)
+        self.batch = Batch.objects.create(
+            name='B1', course=self.course, mentor=self.mentor,
+            start_date='2025-01-01', end_date='2025-12-01'
+        )
+        self.batch.students.add(self.student, self.other)
+        self.tasks = [self.make_task(week) for week in (1, 2, 3)]
+
+    def make_task(self, week, course=None, **kwargs):
+        task = Task.objects.create(
+            course=course or self.course, batch=self.batch if course is None else None,
+            title=f'Week {week}', description='x', due_date=timezone.now(),
+            week_number=week, max_marks=kwargs.pop('max_marks', 10), created_by=self.mentor, **kwargs
+        )
+        task.assigned_to.add(self.student, self.other)
+        return task
+
+    def submit(self, task, marks=None, student=None):
+        return TaskSubmission.objects.create(
+            task=task, student=student or self.student, submission_text='done', marks_obtained=marks
+        )
+
+
+class ProgressionRulesTests(TaskFixtureMixin, TestCase):
+
+    def states(self):
+        return build_student_progression(self.student)
+
+    def test_first_task_unlocked_and_next_needs_a_submission(self):
+        states = self.states()
+        self.assertFalse(states[self.tasks[0].id].is_locked)
+        self.assertEqual(states[self.tasks[1].id].reason, 'previous_missing')
+        self.assertEqual(states[self.tasks[2].id].reason, 'previous_missing')
+
+    def test_ungraded_previous_submission_keeps_next_locked(self):
+        self.submit(self.tasks[0])
+        self.assertEqual(self.states()[self.tasks[1].id].reason, 'previous_ungraded')
+
+    def test_low_score_locks_and_reports_percentage(self):
+        self.submit(self.tasks[0], marks=6)
+        state = self.states()[self.tasks[1].id]
+        self.assertEqual(state.reason, 'previous_low_score')
+        self.assertAlmostEqual(state.previous_percentage, 60.0)
+
+    def test_score_at_threshold_unlocks_next(self):
+        self.submit(self.tasks[0], marks=7)
+        states = self.states()
+        self.assertFalse(states[self.tasks[1].id].is_locked)
+        self.assertEqual(states[self.tasks[2].id].reason, 'previous_missing')
+
+    def test_unreleased_tasks_are_left_out(self):
+        future = self.make_task(4, is_scheduled=True, release_date=timezone.now() + timedelta(days=3))
+        self.assertNotIn(future.id, self.states())
+
+    def test_courses_are_separate_sequences(self):
+        other_course = Course.objects.create(name='Web', code='WEB1', description='d', duration_weeks=4)
+        first_of_other = self.make_task(2, course=other_course)
+        self.assertFalse(self.states()[first_of_other.id].is_locked)
+
+    def test_other_students_submissions_do_not_unlock(self):
+        self.submit(self.tasks[0], marks=10, student=self.other)
+        self.assertTrue(self.states()[self.tasks[1].id].is_locked)
+
+
+class BulkAssignmentTests(TaskFixtureMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.course_task = self.make_task(4, course=self.course, task_type='course')
+        other_batch = Batch.objects.create(
+            name='B2', course=self.course, start_date='2025-01-01', end_date='2025-12-01'
+        )
+        self.other_batch_task = Task.objects.create(
+            course=self.course, batch=other_batch, title='Other batch', description='x',
+            due_date=timezone.now(), created_by=self.mentor
+        )
+
+    def assigned_ids(self, student):
+        return set(student.assigned_tasks.values_list('id', flat=True))
+
+    def test_joining_a_batch_assigns_its_tasks_and_the_course_wide_ones(self):
+        newcomer = User.objects.create(username='new', role='student', is_approved=True)
+        self.batch.students.add(newcomer)
+        self.assertEqual(
+            self.assigned_ids(newcomer),
+            {task.id for task in self.tasks} | {self.course_task.id}
+        )
+
+    def test_reverse_add_assigns_the_same_tasks(self):
+        newcomer = User.objects.create(username='new', role='student', is_approved=True)
+        newcomer.enrolled_batches.add(self.batch)
+        self.assertEqual(
+            self.assigned_ids(newcomer),
+            {task.id for task in self.tasks} | {self.course_task.id}
+        )
+
+    def test_unapproved_students_get_nothing(self):
+        pending = User.objects.create(username='pending', role='student', is_approved=False)
+        self.batch.students.add(pending)
+        self.assertEqual(self.assigned_ids(pending), set())
+
+    def test_existing_assignments_are_not_duplicated(self):
+        task_ids = [task.id for task in self.tasks]
+        self.assertEqual(assign_tasks_to_students(task_ids, [self.student.id]), 0)
+        newcomer = User.objects.create(username='new', role='student', is_approved=True)
+        self.assertEqual(assign_tasks_to_students(task_ids, [self.student.id, newcomer.id]), 3)
+        self.assertEqual(Task.assigned_to.through.objects.filter(user=self.student).count(), 4)
+
+
+class MentorTaskListTests(TaskFixtureMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.course_task = self.make_task(4, course=self.course, task_type='course')
+        other_batch = Batch.objects.create(
+            name='B2', course=self.course, start_date='2025-01-01', end_date='2025-12-01',
+            mentor=User.objects.create(username='mentor2', role='mentor', is_approved=True)
+        )
+        self.outsider = User.objects.create(username='outsider', role='student', is_approved=True)
+        other_batch.students.add(self.outsider)
+        self.client = APIClient()
+        self.client.force_authenticate(self.mentor)
+
+    def counts(self):
+        response = self.client.get('/api/tasks/mentor/tasks/')
+        self.assertEqual(response.status_code, 200)
+        return {
+            row['id']: (row['total_students'], row['submission_count'], row['graded_count'], row['pending_grading'])
+            for row in response.data['tasks']
+        }
+
+    def test_counts_per_task(self):
+        self.submit(self.tasks[0], marks=8)
+        self.submit(self.tasks[0], student=self.other)
+        counts = self.counts()
+        self.assertEqual(counts[self.tasks[0].id], (2, 2, 1, 1))
+        self.assertEqual(counts[self.tasks[1].id], (2, 0, 0, 0))
+
+    def test_course_wide_tasks_only_count_the_mentors_students(self):
+        self.submit(self.course_task, marks=9)
+        self.submit(self.course_task, student=self.outsider)
+        self.assertEqual(self.counts()[self.course_task.id], (2, 1, 1, 0))
+
+
+class GradebookExportTests(TaskFixtureMixin, TestCase):
+
+    def export(self, user):
+        client = APIClient()
+        client.force_authenticate(user)
+        return client.get(f'/api/tasks/mentor/batch/{self.batch.id}/gradebook/export/')
+
+    def test_csv_has_one_row_per_student_with_totals(self):
+        self.student.first_name, self.student.last_name = 'Ada', 'Lovelace'
+        self.student.save()
+        self.submit(self.tasks[0], marks=8)
+        self.submit(self.tasks[1])
+
+        response = self.export(self.mentor)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        rows = list(csv.reader(io.StringIO(b''.join(response.streaming_content).decode())))
+
+        self.assertEqual(rows[0], [
+            'Student ID', 'Name', 'Email', 'Enrollment Number',
+            'Week 1 (10)', 'Week 2 (10)', 'Week 3 (10)',
+            'Total Obtained', 'Total Max', 'Percentage',
+        ])
+        self.assertEqual(
+            rows[1],
+            [str(self.student.id), 'Ada Lovelace', '', '', '8.0', 'Pending', '', '8.0', '10', '80.0']
+        )
+        self.assertEqual(rows[2], [str(self.other.id), '', '', '', '', '', '', '0', '0', ''])
+        self.assertEqual(len(rows), 3)
+
+    def test_other_mentors_cannot_export(self):
+        other_mentor = User.objects.create(username='mentor2', role='mentor', is_approved=True)
+        self.assertEqual(self.export(other_mentor).status_code, 404)
+
+
+class GradeStatsTests(TaskFixtureMixin, TestCase):
+
+    def grade(self, submission, marks):
+        previous_marks = submission.marks_obtained
+        submission.marks_obtained = marks
+        submission.save()
+        apply_grade(submission, previous_marks)
+
+    def snapshot(self, stats):
+        return (stats.graded_count, stats.marks_obtained, stats.max_marks, stats.courses, stats.histogram)
+
+    def assertMatchesRebuild(self):
+        incremental = self.snapshot(get_grade_stats(self.student))
+        self.assertEqual(incremental, self.snapshot(rebuild_grade_stats(self.student)))
+
+    def test_regrades_match_a_full_rebuild(self):
+        submissions = [self.submit(task) for task in self.tasks]
+        get_grade_stats(self.student)
+
+        self.grade(submissions[0], 9.5)     # ungraded -> A
+        self.grade(submissions[1], 7)       # ungraded -> C
+        self.assertMatchesRebuild()
+
+        self.grade(submissions[0], 5)       # A -> F
+        self.grade(submissions[1], 8)       # C -> B
+        self.assertMatchesRebuild()
+
+        stats = get_grade_stats(self.student)
+        self.assertEqual(stats.graded_count, 2)
+        self.assertEqual(stats.marks_obtained, 13)
+        self.assertEqual(stats.histogram['F (Below 60%)'], 1)
+        self.assertEqual(stats.histogram['B (80-89%)'], 1)
+        self.assertEqual(stats.histogram['A (90-100%)'], 0)
+
+    def test_removing_the_last_grade_of_a_course_drops_it(self):
+        submission = self.submit(self.tasks[0])
+        get_grade_stats(self.student)
+        self.grade(submission, 10)
+        self.grade(submission, None)
+        self.assertEqual(get_grade_stats(self.student).courses, {})
+        self.assertMatchesRebuild()
+
+    def test_other_students_are_untouched(self):
+        get_grade_stats(self.other)
+        self.grade(self.submit(self.tasks[0]), 10)
+        self.assertEqual(get_grade_stats(self.other).graded_count, 0)
+
+
+class TaskImportTests(TaskFixtureMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.client.force_authenticate(self.mentor)
+
+    def rows(self):
+        return [
+            {'title': 'Loops', 'description': 'x', 'week_number': 5, 'due_date': '2025-02-01T10:00:00Z', 'max_marks': 20},
+            {'title': 'Functions', 'description': 'x', 'week_number': 6, 'due_date': '2025-02-08T10:00:00Z'},
+        ]
+
+    def test_json_import_creates_and_assigns_batch_tasks(self):
+        response = self.client.post(
+            '/api/tasks/import/', {'batch_id': self.batch.id, 'tasks': self.rows()}, format='json'
+        )
+        self.assertEqual(response.status_code, 201)
+
+        tasks = Task.objects.filter(id__in=response.data['task_ids']).order_by('week_number')
+        self.assertEqual([task.title for task in tasks], ['Loops', 'Functions'])
+        self.assertEqual([task.max_marks for task in tasks], [20, 100])
+        for task in tasks:
+            self.assertEqual((task.batch_id, task.task_type), (self.batch.id, 'batch'))
+            self.assertEqual(set(task.assigned_to.all()), {self.student, self.other})
+        # One notification job for the whole import
+        self.assertEqual(QueuedJob.objects.filter(kind='tasks_imported').count(), 1)
+
+    def test_csv_import(self):
+        upload = SimpleUploadedFile(
+            'syllabus.csv',
+            b'title,description,week_number,due_date,max_marks\n'
+            b'Loops,x,5,2025-02-01 10:00,20\n'
+            b'Functions,x,6,2025-02-08 10:00,\n'
+        )
+        response = self.client.post('/api/tasks/import/', {'batch_id': self.batch.id, 'file': upload})
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(
+            list(Task.objects.filter(id__in=response.data['task_ids']).order_by('week_number').values_list('max_marks', flat=True)),
+            [20, 100]
+        )
+
+    def test_one_invalid_row_imports_nothing(self):
+        rows = self.rows()
+        rows[1]['max_marks'] = 0
+        response = self.client.post('/api/tasks/import/', {'batch_id': self.batch.id, 'tasks': rows}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(Task.objects.count(), 3)
+
+    def test_mentors_cannot_import_into_other_batches_or_course_wide(self):
+        other_batch = Batch.objects.create(name='B2', course=self.course, start_date='2025-01-01', end_date='2025-12-01')
+        response = self.client.post('/api/tasks/import/', {'batch_id': other_batch.id, 'tasks': self.rows()}, format='json')
+        self.assertEqual(response.status_code, 404)
+        response = self.client.post('/api/tasks/import/', {'course_id': self.course.id, 'tasks': self.rows()}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+
+class BulkGradingTests(TaskFixtureMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.first = self.submit(self.tasks[0])
+        self.second = self.submit(self.tasks[0], student=self.other)
+        self.client = APIClient()
+        self.client.force_authenticate(self.mentor)
+
+    def bulk_grade(self, grades):
+        return self.client.post('/api/tasks/mentor/submissions/bulk-grade/', {'grades': grades}, format='json')
+
+    def test_grades_every_submission_and_refreshes_derived_state(self):
+        get_grade_stats(self.student)
+        response = self.bulk_grade([
+            {'submission_id': self.first.id, 'marks_obtained': 9, 'feedback': 'good'},
+            {'submission_id': self.second.id, 'marks_obtained': 4},
+        ])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['graded_count'], 2)
+
+        self.first.refresh_from_db()
+        self.assertEqual((self.first.marks_obtained, self.first.status, self.first.feedback), (9, 'graded', 'good'))
+        self.assertEqual(self.first.graded_by, self.mentor)
+        self.assertEqual(get_grade_stats(self.student).marks_obtained, rebuild_grade_stats(self.student).marks_obtained)
+        self.assertFalse(build_student_progression(self.student)[self.tasks[1].id].is_locked)
+        self.assertTrue(build_student_progression(self.other)[self.tasks[1].id].is_locked)
+
+    def test_any_invalid_grade_saves_nothing(self):
+        response = self.bulk_grade([
+            {'submission_id': self.first.id, 'marks_obtained': 9},
+            {'submission_id': self.second.id, 'marks_obtained': 11},
+            {'submission_id': self.first.id, 'marks_obtained': 5},
+            {'submission_id': 999999, 'marks_obtained': 5},
+            {'submission_id': self.second.id, 'marks_obtained': 'ten'},
+        ])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual([error['index'] for error in response.data['errors']], [1, 2, 3, 4])
+        self.assertFalse(TaskSubmission.objects.filter(marks_obtained__isnull=False).exists())
+
+    def test_other_mentors_submissions_are_refused(self):
+        self.client.force_authenticate(User.objects.create(username='mentor2', role='mentor', is_approved=True))
+        response = self.bulk_grade([{'submission_id': self.first.id, 'marks_obtained': 9}])
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('access', response.data['errors'][0]['error'])
+
+    def test_non_finite_marks_are_rejected_everywhere(self):
+        for marks in ('nan', 'inf', '-Infinity', '1e999'):
+            with self.subTest(marks):
+                response = self.bulk_grade([{'submission_id': self.first.id, 'marks_obtained': marks}])
+                self.assertEqual(response.status_code, 400)
+                response = self.client.post(
+                    f'/api/tasks/mentor/submissions/{self.first.id}/grade/', {'marks_obtained': marks}, format='json'
+                )
+                self.assertEqual(response.status_code, 400)
+                response = self.client.patch(
+                    f'/api/tasks/submissions/{self.first.id}/grade/', {'marks_obtained': marks}, format='json'
+                )
+                self.assertEqual(response.status_code, 400)
+        self.first.refresh_from_db()
+        self.assertIsNone(self.first.marks_obtained)
+
+
+@skipUnless(connection.vendor == 'postgresql', "Index usage is only asserted on PostgreSQL")
+class HotQueryPlanTests(TestCase):
+    """The hot view querysets must be servable by an index, whatever the table size"""
+
+    def test_hot_queries_do_not_seq_scan(self):
+        # TestCase runs inside a transaction, so SET LOCAL lasts for this test
+        with connection.cursor() as cursor:
+            cursor.execute('SET LOCAL enable_seqscan = off')
+
+        for label, table, queryset in ExplainQueriesCommand().get_querysets():
+            with self.subTest(label):
+                self.assertNotIn(f'Seq Scan on {table}', queryset.explain())
+
+
+class StoredProgressTests(TaskFixtureMixin, TestCase):
+
+    def test_stored_progress_matches_a_fresh_build(self):
+        self.submit(self.tasks[0], marks=8)
+        stored = load_student_progress(self.student)
+        fresh = build_student_progression(self.student)
+        self.assertEqual(
+            [(task_id, state.is_locked, state.reason) for task_id, state in stored.items()],
+            [(task_id, state.is_locked, state.reason) for task_id, state in fresh.items()]
+        )
+
+    def test_stored_progress_follows_task_edits(self):
+        self.submit(self.tasks[0], marks=6)
+        self.assertTrue(load_student_progress(self.student)[self.tasks[1].id].is_locked)
+        # A lower max_marks puts the score over the threshold
+        task = self.tasks[0]
+        task.max_marks = 8
+        task.save()
+        self.assertFalse(load_student_progress(self.student)[self.tasks[1].id].is_locked)
+
+    def test_stored_progress_follows_reorders_without_signals(self):
+        self.submit(self.tasks[0], marks=10)
+        load_student_progress(self.student)
+        # Move week 3 to the front without save(), so no signal fires
+        Task.objects.filter(id=self.tasks[2].id).update(week_number=0)
+        states = load_student_progress(self.student)
+        self.assertFalse(states[self.tasks[2].id].is_locked)
+        self.assertEqual(states[self.tasks[0].id].previous_task.id, self.tasks[2].id)
+
+    def test_stored_progress_follows_submission_changes_without_signals(self):
+        submission = self.submit(self.tasks[0], marks=10)
+        self.assertFalse(load_student_progress(self.student)[self.tasks[1].id].is_locked)
+
+        TaskSubmission.objects.filter(id=submission.id).update(marks_obtained=5)
+        self.assertEqual(load_student_progress(self.student)[self.tasks[1].id].reason, 'previous_low_score')
+
+        TaskSubmission.objects.filter(id=submission.id).delete()
+        states = load_student_progress(self.student)
+        self.assertIsNone(states[self.tasks[0].id].submission)
+        self.assertEqual(states[self.tasks[1].id].reason, 'previous_missing')
+
+    def test_submissions_created_outside_the_views_are_picked_up(self):
+        load_student_progress(self.student)
+        # e.g. added from the admin, which does not refresh progress
+        self.submit(self.tasks[0], marks=9)
+        self.assertFalse(load_student_progress(self.student)[self.tasks[1].id].is_locked)
+
+    def test_task_edits_keep_other_students_rows(self):
+        load_student_progress(self.student)
+        load_student_progress(self.other)
+        task = self.tasks[2]
+        task.title = 'Renamed'
+        task.save()
+        self.assertEqual(TaskProgress.objects.count(), 6)
+
+    def test_current_rows_are_read_back_in_three_queries(self):
+        load_student_progress(self.student)
+        with self.assertNumQueries(3):
+            load_student_progress(self.student)
+
+
+class BatchSubmissionsViewTests(TaskFixtureMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.client.force_authenticate(self.mentor)
+
+    def get(self, **params):
+        response = self.client.get(f'/api/tasks/mentor/batch/{self.batch.id}/submissions/', params)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_submissions_are_listed_newest_first(self):
+        first = self.submit(self.tasks[0], marks=8)
+        second = self.submit(self.tasks[0], student=self.other)
+        row = self.get()['tasks'][0]
+        self.assertEqual([sub['submission_id'] for sub in row['submissions']], [second.id, first.id])
+        self.assertEqual((row['total_assigned'], row['total_submitted']), (2, 2))
+
+        # Later submissions come first whatever their id, ties fall back to the newest id
+        TaskSubmission.objects.filter(id=first.id).update(submitted_at=timezone.now() + timedelta(hours=1))
+        row = self.get()['tasks'][0]
+        self.assertEqual([sub['submission_id'] for sub in row['submissions']], [first.id, second.id])
+        TaskSubmission.objects.filter(task=self.tasks[0]).update(submitted_at=timezone.now())
+        row = self.get()['tasks'][0]
+        self.assertEqual([sub['submission_id'] for sub in row['submissions']], [second.id, first.id])
+
+    def test_columnar_layout(self):
+        self.submit(self.tasks[0], marks=8)
+        self.submit(self.tasks[1])
+        data = self.get(layout='columnar')
+        self.assertEqual(data['student_ids'], [self.student.id, self.other.id])
+        self.assertEqual(data['task_ids'], [task.id for task in self.tasks])
+        self.assertEqual(data['marks'], [[8.0, 'submitted', 'unsubmitted'], ['unsubmitted'] * 3])
+
+
+class WeeklyRollupTests(TaskFixtureMixin, TestCase):
+
+    def rollups(self, batch):
+        return {
+            rollup.week_number: (rollup.assigned, rollup.submitted, rollup.graded)
+            for rollup in WeeklyRollup.objects.filter(batch=batch)
+        }
+
+    def test_moving_a_task_refreshes_the_old_and_new_batch(self):
+        self.submit(self.tasks[0], marks=8)
+        other_batch = Batch.objects.create(
+            name='B2', course=self.course, mentor=self.mentor,
+            start_date='2025-01-01', end_date='2025-12-01'
+        )
+        other_batch.students.add(self.student)
+        self.assertEqual(self.rollups(self.batch)[1], (2, 1, 1))
+        self.assertNotIn(1, self.rollups(other_batch))
+
+        task = Task.objects.get(id=self.tasks[0].id)
+        task.batch = other_batch
+        task.save()
+        self.assertNotIn(1, self.rollups(self.batch))
+        self.assertEqual(self.rollups(other_batch)[1], (1, 1, 1))
+
+    def test_task_delete_refreshes_rollups_and_grade_stats(self):
+        self.submit(self.tasks[0], marks=8)
+        self.submit(self.tasks[1], marks=6)
+        self.assertEqual(get_grade_stats(self.student).graded_count, 2)
+
+        self.tasks[0].delete()
+        self.assertNotIn(1, self.rollups(self.batch))
+        self.assertEqual(self.rollups(self.batch)[2], (2, 1, 1))
+        self.assertFalse(GradeStats.objects.filter(student=self.student).exists())
+        self.assertEqual(get_grade_stats(self.student).graded_count, 1)
+
+    def test_task_delete_does_not_scale_with_submissions(self):
+        def delete_queries(task):
+            with CaptureQueriesContext(connection) as queries:
+                Task.objects.filter(id=task.id).delete()
+            return len(queries)
+
+        self.submit(self.tasks[0], marks=8)
+        few = delete_queries(self.tasks[0])
+
+        students = [User.objects.create(username=f's{i}', role='student') for i in range(6)]
+        self.batch.students.add(*students)
+        for student in [self.student] + students:
+            self.submit(self.tasks[1], marks=8, student=student)
+        self.assertEqual(delete_queries(self.tasks[1]), few)
+
+    def test_batch_delete_with_submissions(self):
+        self.submit(self.tasks[0], marks=8)
+        self.batch.delete()
+        self.assertFalse(WeeklyRollup.objects.exists())
+        self.assertFalse(Task.objects.exists())
+
+
+class SeedScaleTests(TestCase):
+    options = dict(
+        students=6, mentors=2, courses=1, batches_per_course=2, weeks=2,
+        tasks_per_week=1, course_tasks=1, notifications=3, stdout=io.StringIO(),
+    )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_seeds_and_reseeds_with_clear(self):
+        with mock.patch('tasks.management.commands.seed_scale.invalidate_unread_counts') as invalidate:
+            call_command('seed_scale', **self.options)
+        students = set(User.objects.filter(role='student').values_list('id', flat=True))
+        self.assertEqual(len(students), 6)
+        self.assertEqual(
+            invalidate.call_args.args[0],
+            set(Notification.objects.filter(is_read=False).values_list('recipient_id', flat=True))
+        )
+        self.assertLessEqual(invalidate.call_args.args[0], students)
+        self.assertEqual(WeeklyRollup.objects.count(), 4)
+        submissions = TaskSubmission.objects.count()
+
+        call_command('seed_scale', clear=True, **self.options)
+        self.assertEqual(User.objects.filter(role='student').count(), 6)
+        self.assertEqual(TaskSubmission.objects.count(), submissions)
+        self.assertEqual(Course.objects.count(), 1)
+
+    def test_timestamps_are_restored_when_seeding_fails(self):
+        with mock.patch(
+            'tasks.management.commands.seed_scale.Command.create_reviews', side_effect=RuntimeError
+        ), self.assertRaises(RuntimeError):
+            call_command('seed_scale', **self.options)
+        self.assertTrue(Task._meta.get_field('updated_at').auto_now)
+        self.assertTrue(Notification._meta.get_field('created_at').auto_now_add)
+        self.assertFalse(User.objects.exists())
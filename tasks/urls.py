@@ -6,6 +6,7 @@ urlpatterns = [
     path('', views.TaskListView.as_view(), name='task-list'),
     path('<int:pk>/', views.TaskDetailView.as_view(), name='task-detail'),
     path('create/', views.TaskCreateView.as_view(), name='task-create'),
+    path('import/', views.TaskImportView.as_view(), name='task-import'),
     path('<int:pk>/update/', views.TaskUpdateView.as_view(), name='task-update'),
     path('<int:pk>/delete/', views.TaskDeleteView.as_view(), name='task-delete'),
     path('assigned/', views.AssignedTasksView.as_view(), name='assigned-tasks'),
@@ -28,11 +29,14 @@ urlpatterns = [
     # ===== Mentor Submission Views =====
     path('mentor/submissions/pending/', views.MentorPendingSubmissionsView.as_view(), name='mentor-pending-submissions'),
     path('mentor/submissions/<int:submission_id>/', views.MentorSubmissionDetailView.as_view(), name='mentor-submission-detail'),
+    path('mentor/submissions/bulk-grade/', views.MentorBulkGradeSubmissionsView.as_view(), name='mentor-bulk-grade'),
     path('mentor/submissions/<int:submission_id>/grade/', views.MentorGradeSubmissionView.as_view(), name='mentor-grade-submission'),
     path('mentor/submissions/graded/', views.MentorGradedSubmissionsView.as_view(), name='mentor-graded-submissions'),
     
     # ===== Mentor Batch Submissions =====
     path('mentor/batch/<int:batch_id>/submissions/', views.BatchTaskSubmissionsView.as_view(), name='batch-submissions'),
+    path('mentor/batch/<int:batch_id>/gradebook/export/', views.BatchGradebookExportView.as_view(), name='batch-gradebook-export'),
+    path('analytics/batch/<int:batch_id>/weekly/', views.BatchWeeklyAnalyticsView.as_view(), name='batch-weekly-analytics'),
     
     # ===== Student View for Mentors =====
     path('student/<int:student_id>/submitted/', views.StudentSubmittedTasksView.as_view(), name='student-submitted-tasks'),
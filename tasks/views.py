@@ -1,7 +1,12 @@
+import csv
+import math
 from rest_framework import generics, permissions, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from django.db.models import Q, Count, Prefetch
+from rest_framework.parsers import JSONParser, MultiPartParser, FormParser
+from django.db.models import Q, F, Count, Prefetch, OuterRef, Subquery, Case, When
+from django.db.models.functions import Coalesce
+from django.http import StreamingHttpResponse
 from django.utils import timezone
 from .models import Task, TaskSubmission, StudentProgressReview  
 from .serializers import (
@@ -13,6 +18,15 @@ from .serializers import (
 from courses.models import Course, Batch
 from authentication.models import User
 from authentication.permissions import IsAdmin, IsMentor, IsStudent, IsAdminOrMentor
+from .progression import refresh_task_progress
+from .grade_stats import apply_grade
+from .analytics import get_weekly_rollups
+from .grading import validate_bulk_grades, apply_bulk_grades
+from .importer import TaskImportRowSerializer, rows_from_csv, import_tasks
+from .assignment import assign_tasks_to_students
+from .gradebook import SubmissionMatrix, gradebook_rows
+from student_management.cache import CachedListMixin
+from student_management.pagination import KeysetPagination, SubmissionKeysetPagination
 
 # Import notification utilities
 try:
@@ -31,9 +45,11 @@ except ImportError:
 
 
 # ===== Task Views =====
-class TaskListView(generics.ListAPIView):
+class TaskListView(CachedListMixin, generics.ListAPIView):
     serializer_class = TaskSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetPagination
+    cache_scopes = ('tasks',)
     
     def get_queryset(self):
         if self.request.user.role == 'admin':
@@ -216,6 +232,7 @@ class TaskSubmissionView(generics.CreateAPIView):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         submission = serializer.save(student=request.user, task=task)
+        refresh_task_progress(request.user, course_id=task.course_id)
         
         # SEND NOTIFICATION TO MENTOR AND ADMIN
         notify_on_task_submission(task, request.user, submission)
@@ -232,6 +249,7 @@ class TaskSubmissionView(generics.CreateAPIView):
 class SubmissionListView(generics.ListAPIView):
     serializer_class = TaskSubmissionSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = SubmissionKeysetPagination
     
     def get_queryset(self):
         if self.request.user.role == 'student':
@@ -257,7 +275,10 @@ class GradeSubmissionView(generics.UpdateAPIView):
     permission_classes = [permissions.IsAuthenticated, IsAdminOrMentor]
     
     def perform_update(self, serializer):
+        previous_marks = serializer.instance.marks_obtained
         submission = serializer.save(graded_by=self.request.user)
+        refresh_task_progress(submission.student, course_id=submission.task.course_id)
+        apply_grade(submission, previous_marks)
         
         # SEND NOTIFICATION TO STUDENT
         notify_on_task_graded(submission, self.request.user)
@@ -331,53 +352,25 @@ class BatchTaskSubmissionsView(APIView):
     def get(self, request, batch_id):
         try:
             if request.user.role == 'admin':
-                batch = Batch.objects.get(id=batch_id)
+                batch = Batch.objects.select_related('course').get(id=batch_id)
             else:
-                batch = Batch.objects.get(id=batch_id, mentor=request.user)
+                batch = Batch.objects.select_related('course').get(id=batch_id, mentor=request.user)
             
-            # Get both batch-specific and course-wide tasks
-            tasks = Task.objects.filter(
-                Q(batch=batch) | 
-                Q(task_type='course', course=batch.course)
-            ).prefetch_related(
-                'submissions__student',
-                'assigned_to'
-            ).distinct()
-            
-            task_data = []
-            for task in tasks:
-                # Filter submissions for students in this batch
-                batch_student_ids = batch.students.values_list('id', flat=True)
-                submissions = task.submissions.filter(student_id__in=batch_student_ids)
-                
-                task_info = {
-                    'task_id': task.id,
-                    'task_title': task.title,
-                    'task_type': task.task_type,
-                    'due_date': task.due_date,
-                    'max_marks': task.max_marks,
-                    'total_assigned': task.assigned_to.filter(id__in=batch_student_ids).count(),
-                    'total_submitted': submissions.count(),
-                    'submissions': [
-                        {
-                            'submission_id': sub.id,
-                            'student_name': f"{sub.student.first_name} {sub.student.last_name}",
-                            'student_email': sub.student.email,
-                            'submitted_at': sub.submitted_at,
-                            'marks_obtained': sub.marks_obtained,
-                            'is_graded': sub.marks_obtained is not None,
-                        }
-                        for sub in submissions
-                    ]
-                }
-                task_data.append(task_info)
+            matrix = SubmissionMatrix(batch)
             
-            return Response({
+            response_data = {
                 'batch_id': batch.id,
                 'batch_name': batch.name,
                 'course_name': batch.course.name,
-                'tasks': task_data
-            })
+            }
+            
+            # ?layout=columnar returns student ids x task ids arrays instead of nested rows
+            if request.query_params.get('layout') == 'columnar':
+                response_data.update(matrix.columnar())
+            else:
+                response_data['tasks'] = matrix.task_rows()
+            
+            return Response(response_data)
             
         except Batch.DoesNotExist:
             return Response(
@@ -386,6 +379,108 @@ class BatchTaskSubmissionsView(APIView):
             )
 
 
+class _Echo:
+    """File-like object csv.writer can write to, returning the line instead of buffering it"""
+    def write(self, value):
+        return value
+
+
+class BatchGradebookExportView(APIView):
+    """Stream a batch gradebook (students x tasks marks) as CSV"""
+    permission_classes = [permissions.IsAuthenticated, IsAdminOrMentor]
+    
+    def get(self, request, batch_id):
+        try:
+            if request.user.role == 'admin':
+                batch = Batch.objects.select_related('course').get(id=batch_id)
+            else:
+                batch = Batch.objects.select_related('course').get(id=batch_id, mentor=request.user)
+        except Batch.DoesNotExist:
+            return Response(
+                {'error': 'Batch not found or you do not have access'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        
+        writer = csv.writer(_Echo())
+        response = StreamingHttpResponse(
+            (writer.writerow(row) for row in gradebook_rows(batch)),
+            content_type='text/csv'
+        )
+        filename = f"gradebook_{batch.course.code}_{batch.name}".replace(' ', '_')
+        response['Content-Disposition'] = f'attachment; filename="{filename}.csv"'
+        return response
+
+
+class BatchWeeklyAnalyticsView(APIView):
+    """Week-by-week completion and average score of a batch, read from WeeklyRollup"""
+    permission_classes = [permissions.IsAuthenticated, IsAdminOrMentor]
+    
+    def get(self, request, batch_id):
+        try:
+            if request.user.role == 'admin':
+                batch = Batch.objects.get(id=batch_id)
+            else:
+                batch = Batch.objects.get(id=batch_id, mentor=request.user)
+        except Batch.DoesNotExist:
+            return Response(
+                {'error': 'Batch not found or you do not have access'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        
+        weeks = [
+            {
+                'week_number': rollup.week_number,
+                'assigned': rollup.assigned,
+                'submitted': rollup.submitted,
+                'graded': rollup.graded,
+                'completion_rate': round(rollup.submitted / rollup.assigned * 100, 2) if rollup.assigned else 0,
+                'mean_percentage': rollup.mean_percentage,
+                'updated_at': rollup.updated_at,
+            }
+            for rollup in get_weekly_rollups(batch)
+        ]
+        
+        return Response({
+            'batch_id': batch.id,
+            'batch_name': batch.name,
+            'weeks': weeks,
+        })
+
+
+class MentorBulkGradeSubmissionsView(APIView):
+    """
+    Grade many submissions in one request.
+    Body: {"grades": [{"submission_id": 1, "marks_obtained": 8, "feedback": "..."}, ...]}
+    All grades are validated first; if any is invalid nothing is saved.
+    """
+    permission_classes = [permissions.IsAuthenticated, IsAdminOrMentor]
+    
+    def post(self, request):
+        submissions, errors = validate_bulk_grades(request.user, request.data.get('grades'))
+        if errors:
+            return Response({
+                'error': 'Some grades are invalid, nothing was saved',
+                'errors': errors,
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        apply_bulk_grades(request.user, submissions)
+        
+        return Response({
+            'message': f'{len(submissions)} submission(s) graded successfully',
+            'graded_count': len(submissions),
+            'submissions': [
+                {
+                    'id': submission.id,
+                    'student_name': f"{submission.student.first_name} {submission.student.last_name}",
+                    'task_title': submission.task.title,
+                    'marks_obtained': submission.marks_obtained,
+                    'feedback': submission.feedback,
+                }
+                for submission in submissions
+            ]
+        }, status=status.HTTP_200_OK)
+
+
 # ===== Mentor Submission Views (NEW) =====
 class MentorPendingSubmissionsView(APIView):
     """
@@ -571,18 +666,28 @@ class MentorGradeSubmissionView(APIView):
                     'error': 'marks_obtained must be a number'
                 }, status=status.HTTP_400_BAD_REQUEST)
             
+            if not math.isfinite(marks_obtained):
+                return Response({
+                    'error': 'marks_obtained must be a finite number'
+                }, status=status.HTTP_400_BAD_REQUEST)
+            
             if marks_obtained < 0 or marks_obtained > submission.task.max_marks:
                 return Response({
                     'error': f'Marks must be between 0 and {submission.task.max_marks}'
                 }, status=status.HTTP_400_BAD_REQUEST)
             
             # Update submission
+            previous_marks = submission.marks_obtained
             submission.marks_obtained = marks_obtained
             submission.feedback = feedback
             submission.graded_by = mentor
             submission.status = 'graded'
             submission.save()
             
+            # Grade may unlock (or re-lock) the student's next task
+            refresh_task_progress(submission.student, course_id=submission.task.course_id)
+            apply_grade(submission, previous_marks)
+            
             #  Send notification to student
             notify_on_task_graded(submission, mentor)
             
@@ -693,18 +798,16 @@ class MentorCreateTaskView(APIView):
             )
             
             # Assign to students
+            students = batch.students.filter(is_approved=True)
             if assigned_to_ids:
-                students = batch.students.filter(id__in=assigned_to_ids, is_approved=True)
-                task.assigned_to.set(students)
-            else:
-                students = batch.students.filter(is_approved=True)
-                task.assigned_to.set(students)
+                students = students.filter(id__in=assigned_to_ids)
+            assigned = assign_tasks_to_students([task.id], students.values_list('id', flat=True))
             
             #  SEND NOTIFICATION TO STUDENTS AND ADMIN
             notify_on_task_created(task, request.user)
             
             return Response({
-                'message': f'Task created and assigned to {students.count()} student(s)',
+                'message': f'Task created and assigned to {assigned} student(s)',
                 'task_id': task.id
             }, status=status.HTTP_201_CREATED)
             
@@ -720,52 +823,119 @@ class MentorCreateTaskView(APIView):
             )
 
 
+class TaskImportView(APIView):
+    """
+    Create many tasks at once from a weekly syllabus template.
+    Accepts JSON {"course_id", "batch_id", "tasks": [...]} or a multipart CSV
+    upload ("file") with title, description, week_number, task_order,
+    due_date, max_marks and release_date columns.
+    Without batch_id the tasks are course-wide (admins only).
+    """
+    permission_classes = [permissions.IsAuthenticated, IsAdminOrMentor]
+    parser_classes = (JSONParser, MultiPartParser, FormParser)
+    
+    def post(self, request):
+        batch_id = request.data.get('batch_id')
+        course_id = request.data.get('course_id')
+        
+        try:
+            if batch_id:
+                batches = Batch.objects.select_related('course')
+                if request.user.role != 'admin':
+                    batches = batches.filter(mentor=request.user)
+                batch = batches.get(id=batch_id)
+                course = batch.course
+            elif request.user.role == 'admin' and course_id:
+                batch = None
+                course = Course.objects.get(id=course_id)
+            else:
+                return Response(
+                    {'error': 'batch_id is required (course_id for course-wide tasks, admins only)'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+        except (Batch.DoesNotExist, Course.DoesNotExist):
+            return Response(
+                {'error': 'Course or batch not found or you do not have access'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        
+        upload = request.FILES.get('file')
+        try:
+            rows = rows_from_csv(upload) if upload else request.data.get('tasks')
+        except Exception as e:
+            return Response({'error': f'Could not read CSV: {e}'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        if not isinstance(rows, list) or not rows:
+            return Response({'error': 'No tasks to import'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        serializer = TaskImportRowSerializer(data=rows, many=True)
+        if not serializer.is_valid():
+            return Response({
+                'error': 'Some rows are invalid, nothing was imported',
+                'errors': serializer.errors,
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        tasks, assigned = import_tasks(serializer.validated_data, course, batch, request.user)
+        
+        return Response({
+            'message': f'{len(tasks)} task(s) imported and {assigned} assignment(s) created',
+            'task_ids': [task.id for task in tasks],
+        }, status=status.HTTP_201_CREATED)
+
+
 class MentorTasksListView(APIView):
     """View for mentors to see ALL tasks assigned to students in their batches"""
     permission_classes = [permissions.IsAuthenticated, IsMentor]
     
     def get(self, request):
         try:
-            # Get all batches assigned to this mentor
-            mentor_batches = Batch.objects.filter(mentor=request.user)
+            mentor = request.user
+            mentor_batches = Batch.objects.filter(mentor=mentor)
+            
+            # Course-wide tasks only count students from the mentor's batches of that course
+            in_scope = Q(batch__isnull=False) | Q(
+                submissions__student__is_approved=True,
+                submissions__student__enrolled_batches__mentor=mentor,
+                submissions__student__enrolled_batches__course=F('course'),
+            )
             
-            # Get courses from mentor's batches
-            mentor_courses = set(batch.course for batch in mentor_batches)
+            # Approved students in the mentor's batches of the task's course
+            course_students = User.objects.filter(
+                is_approved=True,
+                enrolled_batches__mentor=mentor,
+                enrolled_batches__course=OuterRef('course'),
+            ).order_by().values('enrolled_batches__course').annotate(
+                total=Count('id', distinct=True)
+            ).values('total')
             
-            # Get ALL tasks:
+            assigned_students = Task.assigned_to.through.objects.filter(
+                task_id=OuterRef('pk')
+            ).order_by().values('task_id').annotate(total=Count('id')).values('total')
+            
+            # Get ALL tasks in one query:
             # 1. Tasks assigned to mentor's specific batches
             # 2. Course-wide tasks (batch=NULL) for courses where mentor has batches
             tasks = Task.objects.filter(
                 Q(batch__in=mentor_batches) |  # Batch-specific tasks
-                Q(batch__isnull=True, course__in=mentor_courses)  # Course-wide tasks
-            ).select_related('course', 'batch', 'created_by').order_by('-created_at')
+                Q(batch__isnull=True, course__in=mentor_batches.values('course'))  # Course-wide tasks
+            ).select_related('course', 'batch', 'created_by').annotate(
+                submission_count=Count('submissions', filter=in_scope, distinct=True),
+                graded_count=Count(
+                    'submissions',
+                    filter=in_scope & Q(submissions__marks_obtained__isnull=False),
+                    distinct=True
+                ),
+                total_students=Case(
+                    When(batch__isnull=False, then=Coalesce(Subquery(assigned_students), 0)),
+                    default=Coalesce(Subquery(course_students), 0),
+                ),
+            ).order_by('-created_at')
             
             tasks_data = []
             for task in tasks:
-                # Get submission count
-                if task.batch:
-                    submission_count = TaskSubmission.objects.filter(task=task).count()
-                    graded_count = TaskSubmission.objects.filter(
-                        task=task, 
-                        marks_obtained__isnull=False
-                    ).count()
-                    total_students = task.assigned_to.count()
-                else:
-                    # For course-wide tasks, count submissions from ALL students in mentor's batches
-                    course_students = set()
-                    for batch in mentor_batches.filter(course=task.course):
-                        course_students.update(batch.students.filter(is_approved=True))
-                    
-                    submission_count = TaskSubmission.objects.filter(
-                        task=task,
-                        student__in=course_students
-                    ).count()
-                    graded_count = TaskSubmission.objects.filter(
-                        task=task,
-                        student__in=course_students,
-                        marks_obtained__isnull=False
-                    ).count()
-                    total_students = len(course_students)
+                submission_count = task.submission_count
+                graded_count = task.graded_count
+                total_students = task.total_students
                 
                 # Determine who created the task
                 creator_role = task.created_by.role if task.created_by else 'Unknown'
@@ -784,7 +954,7 @@ class MentorTasksListView(APIView):
                     'created_at': task.created_at,
                     'created_by_role': creator_role,
                     'created_by_name': creator_name,
-                    'is_my_task': task.created_by == request.user if task.created_by else False,
+                    'is_my_task': task.created_by_id == mentor.id,
                     'total_students': total_students,
                     'submission_count': submission_count,
                     'graded_count': graded_count,
@@ -872,6 +1042,9 @@ class StudentSubmitTaskView(APIView):
                 status='submitted'
             )
             
+            # Update stored progression for this course
+            refresh_task_progress(request.user, course_id=task.course_id)
+            
             #  SEND NOTIFICATION TO MENTOR AND ADMIN
             notify_on_task_submission(task, request.user, submission)
             